@@ -0,0 +1,3 @@
+"""
+Benchmarks for Advent of Code 2024 Solutions
+"""
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare the day 3 scanner backends on multi-megabyte corrupted memory dumps
+
+Usage: python -m benchmarks.bench_day3_scanners [--sizes 1,4,16] [--seed 0]
+"""
+
+import argparse
+import time
+
+from benchmarks.generators import corrupted_memory
+from day3.day3 import find_valid_mul_instructions, SCANNER_BACKENDS
+
+
+def time_backend(scan, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = scan(data)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1,4,16", help="Input sizes in MB, comma separated")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-reference", action="store_true", help="Do not time the manual scanner")
+    args = parser.parse_args(argv)
+
+    backends = {"reference": find_valid_mul_instructions}
+    if args.skip_reference:
+        backends = {}
+    backends.update(SCANNER_BACKENDS)
+
+    print(f"{'Size (MB)':>10}  {'Backend':<10} {'Time (s)':>9} {'MB/s':>8} {'Found':>8}")
+    for size_mb in (float(s) for s in args.sizes.split(",")):
+        text = corrupted_memory(int(size_mb * 1024 * 1024), args.seed)
+        data = {"dfa": text.encode()}
+        results = {}
+        for name, scan in backends.items():
+            elapsed, found = time_backend(scan, data.get(name, text), args.repeat)
+            results[name] = found
+            print(f"{size_mb:>10g}  {name:<10} {elapsed:>9.3f} {size_mb / elapsed:>8.1f} {len(found):>8}")
+        if results.get("regex") != results.get("dfa"):
+            print("  MISMATCH between regex and dfa backends")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Import cost of the day modules, measured with `python -X importtime`
+
+Usage: python -m benchmarks.bench_startup [--modules day1.day1,day2.day2] [--repeat 5] [--top 10]
+
+Each module is imported in a fresh interpreter. The cost above a bare
+interpreter (`-c pass`) is reported, best of --repeat runs, with the modules
+that contributed the most to it.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from utils.registry import PROJECT_ROOT, discover_days
+
+HEAVY_MODULES = ("numpy", "requests", "loguru")
+
+
+def parse_importtime(stderr):
+    """(total microseconds, {module: (self microseconds, cumulative microseconds)}) from -X importtime output"""
+    timings = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+        # Nested imports are indented by two more spaces per level: only count top-level ones
+        if len(name) - len(name.lstrip()) == 1:
+            total += int(cumulative_us)
+    return total, timings
+
+
+def import_profile(statement):
+    """(total microseconds, {module: (self, cumulative)}) of running `statement` in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.getenv("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, cwd=PROJECT_ROOT, env=env, check=True)
+    return parse_importtime(result.stderr)
+
+
+def best_profile(statement, repeat):
+    return min((import_profile(statement) for _ in range(repeat)), key=lambda profile: profile[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", help="Comma separated modules (default: every dayN.dayN)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imported modules to list")
+    args = parser.parse_args(argv)
+
+    modules = args.modules.split(",") if args.modules else [f"day{day}.day{day}" for day in discover_days()]
+    bare, bare_timings = best_profile("pass", args.repeat)
+    print(f"{'bare interpreter':<20} {bare / 1000:>8.1f} ms")
+    for module in modules:
+        total, timings = best_profile(f"import {module}", args.repeat)
+        added = {name: times for name, times in timings.items() if name not in bare_timings}
+        heavy = [name for name in HEAVY_MODULES if name in added]
+        print(f"{module:<20} {total / 1000:>8.1f} ms  (+{(total - bare) / 1000:.1f} ms)"
+              f"  heavy: {', '.join(heavy) or 'none'}")
+        slowest = sorted(added.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, cumulative_us) in slowest:
+            print(f"    {name:<36} self {self_us / 1000:>6.2f} ms  cumulative {cumulative_us / 1000:>6.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Differential checks of the fast backends against the pure-Python references
+
+Usage: python -m benchmarks.crosscheck [--checks day2.dampener,day3.mul] [--cases 300]
+                                       [--seed 0] [--size 16KB] [--skip-throughput]
+
+Each check pairs a reference function, kept as the oracle, with every backend
+computing the same thing. Backends run on inputs from benchmarks.generators
+and on small fuzzed inputs built to hit the edge cases (empty inputs, ties,
+overflowing values, truncated instructions, tiny grids). A backend that
+disagrees with the reference, or raises, is reported with its input shrunk
+to a minimal counterexample. Then the throughput of the reference and of every
+backend is measured on one generated input of --size bytes.
+
+Backends with a different output shape (a count instead of the list of
+matches) give `expected`, which maps the reference output to their own.
+Backends checked with tiny chunks or bands, to put many boundaries in small
+inputs, give `timed` with their production settings for the throughput pass.
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import namedtuple
+
+from benchmarks.generators import generate, parse_size
+from utils.common_logger import setup_logger
+
+# expected maps the reference output to what this backend returns; timed, if set, replaces run when timing
+Backend = namedtuple("Backend", ["name", "run", "expected", "timed"], defaults=(None,))
+# parse turns a generated input (bytes) into the reference's argument, fuzz draws one from a random.Random
+Check = namedtuple("Check", ["name", "day", "reference", "backends", "parse", "fuzz", "shrink"])
+Mismatch = namedtuple("Mismatch", ["check", "backend", "input", "expected", "actual"])
+
+
+def _identity(value):
+    return value
+
+
+# Shrinking: every candidate is strictly smaller, so the greedy loop in `shrink` terminates
+
+def _shrink_sequence(items, minimum=0):
+    """Candidates with a chunk of items removed, largest chunks first"""
+    n = len(items)
+    chunk = n // 2 or 1
+    while chunk >= 1 and n - chunk >= minimum:
+        for start in range(0, n - chunk + 1, chunk):
+            yield items[:start] + items[start + chunk:]
+        if chunk == 1:
+            break
+        chunk //= 2
+
+
+def _shrink_int(value):
+    """Values closer to zero"""
+    if value != 0:
+        yield 0
+        if abs(value) > 1:
+            yield value // 2 if value > 0 else -(-value // 2)
+        yield value - 1 if value > 0 else value + 1
+
+
+def _shrink_pairs(columns):
+    left, right = columns
+    pairs = list(zip(left, right))
+    for smaller in _shrink_sequence(pairs):
+        yield [a for a, _ in smaller], [b for _, b in smaller]
+    for column in (0, 1):
+        values = columns[column]
+        for i, value in enumerate(values):
+            for smaller in _shrink_int(value):
+                changed = values[:i] + [smaller] + values[i + 1:]
+                yield (changed, right) if column == 0 else (left, changed)
+
+
+def _shrink_reports(reports):
+    yield from _shrink_sequence(reports)
+    for i, report in enumerate(reports):
+        for smaller in _shrink_sequence(report):
+            yield reports[:i] + [smaller] + reports[i + 1:]
+        for j, level in enumerate(report):
+            for value in _shrink_int(level):
+                yield reports[:i] + [report[:j] + [value] + report[j + 1:]] + reports[i + 1:]
+
+
+def _shrink_text(text):
+    for smaller in _shrink_sequence(list(text)):
+        yield "".join(smaller)
+
+
+def _shrink_grid(rows):
+    yield from _shrink_sequence(rows, minimum=1)
+    width = len(rows[0])
+    for columns in _shrink_sequence(list(range(width)), minimum=1):
+        yield ["".join(row[c] for c in columns) for row in rows]
+    for r, row in enumerate(rows):
+        for c, ch in enumerate(row):
+            if ch != ".":
+                yield rows[:r] + [row[:c] + "." + row[c + 1:]] + rows[r + 1:]
+
+
+def shrink(value, candidates, fails, max_steps=10_000):
+    """Greedily replace `value` by its first failing candidate until none fails"""
+    for _ in range(max_steps):
+        for candidate in candidates(value):
+            if fails(candidate):
+                value = candidate
+                break
+        else:
+            break
+    return value
+
+
+# Fuzzers: small inputs concentrated on the boundaries of each puzzle
+
+def _fuzz_pairs(rng):
+    n = rng.choice([0, 1, 2, rng.randint(3, 40)])
+    bound = rng.choice([3, 1000, 1 << 40, 1 << 62])
+    left = [rng.randint(-bound, bound) for _ in range(n)]
+    right = [rng.choice(left) if left and rng.random() < 0.3 else rng.randint(-bound, bound) for _ in range(n)]
+    return left, right
+
+
+def _fuzz_reports(rng):
+    reports = []
+    for _ in range(rng.randint(0, 12)):
+        level = rng.randint(0, 20)
+        report = []
+        for _ in range(rng.choice([0, 1, 2, rng.randint(3, 9)])):
+            report.append(level)
+            level += rng.choice([-5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5])
+        reports.append(report)
+    return reports
+
+
+_MUL_PIECES = ["mul(", "mul", "(", ")", ",", "1", "12", "123", "1234", "do()", "don't()", "m", "u", "l", " ", "x", "\n"]
+
+
+def _fuzz_memory(rng):
+    pieces = []
+    for _ in range(rng.randint(0, 30)):
+        if rng.random() < 0.3:
+            instruction = f"mul({rng.randint(0, 1200)},{rng.randint(0, 1200)})"
+            if rng.random() < 0.2:
+                # A disabled part inside an instruction: what is left around it must not join up
+                cut = rng.randint(1, len(instruction) - 1)
+                disabled = "don't()" + rng.choice(["", "x", "mul(2,2)"]) + "do()"
+                instruction = instruction[:cut] + disabled + instruction[cut:]
+            pieces.append(instruction)
+        else:
+            pieces.append(rng.choice(_MUL_PIECES))
+    return "".join(pieces)
+
+
+def _fuzz_grid(rng):
+    letters = rng.choice(["XMAS", "XMAS.", "MAS", "XS"])
+    rows, cols = rng.randint(1, 9), rng.randint(1, 9)
+    return ["".join(rng.choice(letters) for _ in range(cols)) for _ in range(rows)]
+
+
+def _rows(raw):
+    return raw.decode().split()
+
+
+def _grid_bytes(rows):
+    return ("\n".join(rows) + "\n").encode()
+
+
+def _x_mas_keys(patterns):
+    """find_x_mas_patterns output without NumPy kernels, so that it compares with =="""
+    return [(row, col, "".join(kernel.ravel().tolist())) for row, col, kernel in patterns]
+
+
+def _day1_checks():
+    from day1.day1 import (
+        Day1Solver, distanceSumOfSortedElements, distance_sum_vectorized, parse_location_matrix,
+        similarity_score, similarity_score_vectorized,
+    )
+    from day1.streaming import solve_streaming
+    import numpy as np
+
+    def matrix(columns):
+        return np.array(columns, dtype=np.int64).reshape(2, -1).T
+
+    def parse(raw):
+        parsed = parse_location_matrix(raw)
+        return parsed[:, 0].tolist(), parsed[:, 1].tolist()
+
+    def text(columns):
+        return "".join(f"{a}   {b}\n" for a, b in zip(*columns)).encode()
+
+    def streaming(part, **sizes):
+        # Small chunks, runs and blocks spill and merge even on fuzzed inputs
+        return lambda c: solve_streaming(text(c), **sizes)[part]
+
+    small = dict(chunk_size=16, run_size=4, block_size=3, max_histogram_entries=4)
+    solver = Day1Solver()
+    return [
+        Check("day1.distance", 1, lambda c: distanceSumOfSortedElements(*c), [
+            Backend("distance_sum_vectorized", lambda c: distance_sum_vectorized(*c), _identity),
+            Backend("solve_streaming", streaming(0, **small), _identity, streaming(0)),
+            Backend("Day1Solver.part1", lambda c: solver.part1(matrix(c)), _identity),
+        ], parse, _fuzz_pairs, _shrink_pairs),
+        Check("day1.similarity", 1, lambda c: similarity_score(*c), [
+            Backend("similarity_score_vectorized", lambda c: similarity_score_vectorized(*c), _identity),
+            Backend("solve_streaming", streaming(1, **small), _identity, streaming(1)),
+            Backend("Day1Solver.part2", lambda c: solver.part2(matrix(c)), _identity),
+        ], parse, _fuzz_pairs, _shrink_pairs),
+    ]
+
+
+def _day2_checks():
+    from day2.day2 import Day2Solver, is_report_safe_with_dampener, is_report_safe_with_dampener_linear
+    from day2.batched import pack_reports, safe_flags_with_dampener
+    from utils.parsing import parse_int_rows
+
+    def parse(raw):
+        levels, offsets = parse_int_rows(raw)
+        flat = levels.tolist()
+        return [flat[a:b] for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+    solver = Day2Solver()
+    return [
+        Check("day2.dampener", 2, lambda reports: [is_report_safe_with_dampener(r) for r in reports], [
+            Backend("is_report_safe_with_dampener_linear",
+                    lambda reports: [is_report_safe_with_dampener_linear(r) for r in reports], _identity),
+            Backend("safe_flags_with_dampener",
+                    lambda reports: safe_flags_with_dampener(*pack_reports(reports)).tolist(), _identity),
+            Backend("Day2Solver.part2", lambda reports: solver.part2(pack_reports(reports)), sum),
+        ], parse, _fuzz_reports, _shrink_reports),
+    ]
+
+
+def _day3_checks():
+    from day3.day3 import (
+        Day3Solver, calculate_multiplication_sum, extract_do_instructions, find_valid_mul_instructions,
+    )
+    from day3.parallel import scan_buffer_chunked
+    from day3.scanners import find_mul_instructions_dfa, find_mul_instructions_regex, scan_instructions
+
+    def chunked(part, **sizes):
+        return lambda text: scan_buffer_chunked(text.encode(), **sizes)[part]
+
+    solver = Day3Solver()
+    return [
+        Check("day3.mul", 3, find_valid_mul_instructions, [
+            Backend("regex", find_mul_instructions_regex, _identity),
+            Backend("regex (bytes)", lambda text: find_mul_instructions_regex(text.encode()), _identity),
+            Backend("dfa", find_mul_instructions_dfa, _identity),
+            Backend("scan_buffer_chunked", chunked(0, chunk_size=7), calculate_multiplication_sum, chunked(0)),
+            Backend("Day3Solver.part1", lambda text: solver.part1(solver.parse(text.encode())),
+                    calculate_multiplication_sum),
+        ], bytes.decode, _fuzz_memory, _shrink_text),
+        Check("day3.do", 3,
+              lambda text: calculate_multiplication_sum(find_valid_mul_instructions(extract_do_instructions(text))), [
+            Backend("scan_instructions", lambda text: scan_instructions(text)[1], _identity),
+            Backend("scan_buffer_chunked", chunked(1, chunk_size=7), _identity, chunked(1)),
+            Backend("Day3Solver.part2", lambda text: solver.part2(solver.parse(text.encode())), _identity),
+        ], bytes.decode, _fuzz_memory, _shrink_text),
+    ]
+
+
+def _day4_checks():
+    from day4.day4 import (
+        count_x_mas_in_grid, count_xmas_in_grid, find_x_mas_patterns, find_xmas_occurrences,
+        find_xmas_occurrences_vectorized,
+    )
+    from day4.incremental import IncrementalWordSearch
+    from day4.patterns import count_patterns_bitplane, find_patterns_bitplane
+    from day4.tiled import count_buffer_tiled
+    from day4.word_search import WordSearchIndex
+    from utils.grid import Grid
+
+    def grid(rows):
+        return Grid.from_bytes(_grid_bytes(rows))
+
+    many_words = ["XMAS"] + [a + b for a in "XMAS" for b in "XMAS"]
+
+    def tiled(part, **sizes):
+        # Two-row bands put band boundaries (and their halos) in the smallest grids
+        return lambda rows: count_buffer_tiled(_grid_bytes(rows), **sizes)[part]
+
+    return [
+        Check("day4.xmas", 4, find_xmas_occurrences, [
+            Backend("find_xmas_occurrences_vectorized", find_xmas_occurrences_vectorized, _identity),
+            # Enough words for the Aho-Corasick pass rather than the per-word kernel
+            Backend("WordSearchIndex.count", lambda rows: WordSearchIndex(rows).count(many_words)["XMAS"], len),
+            Backend("count_xmas_in_grid (Grid)", lambda rows: count_xmas_in_grid(grid(rows)), len),
+            Backend("IncrementalWordSearch", lambda rows: IncrementalWordSearch(rows).xmas_count, len),
+            Backend("count_buffer_tiled", tiled(0, band_rows=2), len, tiled(0)),
+        ], _rows, _fuzz_grid, _shrink_grid),
+        Check("day4.x_mas", 4, find_x_mas_patterns, [
+            Backend("find_patterns_bitplane", lambda rows: _x_mas_keys(find_patterns_bitplane(rows)), _x_mas_keys),
+            Backend("count_x_mas_in_grid (Grid)", lambda rows: count_x_mas_in_grid(grid(rows)), len),
+            Backend("count_patterns_bitplane", count_patterns_bitplane, len),
+            Backend("IncrementalWordSearch", lambda rows: IncrementalWordSearch(rows).x_mas_count, len),
+            Backend("count_buffer_tiled", tiled(1, band_rows=2), len, tiled(1)),
+        ], _rows, _fuzz_grid, _shrink_grid),
+    ]
+
+
+CHECK_BUILDERS = [_day1_checks, _day2_checks, _day3_checks, _day4_checks]
+_EXTRA_BACKENDS = {}
+
+
+def register_backend(check, name, run, expected=_identity, timed=None):
+    """Add a backend to a check (e.g. "day3.mul"), compared against its reference by every run"""
+    _EXTRA_BACKENDS.setdefault(check, []).append(Backend(name, run, expected, timed))
+
+
+def build_checks(names=None):
+    """Checks by name, with the registered extra backends, restricted to `names` if given"""
+    checks = {}
+    for builder in CHECK_BUILDERS:
+        for check in builder():
+            checks[check.name] = check._replace(backends=check.backends + _EXTRA_BACKENDS.get(check.name, []))
+    if names is not None:
+        unknown = set(names) - set(checks)
+        if unknown:
+            raise ValueError(f"Unknown checks: {', '.join(sorted(unknown))}")
+        checks = {name: checks[name] for name in names}
+    return checks
+
+
+def _outcome(function, value):
+    try:
+        return function(value)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def compare(check, backend, value):
+    """(expected, actual) if the backend disagrees with the reference on `value`, otherwise None"""
+    expected = backend.expected(check.reference(value))
+    actual = _outcome(backend.run, value)
+    return None if actual == expected else (expected, actual)
+
+
+def inputs(check, cases, seed=0):
+    """`cases` inputs for a check: one in four generated, the others fuzzed"""
+    rng = random.Random(f"{check.name}/{seed}")
+    for case in range(cases):
+        if case % 4 == 0:
+            yield check.parse(generate(check.day, rng.randint(16, 2048), seed * cases + case))
+        else:
+            yield check.fuzz(rng)
+
+
+def crosscheck(checks, cases=300, seed=0):
+    """Run every backend of every check on the same inputs, returns the shrunk Mismatches.
+
+    Only the first mismatch of each backend is kept: the others usually share its cause.
+    """
+    mismatches = []
+    for check in checks.values():
+        failing = set()
+        for value in inputs(check, cases, seed):
+            for backend in check.backends:
+                if backend.name in failing or compare(check, backend, value) is None:
+                    continue
+                failing.add(backend.name)
+                smallest = shrink(value, check.shrink, lambda candidate: compare(check, backend, candidate) is not None)
+                expected, actual = compare(check, backend, smallest)
+                mismatches.append(Mismatch(check.name, backend.name, smallest, expected, actual))
+    return mismatches
+
+
+def _best_time(function, value, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def throughput(checks, size, seed=0, repeat=1):
+    """Time the reference and every backend of each check on one generated input of `size` bytes"""
+    records = []
+    for check in checks.values():
+        raw = generate(check.day, size, seed)
+        value = check.parse(raw)
+        timed = [(backend.name, backend.timed or backend.run) for backend in check.backends]
+        for name, function in [("reference", check.reference)] + timed:
+            seconds = _best_time(function, value, repeat)
+            records.append({
+                "check": check.name,
+                "backend": name,
+                "bytes": len(raw),
+                "seconds": seconds,
+                "mb_per_s": len(raw) / (1024 * 1024) / seconds if seconds > 0 else None,
+            })
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checks", help="Comma separated checks (default: all)")
+    parser.add_argument("--cases", type=int, default=300, help="Inputs per check")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", default="16KB", help="Input size for the throughput comparison")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--skip-throughput", action="store_true")
+    args = parser.parse_args(argv)
+    setup_logger()
+
+    checks = build_checks(args.checks.split(",") if args.checks else None)
+    mismatches = crosscheck(checks, args.cases, args.seed)
+    for check in checks.values():
+        failed = {m.backend for m in mismatches if m.check == check.name}
+        print(f"{check.name:<16} {len(check.backends) - len(failed)}/{len(check.backends)} backends agree "
+              f"on {args.cases} inputs")
+    for mismatch in mismatches:
+        print(f"MISMATCH {mismatch.check} {mismatch.backend}")
+        print(f"    input:    {mismatch.input!r}")
+        print(f"    expected: {mismatch.expected!r}")
+        print(f"    actual:   {mismatch.actual!r}")
+
+    if not args.skip_throughput:
+        print()
+        print(f"{'Check':<16} {'Backend':<38} {'Time (ms)':>10} {'MB/s':>9}")
+        for record in throughput(checks, parse_size(args.size), args.seed, args.repeat):
+            print(f"{record['check']:<16} {record['backend']:<38} {record['seconds'] * 1000:>10.3f} "
+                  f"{record['mb_per_s'] or 0:>9.2f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic puzzle inputs of any size, from a kilobyte to a gigabyte
+
+Every generator returns `bytes` of at most `size` bytes (never empty) shaped
+like the real input of its day. Inputs are built in blocks of BLOCK_SIZE
+bytes with NumPy, each block with its own generator seeded from (seed, block
+index), so the same seed always gives the same input and large sizes never
+go through Python-level loops.
+"""
+
+import random
+import re
+
+import numpy as np
+
+BLOCK_SIZE = 16 * 1024 * 1024
+
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*$", re.IGNORECASE)
+
+
+def parse_size(text):
+    """Parse a size such as "64KB", "1.5MB" or "4096" into a number of bytes"""
+    match = _SIZE.match(text)
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    unit = match.group(2).upper()
+    if unit and not unit.endswith("B"):
+        unit += "B"
+    return int(float(match.group(1)) * _SIZE_UNITS[unit])
+
+
+def format_size(size):
+    """Shortest exact spelling of a size: 1024 -> "1KB", 1536 -> "1536B\""""
+    for unit in ("GB", "MB", "KB"):
+        if size % _SIZE_UNITS[unit] == 0:
+            return f"{size // _SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def _blocks(size, seed, make_block, block_size=BLOCK_SIZE):
+    """Concatenate make_block(rng, budget) over blocks of at most block_size bytes"""
+    parts = []
+    remaining = size
+    index = 0
+    while remaining > 0:
+        budget = min(block_size, remaining)
+        block = make_block(np.random.default_rng([seed, index]), budget)
+        if not block:
+            break
+        parts.append(block)
+        remaining -= len(block)
+        index += 1
+    return b"".join(parts)
+
+
+def _digits(values, width):
+    """(n, width) ASCII digit array of non-negative values written on `width` digits"""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (values[:, None] // powers % 10 + ord("0")).astype(np.uint8)
+
+
+# Day 1: "12345   67890" lines, 14 bytes each
+_DAY1_LINE = 14
+
+
+def day1_pairs(size, seed=0):
+    """Two columns of 5-digit location IDs; about half of the right column repeats left values"""
+    def block(rng, budget):
+        n = budget // _DAY1_LINE
+        if n == 0:
+            return b""
+        left = rng.integers(10000, 100000, n)
+        right = np.where(rng.random(n) < 0.5, left[rng.integers(0, n, n)], rng.integers(10000, 100000, n))
+        lines = np.full((n, _DAY1_LINE), ord(" "), dtype=np.uint8)
+        lines[:, 0:5] = _digits(left, 5)
+        lines[:, 8:13] = _digits(right, 5)
+        lines[:, 13] = ord("\n")
+        return lines.tobytes()
+    return _blocks(max(size, _DAY1_LINE), seed, block)
+
+
+def day2_reports(size, seed=0):
+    """Reports of 5 to 8 two-digit levels drifting up or down by 1-3, with some bad steps"""
+    def block(rng, budget):
+        # 3 bytes per level ("42 " or "42\n"), 6.5 levels per report on average
+        count = max(1, budget // 20 + 1)
+        lengths = rng.integers(5, 9, count)
+        total = int(lengths.sum())
+        report_of_level = np.repeat(np.arange(count), lengths)
+        first = np.zeros(total, dtype=bool)
+        first[np.cumsum(lengths) - lengths] = True
+
+        direction = np.where(rng.random(count) < 0.5, 1, -1)[report_of_level]
+        steps = rng.integers(1, 4, total) * direction
+        # About one step in 15 breaks the rules: zero, too large or the wrong way
+        bad = rng.random(total) < 1 / 15
+        steps[bad] = rng.choice([0, 4, 5, -1, -2], int(bad.sum())) * direction[bad]
+        steps[first] = 0
+
+        levels = np.cumsum(steps)
+        starts = rng.integers(30, 70, count)
+        # Segmented cumulative sum: remove the running total at the start of each report
+        levels = levels - np.repeat(levels[first], lengths) + np.repeat(starts, lengths)
+        levels = np.clip(levels, 10, 99)
+
+        cells = np.empty((total, 3), dtype=np.uint8)
+        cells[:, :2] = _digits(levels, 2)
+        cells[:, 2] = ord(" ")
+        cells[np.cumsum(lengths) - 1, 2] = ord("\n")
+        data = cells.tobytes()
+        if len(data) > budget:
+            data = data[:data.rfind(b"\n", 0, budget) + 1]
+        return data
+    return _blocks(max(size, 24), seed, block)
+
+
+# Day 3: random text with valid and broken mul instructions and do()/don't() switches
+_NOISE = "mul(don't)do()[]{},;:!@#$%^&*+-=<>?/ \n'whyselectfromwhere0123456789"
+_TOKENS = ["mul({a},{b})", "mul({a},{b}]", "mul({a}, {b})", "mul[{a},{b}]", "mul({a},{b}", "do()", "don't()"]
+_DAY3_PIECE = 64 * 1024
+_DAY3_PIECES = 16
+
+
+def corrupted_memory(size, seed=0):
+    """Random corrupted memory of `size` characters, with valid and broken mul instructions"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.2:
+            part = rng.choice(_TOKENS).format(a=rng.randint(0, 999), b=rng.randint(0, 999))
+        else:
+            part = "".join(rng.choices(_NOISE, k=rng.randint(1, 12)))
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+
+def day3_memory(size, seed=0):
+    """Corrupted memory bytes: a random sequence of 64KB pieces drawn from 16 generated ones"""
+    size = max(size, 1)
+    if size <= _DAY3_PIECE:
+        return corrupted_memory(size, seed).encode()
+    pieces = [corrupted_memory(_DAY3_PIECE, seed * _DAY3_PIECES + i).encode() for i in range(_DAY3_PIECES)]
+
+    def block(rng, budget):
+        order = rng.integers(0, _DAY3_PIECES, -(-budget // _DAY3_PIECE))
+        return b"".join(pieces[i] for i in order)[:budget]
+    return _blocks(size, seed, block)
+
+
+def day4_grid(size, seed=0):
+    """Square grid of X, M, A and S (rows of `width` letters plus a line break)"""
+    width = max(4, int((max(size, 20)) ** 0.5))
+    rows = max(4, size // (width + 1))
+    letters = np.frombuffer(b"XMAS", dtype=np.uint8)
+
+    def block(rng, budget):
+        n = min(budget // (width + 1), rows)
+        cells = np.empty((n, width + 1), dtype=np.uint8)
+        cells[:, :width] = letters[rng.integers(0, 4, (n, width))]
+        cells[:, width] = ord("\n")
+        return cells.tobytes()
+    return _blocks(rows * (width + 1), seed, block, block_size=max(BLOCK_SIZE // (width + 1), 1) * (width + 1))
+
+
+GENERATORS = {
+    1: day1_pairs,
+    2: day2_reports,
+    3: day3_memory,
+    4: day4_grid,
+}
+
+
+def generate(day, size, seed=0):
+    """Synthetic input of about `size` bytes for a day"""
+    return GENERATORS[day](size, seed)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Time every public solver function of every day over a sweep of input sizes
+
+Usage: python -m benchmarks.suite [--days 1-4] [--sizes 1KB,64KB,1MB]
+                                  [--output results.json] [--baseline benchmarks/baseline.json]
+                                  [--update-baseline] [--tolerance 0.5]
+
+Inputs come from benchmarks.generators. Each case prepares its argument from
+the raw input outside of the timed region, then the best of --repeat runs is
+kept. Pure-Python reference functions have a size cap so that a sweep up to
+a gigabyte still finishes. With --baseline, the run fails (exit code 1) when
+a case is slower than its baseline time by more than the tolerance.
+
+Timings only compare on the machine that produced them, so the baseline is
+not versioned: --update-baseline writes benchmarks/baseline.json (ignored by
+git) on each machine, and a baseline from another host only gives a warning.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.generators import generate, parse_size, format_size
+from utils.registry import get_solver, parse_days
+
+DEFAULT_SIZES = "1KB,64KB,1MB"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+# Timings below this are too noisy to flag as regressions
+NOISE_FLOOR = 0.002
+
+# prepare turns the raw input into the argument of run; max_size caps slow reference code
+Case = namedtuple("Case", ["name", "prepare", "run", "max_size"])
+
+_scratch_dir = None
+
+
+def _as_file(raw):
+    """Write the input to a scratch file (removed at exit) for the cases that read from disk"""
+    global _scratch_dir
+    if _scratch_dir is None:
+        _scratch_dir = tempfile.TemporaryDirectory(prefix="aoc-bench-")
+    path = Path(_scratch_dir.name) / "input.txt"
+    path.write_bytes(raw)
+    return path
+
+
+def _day1_cases():
+    from day1.day1 import (
+        parse_location_matrix, distanceSumOfSortedElements, similarity_score,
+        distance_sum_vectorized, similarity_score_vectorized, sorted_distance, similarity,
+    )
+    from day1.streaming import solve_streaming
+
+    def columns(raw):
+        matrix = parse_location_matrix(raw)
+        return matrix[:, 0], matrix[:, 1]
+
+    def lists(raw):
+        left, right = columns(raw)
+        return left.tolist(), right.tolist()
+
+    return [
+        Case("parse_location_matrix", lambda raw: raw, parse_location_matrix, None),
+        Case("distanceSumOfSortedElements", lists, lambda c: distanceSumOfSortedElements(*c), 64 << 20),
+        Case("similarity_score", lists, lambda c: similarity_score(*c), 64 << 20),
+        Case("distance_sum_vectorized", columns, lambda c: distance_sum_vectorized(*c), None),
+        Case("similarity_score_vectorized", columns, lambda c: similarity_score_vectorized(*c), None),
+        Case("sorted_distance", columns, lambda c: sorted_distance(*c), None),
+        Case("similarity", columns, lambda c: similarity(*c), None),
+        Case("solve_streaming", lambda raw: raw, solve_streaming, None),
+    ]
+
+
+def _day2_cases():
+    from day2.day2 import (
+        count_safe_reports, count_safe_reports_with_dampener, is_report_safe_with_dampener,
+    )
+    from day2.batched import count_safe_reports_batched, count_safe_reports_with_dampener_batched
+    from utils.parsing import parse_int_rows
+
+    def reports(raw):
+        levels, offsets = parse_int_rows(raw)
+        flat = levels.tolist()
+        return [flat[a:b] for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+    return [
+        Case("parse_int_rows", lambda raw: raw, parse_int_rows, None),
+        Case("count_safe_reports", reports, count_safe_reports, 16 << 20),
+        Case("count_safe_reports_with_dampener", reports, count_safe_reports_with_dampener, 16 << 20),
+        Case("is_report_safe_with_dampener", reports,
+             lambda rs: sum(map(is_report_safe_with_dampener, rs)), 4 << 20),
+        Case("count_safe_reports_batched", parse_int_rows, lambda p: count_safe_reports_batched(*p), None),
+        Case("count_safe_reports_with_dampener_batched", parse_int_rows,
+             lambda p: count_safe_reports_with_dampener_batched(*p), None),
+    ]
+
+
+def _day3_cases():
+    from day3.day3 import find_valid_mul_instructions, extract_do_instructions
+    from day3.scanners import find_mul_instructions_regex, find_mul_instructions_dfa, scan_instructions
+    from day3.parallel import scan_buffer_chunked, scan_file_parallel
+
+    text = bytes.decode
+    return [
+        Case("find_valid_mul_instructions", text, find_valid_mul_instructions, 4 << 20),
+        Case("extract_do_instructions", text, extract_do_instructions, 256 << 10),
+        Case("find_mul_instructions_regex", lambda raw: raw, find_mul_instructions_regex, None),
+        Case("find_mul_instructions_dfa", lambda raw: raw, find_mul_instructions_dfa, 64 << 20),
+        Case("scan_instructions", lambda raw: raw, scan_instructions, None),
+        Case("scan_buffer_chunked", lambda raw: raw, scan_buffer_chunked, None),
+        Case("scan_file_parallel", _as_file, scan_file_parallel, None),
+    ]
+
+
+def _day4_cases():
+    from day4.day4 import find_xmas_occurrences, find_x_mas_patterns, count_xmas_in_grid, count_x_mas_in_grid
+    from day4.day4 import find_xmas_occurrences_vectorized, find_xmas_occurrences_arrays
+    from day4.patterns import count_patterns_bitplane, find_patterns_bitplane
+    from day4.tiled import count_buffer_tiled
+    from day4.incremental import IncrementalWordSearch
+    from day4.word_search import WordSearchIndex
+    from utils.parsing import parse_grid
+
+    def rows(raw):
+        return list(parse_grid(raw))
+
+    def edits(raw):
+        """A built search and 1000 seeded single-cell updates to apply to it"""
+        search = IncrementalWordSearch(parse_grid(raw))
+        rng = random.Random(0)
+        updates = [(rng.randrange(search.rows), rng.randrange(search.cols), rng.choice("XMAS"))
+                   for _ in range(1000)] if search.rows and search.cols else []
+        return search, updates
+
+    def apply_edits(prepared):
+        search, updates = prepared
+        for row, col, char in updates:
+            search.update(row, col, char)
+        return search.xmas_count, search.x_mas_count
+
+    return [
+        Case("parse_grid", lambda raw: raw, parse_grid, None),
+        Case("find_xmas_occurrences", rows, find_xmas_occurrences, 64 << 10),
+        Case("find_x_mas_patterns", rows, find_x_mas_patterns, 64 << 10),
+        Case("count_xmas_in_grid", parse_grid, count_xmas_in_grid, None),
+        Case("count_x_mas_in_grid", parse_grid, count_x_mas_in_grid, None),
+        Case("count_patterns_bitplane", parse_grid, count_patterns_bitplane, None),
+        Case("find_patterns_bitplane", parse_grid, find_patterns_bitplane, 16 << 20),
+        Case("find_xmas_occurrences_vectorized", parse_grid, find_xmas_occurrences_vectorized, 16 << 20),
+        Case("find_xmas_occurrences_arrays", parse_grid, find_xmas_occurrences_arrays, None),
+        Case("count_buffer_tiled", lambda raw: raw, count_buffer_tiled, None),
+        Case("IncrementalWordSearch", parse_grid, IncrementalWordSearch, 16 << 20),
+        Case("IncrementalWordSearch.update", edits, apply_edits, 16 << 20),
+        Case("WordSearchIndex.count", parse_grid, lambda g: WordSearchIndex(g).count(["XMAS"]), 16 << 20),
+    ]
+
+
+def _solver_cases(day):
+    solver = get_solver(day)
+    return [
+        Case("solver.parse", lambda raw: raw, solver.parse, None),
+        Case("solver.part1", solver.parse, solver.part1, None),
+        Case("solver.part2", solver.parse, solver.part2, None),
+    ]
+
+
+CASES = {
+    1: _day1_cases,
+    2: _day2_cases,
+    3: _day3_cases,
+    4: _day4_cases,
+}
+
+
+def cases_for(day):
+    return CASES[day]() + _solver_cases(day)
+
+
+def time_case(case, raw, repeat):
+    """Best wall time of run(prepare(raw)) over `repeat` runs"""
+    argument = case.prepare(raw)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(days, sizes, seed=0, repeat=3, log=print):
+    """Run every case of the given days over the sizes, returns the list of result records"""
+    results = []
+    for day in days:
+        cases = cases_for(day)
+        for size in sizes:
+            raw = generate(day, size, seed)
+            for case in cases:
+                if case.max_size is not None and size > case.max_size:
+                    continue
+                seconds = time_case(case, raw, repeat)
+                record = {
+                    "day": day,
+                    "case": case.name,
+                    "size": format_size(size),
+                    "bytes": len(raw),
+                    "seconds": seconds,
+                    "mb_per_s": len(raw) / (1024 * 1024) / seconds if seconds > 0 else None,
+                }
+                results.append(record)
+                log(f"{day:>3}  {record['size']:>6}  {case.name:<42} {seconds * 1000:>10.3f} ms")
+    return results
+
+
+def _key(record):
+    return record["day"], record["case"], record["size"]
+
+
+def find_regressions(results, baseline, tolerance=0.5, noise_floor=NOISE_FLOOR):
+    """Records slower than their baseline by more than `tolerance` (0.5 = 50%), as (record, baseline seconds)"""
+    reference = {_key(record): record["seconds"] for record in baseline.get("results", [])}
+    regressions = []
+    for record in results:
+        previous = reference.get(_key(record))
+        if previous is None or record["seconds"] < noise_floor:
+            continue
+        if record["seconds"] > previous * (1 + tolerance):
+            regressions.append((record, previous))
+    return regressions
+
+
+def make_report(results, seed, repeat):
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "host": platform.node(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=parse_days, default=sorted(CASES), help="Days to benchmark, e.g. 1-4")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Input sizes, e.g. 1KB,1MB,1GB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against this JSON file (e.g. benchmarks/baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown against the baseline (default 0.5 = 50%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    print(f"{'Day':>3}  {'Size':>6}  {'Case':<42} {'Time':>13}")
+    report = make_report(run_suite(args.days, sizes, args.seed, args.repeat), args.seed, args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+    if args.baseline:
+        if not args.baseline.is_file():
+            print(f"No baseline at {args.baseline}: create one on this machine with --update-baseline")
+            return 2
+        baseline = json.loads(args.baseline.read_text())
+        host = baseline.get("meta", {}).get("host")
+        if host != report["meta"]["host"]:
+            print(f"Warning: baseline recorded on {host or 'another host'}, timings may not compare")
+        regressions = find_regressions(report["results"], baseline, args.tolerance)
+        for record, previous in regressions:
+            print(f"REGRESSION day {record['day']} {record['case']} {record['size']}: "
+                  f"{record['seconds'] * 1000:.3f} ms vs {previous * 1000:.3f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic input generators and the benchmark suite
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import HEAVY_MODULES, parse_importtime
+import benchmarks.crosscheck
+from benchmarks.crosscheck import build_checks, crosscheck, register_backend, shrink, throughput
+from benchmarks.generators import GENERATORS, generate, parse_size, format_size
+from benchmarks.suite import CASES, find_regressions, main, run_suite
+from utils.parsing import parse_int_columns, parse_int_rows, parse_grid
+
+
+class TestGenerators:
+    """Test cases for the seeded input generators"""
+
+    @pytest.mark.parametrize("day", sorted(GENERATORS))
+    def test_deterministic_and_bounded(self, day):
+        for size in (1024, 100_000):
+            data = generate(day, size, seed=7)
+            assert data == generate(day, size, seed=7)
+            assert data != generate(day, size, seed=8)
+            assert size * 0.9 <= len(data) <= size
+
+    def test_inputs_parse_like_real_ones(self):
+        matrix = parse_int_columns(generate(1, 64 * 1024), 2)
+        assert matrix.shape[1] == 2 and (matrix >= 10000).all()
+
+        levels, offsets = parse_int_rows(generate(2, 64 * 1024))
+        lengths = offsets[1:] - offsets[:-1]
+        assert lengths.min() >= 5 and lengths.max() <= 8
+        assert levels.min() >= 10 and levels.max() <= 99
+
+        assert b"mul(" in generate(3, 64 * 1024)
+
+        grid = parse_grid(generate(4, 64 * 1024))
+        assert set("".join(grid)) == set("XMAS")
+
+    def test_blocks_join_cleanly(self, monkeypatch):
+        """Inputs built from several blocks still parse"""
+        monkeypatch.setattr("benchmarks.generators.BLOCK_SIZE", 1000)
+        assert parse_int_rows(generate(2, 10_000)) is not None
+        assert parse_int_columns(generate(1, 10_000), 2) is not None
+        assert len(generate(3, 200_000)) == 200_000
+
+    def test_sizes(self):
+        assert parse_size("1KB") == 1024
+        assert parse_size("1.5mb") == 1536 * 1024
+        assert parse_size("1G") == 1024 ** 3
+        assert format_size(64 * 1024) == "64KB"
+        assert format_size(1000) == "1000B"
+        with pytest.raises(ValueError):
+            parse_size("big")
+
+
+class TestSuite:
+    """Test cases for the benchmark runner and regression check"""
+
+    def test_every_case_runs(self):
+        results = run_suite(sorted(CASES), [1024], repeat=1, log=lambda line: None)
+        days = {record["day"] for record in results}
+
+        assert days == set(CASES)
+        assert all(record["seconds"] >= 0 for record in results)
+        assert {"solver.part1", "solver.part2", "solve_streaming", "scan_file_parallel", "count_buffer_tiled",
+                "IncrementalWordSearch.update"} <= {record["case"] for record in results}
+
+    def test_regressions(self):
+        record = {"day": 1, "case": "similarity", "size": "1MB", "seconds": 0.030}
+        baseline = {"results": [dict(record, seconds=0.010)]}
+
+        assert find_regressions([record], baseline, tolerance=0.5) == [(record, 0.010)]
+        assert find_regressions([record], baseline, tolerance=3.0) == []
+        assert find_regressions([dict(record, seconds=0.001)], baseline) == []
+        assert find_regressions([dict(record, case="other")], baseline) == []
+
+    def test_json_output_and_baseline(self, tmp_path):
+        output = tmp_path / "results.json"
+        assert main(["--days", "3", "--sizes", "1KB", "--repeat", "1", "--output", str(output)]) == 0
+        report = json.loads(output.read_text())
+        assert report["meta"]["seed"] == 0
+        assert {record["case"] for record in report["results"]} >= {"scan_instructions"}
+
+        assert main(["--days", "3", "--sizes", "1KB", "--repeat", "1",
+                     "--baseline", str(output), "--tolerance", "100"]) == 0
+
+    def test_missing_baseline(self, tmp_path):
+        assert main(["--days", "3", "--sizes", "1KB", "--repeat", "1",
+                     "--baseline", str(tmp_path / "baseline.json")]) == 2
+
+
+class TestCrosscheck:
+    """Test cases for the differential checks between backends"""
+
+    def test_backends_agree_with_references(self):
+        checks = build_checks()
+
+        assert set(checks) == {"day1.distance", "day1.similarity", "day2.dampener", "day3.mul", "day3.do",
+                               "day4.xmas", "day4.x_mas"}
+        assert crosscheck(checks, cases=40, seed=3) == []
+
+    def test_mismatch_is_shrunk(self, monkeypatch):
+        """A backend ignoring mul(X,Y) with X > 99 is reported on the smallest such input"""
+        monkeypatch.setattr(benchmarks.crosscheck, "_EXTRA_BACKENDS", {})
+        from day3.day3 import find_valid_mul_instructions
+
+        register_backend("day3.mul", "broken",
+                         lambda text: [(a, b) for a, b in find_valid_mul_instructions(text) if a < 100])
+
+        mismatches = crosscheck(build_checks(["day3.mul"]), cases=100)
+
+        assert [m.backend for m in mismatches] == ["broken"]
+        assert len(mismatches[0].input) == len("mul(100,0)")
+        assert mismatches[0].actual == []
+
+    def test_shrink(self):
+        def candidates(value):
+            return (value[:i] + value[i + 1:] for i in range(len(value)))
+
+        assert shrink([5, 1, 7, 3, 9], candidates, lambda value: 7 in value) == [7]
+
+    def test_throughput_lists_every_backend(self):
+        checks = build_checks(["day2.dampener"])
+        records = throughput(checks, 4096)
+
+        assert [record["backend"] for record in records] == \
+            ["reference"] + [backend.name for backend in checks["day2.dampener"].backends]
+        assert all(record["seconds"] > 0 for record in records)
+
+    def test_throughput_times_production_settings(self, monkeypatch):
+        """A backend checked with test settings is timed through its `timed` function"""
+        monkeypatch.setattr(benchmarks.crosscheck, "_EXTRA_BACKENDS", {})
+        timed = []
+        register_backend("day3.mul", "test settings", lambda text: [], timed=lambda text: timed.append(text))
+
+        records = throughput(build_checks(["day3.mul"]), 1024)
+
+        assert "test settings" in [record["backend"] for record in records]
+        assert len(timed) == 1
+
+    def test_unknown_check(self):
+        with pytest.raises(ValueError):
+            build_checks(["day9.nothing"])
+
+
+class TestStartup:
+    """Test cases for lazy imports and the startup benchmark"""
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   json.decoder\n"
+            "import time:       200 |        300 | json\n"
+            "import time:        50 |         50 | day2.day2\n"
+        )
+        total, timings = parse_importtime(stderr)
+
+        assert total == 350
+        assert timings["json.decoder"] == (100, 100)
+
+    @pytest.mark.parametrize("module", ["day1.day1", "day2.day2", "day3.day3", "day4.day4"])
+    def test_day_import_is_light(self, module):
+        """Importing a day loads none of numpy, requests or loguru"""
+        code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == ""
+
+    def test_reference_paths_without_numpy(self):
+        code = ("import sys, day2.day2 as d; "
+                "assert d.count_safe_reports_with_dampener([[1, 2, 7], [5, 4, 3]]) == 2; "
+                "assert 'numpy' not in sys.modules")
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,52 +1,59 @@
-import requests
-import os
-import numpy as np
 from collections import Counter
 
+from utils.aoc_input import get_input_bytes
+from utils.lazy import lazy_import
+from utils.parsing import parse_int_columns
+from utils.registry import register
 from utils.common_logger import setup_logger, get_logger
 
-# Setup logger
-setup_logger()
+# The logger is configured by the entry point (setup_logger), not at import
 logger = get_logger()
 
+# NumPy is only imported by the vectorized paths
+np = lazy_import("numpy")
+
 def get_advent_of_code_data():
     """Fetch data from Advent of Code 2024 Day 1"""
-    url = "https://adventofcode.com/2024/day/1/input"
-    # Get session from environment variable
-    my_session = os.getenv('ADVENT_OF_CODE_SESSION')
-    if not my_session:
-        logger.error("ADVENT_OF_CODE_SESSION environment variable not set. Please create or modify the .env as explained in the README.md. Skipping solution execution for now.")
+    raw = get_input_bytes(1)
+    if raw is None:
         return None
-    cookies = {'session': my_session}
-    
-    logger.debug("Fetching data from Advent of Code...")
-    response = requests.get(url, cookies=cookies)
-    
-    if response.status_code == 200:
-        logger.debug("Data fetched successfully!")
-        # Parse the data - each line contains two numbers separated by whitespace
-        lines = response.text.strip().split('\n')
-        
-        # Filter valid lines and count them
-        valid_lines = [line for line in lines if line.strip() and len(line.split()) == 2]
-        num_pairs = len(valid_lines)
-        
-        if num_pairs == 0:
-            logger.warning("No valid data found")
-            return None
-        
-        # Create matrix directly
-        matrix = np.zeros((num_pairs, 2), dtype=int)
-        for i, line in enumerate(valid_lines):
-            numbers = line.split()
-            matrix[i, 0] = int(numbers[0])
-            matrix[i, 1] = int(numbers[1])
-        
+    return parse_input(raw)
+
+
+def parse_input(raw):
+    """Parse the raw input into the (n, 2) location matrix, or None"""
+    matrix = parse_location_matrix(raw)
+    if matrix is None:
+        logger.warning("No valid data found")
+        return None
+
+    return matrix
+
+
+def parse_location_matrix(text):
+    """Parse the input (str or bytes) into a (n, 2) int64 matrix, or None if there is no valid line"""
+    matrix = parse_int_columns(text, 2)
+    if matrix is not None:
         return matrix
-    else:
-        logger.error(f"Error fetching data: {response.status_code}")
+
+    # Malformed input: keep only the lines that hold exactly two numbers
+    if not isinstance(text, str):
+        text = bytes(text).decode()
+    lines = text.strip().split('\n')
+    valid_lines = [line for line in lines if line.strip() and len(line.split()) == 2]
+    num_pairs = len(valid_lines)
+
+    if num_pairs == 0:
         return None
 
+    matrix = np.zeros((num_pairs, 2), dtype=np.int64)
+    for i, line in enumerate(valid_lines):
+        numbers = line.split()
+        matrix[i, 0] = int(numbers[0])
+        matrix[i, 1] = int(numbers[1])
+
+    return matrix
+
 
 # Count occurrences in the right list: O(n)
 # Calculate the score: O(n)
@@ -62,6 +69,88 @@ def distanceSumOfSortedElements(list_a, list_b):
     return sum(distances)
 
 
+# Inputs with at least this many pairs are solved with the NumPy engine below
+VECTORIZE_THRESHOLD = 10_000
+
+_INT64_MAX = (1 << 63) - 1
+
+
+def _max_abs(array):
+    # Python ints, so that abs(int64 min) cannot overflow
+    if array.size == 0:
+        return 0
+    return max(abs(int(array.min())), abs(int(array.max())))
+
+
+# Sort both columns: O(n log n)
+# Subtract and sum in NumPy: O(n)
+def distance_sum_vectorized(left, right):
+    """NumPy version of distanceSumOfSortedElements, exact even when int64 would overflow"""
+    left = np.asarray(left, dtype=np.int64)
+    right = np.asarray(right, dtype=np.int64)
+    n = min(left.size, right.size)
+    return distance_sum_of_sorted_arrays(np.sort(left)[:n], np.sort(right)[:n])
+
+
+def distance_sum_of_sorted_arrays(sorted_a, sorted_b):
+    """Sum of |a - b| over two sorted int64 arrays of the same length"""
+    # Each |a - b| is at most 2 * max|x|, so the sum fits if n times that fits
+    if 2 * max(_max_abs(sorted_a), _max_abs(sorted_b)) * sorted_a.size > _INT64_MAX:
+        return distanceSumOfSortedElements(sorted_a.tolist(), sorted_b.tolist())
+    return int(np.abs(sorted_a - sorted_b).sum())
+
+
+# Count the right column with np.unique: O(n log n)
+# Look up every left value with searchsorted: O(n log n)
+def similarity_score_vectorized(left, right):
+    """NumPy version of similarity_score, exact even when int64 would overflow"""
+    left = np.asarray(left, dtype=np.int64)
+    right = np.asarray(right, dtype=np.int64)
+    if left.size == 0 or right.size == 0:
+        return 0
+
+    values, counts = np.unique(right, return_counts=True)
+    positions = np.minimum(np.searchsorted(values, left), values.size - 1)
+    weights = np.where(values[positions] == left, counts[positions], 0)
+
+    if _max_abs(left) * int(counts.max()) * left.size > _INT64_MAX:
+        # Python integers are exact, at the cost of one object per element
+        return int((left.astype(object) * weights.astype(object)).sum())
+    return int((left * weights).sum())
+
+
+def _as_list(values):
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def sorted_distance(left, right):
+    """Part 1: use the NumPy engine for large inputs and the reference otherwise"""
+    if min(len(left), len(right)) >= VECTORIZE_THRESHOLD:
+        return distance_sum_vectorized(left, right)
+    return distanceSumOfSortedElements(_as_list(left), _as_list(right))
+
+
+def similarity(left, right):
+    """Part 2: use the NumPy engine for large inputs and the reference otherwise"""
+    if min(len(left), len(right)) >= VECTORIZE_THRESHOLD:
+        return similarity_score_vectorized(left, right)
+    return similarity_score(_as_list(left), _as_list(right))
+
+
+@register(1)
+class Day1Solver:
+    """Both parts work on the two columns of the location matrix"""
+
+    def parse(self, raw):
+        return parse_input(raw)
+
+    def part1(self, matrix):
+        return sorted_distance(matrix[:, 0], matrix[:, 1])
+
+    def part2(self, matrix):
+        return similarity(matrix[:, 0], matrix[:, 1])
+
+
 def main():
     
     # Get data from Advent of Code
@@ -74,12 +163,12 @@ def main():
         # Extract columns
         col_a = matrix[:, 0]  # First column
         col_b = matrix[:, 1]  # Second column
-        # TODO: numpy matrix finally not needed here. Could be replaced by lists.
-        sorted_distance = distanceSumOfSortedElements(col_a.tolist(), col_b.tolist())
-        similarity_index = similarity_score(col_a.tolist(), col_b.tolist())
+        distance = sorted_distance(col_a, col_b)
+        similarity_index = similarity(col_a, col_b)
         
-        logger.success(f"Part 1: {sorted_distance}")
+        logger.success(f"Part 1: {distance}")
         logger.success(f"Part 2: {similarity_index}")
 
 if __name__ == "__main__":
+    setup_logger()
     main()
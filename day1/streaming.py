@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 1 streaming solver for inputs larger than RAM
+
+The input is read in chunks, so memory is bounded by the chunk, run and
+histogram sizes whatever the input size:
+- Part 1 sorts each column with an external sort: sorted runs are spilled to
+  temporary files, then merged block by block (k-way merge). At most
+  `fan_in` runs are merged at once: with more runs, groups of them are first
+  merged into longer intermediate runs, pass after pass, so open files and
+  merge buffers stay bounded too.
+- Part 2 keeps a histogram of each column. If the number of distinct values
+  exceeds the limit, it is computed from the sorted runs with a merge-join.
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from day1.day1 import distance_sum_of_sorted_arrays
+from utils.parsing import parse_int_columns
+
+DEFAULT_CHUNK_SIZE = 1 << 20              # bytes of input parsed at a time
+DEFAULT_RUN_SIZE = 1 << 22                # values per sorted spill run (32 MiB of int64)
+DEFAULT_BLOCK_SIZE = 1 << 16              # values read from each run per merge step
+DEFAULT_FAN_IN = 64                       # runs merged at once (open files and block buffers)
+DEFAULT_MAX_HISTOGRAM_ENTRIES = 1 << 20   # distinct values kept in memory per column
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _iter_line_blocks(source, chunk_size):
+    """Yield byte blocks that end on a line boundary.
+
+    `source` is a path, a binary file object (including mmap) or a bytes-like buffer.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from _iter_line_blocks(f, chunk_size)
+        return
+
+    if hasattr(source, "read"):
+        def read():
+            return source.read(chunk_size)
+    else:
+        view = memoryview(source)
+        position = 0
+
+        def read():
+            nonlocal position
+            data = bytes(view[position:position + chunk_size])
+            position += len(data)
+            return data
+
+    carry = b""
+    while True:
+        data = read()
+        if not data:
+            break
+        data = carry + data
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            carry = data
+            continue
+        yield data[:cut]
+        carry = data[cut:]
+    if carry.strip():
+        yield carry
+
+
+def iter_pair_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (left, right) int64 arrays parsed chunk by chunk from `source`"""
+    for block in _iter_line_blocks(source, chunk_size):
+        pairs = parse_int_columns(block, 2)
+        if pairs is None:
+            if not block.strip():
+                continue
+            raise ValueError("Every line of the input must hold exactly two numbers")
+        yield pairs[:, 0], pairs[:, 1]
+
+
+class Histogram:
+    """Sorted (values, counts) of a column, merged chunk by chunk"""
+
+    def __init__(self):
+        self.values = _EMPTY
+        self.counts = _EMPTY
+
+    def add(self, values):
+        values, counts = np.unique(values, return_counts=True)
+        if self.values.size:
+            values, counts = _merge_counts(np.concatenate((self.values, values)),
+                                           np.concatenate((self.counts, counts)))
+        self.values, self.counts = values, counts.astype(np.int64)
+
+    def __len__(self):
+        return self.values.size
+
+
+def _merge_counts(values, counts):
+    """Sum the counts of equal values"""
+    order = np.argsort(values, kind="stable")
+    values, counts = values[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    return values[starts], np.add.reduceat(counts, starts)
+
+
+def _weighted_common_sum(values_a, counts_a, values_b, counts_b):
+    """Sum of v * count_a(v) * count_b(v) over the values present in both, with exact integers"""
+    common, index_a, index_b = np.intersect1d(values_a, values_b, assume_unique=True, return_indices=True)
+    if common.size == 0:
+        return 0
+    # At most one Python object per distinct value, which the histogram limit bounds
+    return int((common.astype(object) * counts_a[index_a].astype(object) * counts_b[index_b].astype(object)).sum())
+
+
+class _RunWriter:
+    """Buffers values and spills them to disk as sorted runs of `run_size` values"""
+
+    def __init__(self, spill_dir, prefix, run_size):
+        self.spill_dir = spill_dir
+        self.prefix = prefix
+        self.run_size = run_size
+        self.buffer = []
+        self.buffered = 0
+        self.paths = []
+
+    def add(self, values):
+        self.buffer.append(np.array(values, dtype=np.int64))
+        self.buffered += values.size
+        if self.buffered >= self.run_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffered:
+            return
+        path = os.path.join(self.spill_dir, f"{self.prefix}-{len(self.paths)}.bin")
+        np.sort(np.concatenate(self.buffer)).tofile(path)
+        self.paths.append(path)
+        self.buffer, self.buffered = [], 0
+
+    def reduce(self, fan_in, block_size):
+        """Merge runs into longer ones, pass after pass, until at most `fan_in` remain"""
+        fan_in = max(2, fan_in)
+        merge_pass = 0
+        while len(self.paths) > fan_in:
+            merged = []
+            for start in range(0, len(self.paths), fan_in):
+                group = self.paths[start:start + fan_in]
+                if len(group) == 1:
+                    merged.extend(group)
+                    continue
+                path = os.path.join(self.spill_dir, f"{self.prefix}-pass{merge_pass}-{len(merged)}.bin")
+                with open(path, "wb") as f:
+                    for block in merge_sorted_runs(group, block_size):
+                        block.tofile(f)
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            self.paths = merged
+            merge_pass += 1
+
+
+def _spill_histogram(histogram, runs):
+    """Expand a histogram back into values and spill them, at most `run_size` values at a time"""
+    values, counts = histogram.values, histogram.counts.copy()
+    while values.size:
+        cut = max(1, int(np.searchsorted(np.cumsum(counts), runs.run_size, side="right")))
+        if counts[0] > runs.run_size:
+            runs.add(np.full(runs.run_size, values[0], dtype=np.int64))
+            counts[0] -= runs.run_size
+            continue
+        runs.add(np.repeat(values[:cut], counts[:cut]))
+        values, counts = values[cut:], counts[cut:]
+
+
+def merge_sorted_runs(paths, block_size=DEFAULT_BLOCK_SIZE):
+    """K-way merge of sorted int64 run files, yielding sorted blocks.
+
+    Every run is open at once: callers cap the number of runs (see _RunWriter.reduce).
+    """
+    files = [open(path, "rb") for path in paths]
+    try:
+        buffers = [np.fromfile(f, dtype=np.int64, count=block_size) for f in files]
+        while True:
+            active = [i for i, buffer in enumerate(buffers) if buffer.size]
+            if not active:
+                return
+            # No run can later produce a value below the smallest buffered tail
+            bound = min(buffers[i][-1] for i in active)
+            parts = []
+            for i in active:
+                cut = np.searchsorted(buffers[i], bound, side="right")
+                parts.append(buffers[i][:cut])
+                buffers[i] = buffers[i][cut:]
+                if buffers[i].size == 0:
+                    buffers[i] = np.fromfile(files[i], dtype=np.int64, count=block_size)
+            yield np.sort(np.concatenate(parts))
+    finally:
+        for f in files:
+            f.close()
+
+
+def _aligned_blocks(blocks_a, blocks_b):
+    """Re-cut two block streams into pairs of equal length, stopping at the shorter stream"""
+    carry_a, carry_b = _EMPTY, _EMPTY
+    blocks_a, blocks_b = iter(blocks_a), iter(blocks_b)
+    while True:
+        if carry_a.size == 0:
+            carry_a = next(blocks_a, None)
+        if carry_b.size == 0:
+            carry_b = next(blocks_b, None)
+        if carry_a is None or carry_b is None:
+            return
+        n = min(carry_a.size, carry_b.size)
+        yield carry_a[:n], carry_b[:n]
+        carry_a, carry_b = carry_a[n:], carry_b[n:]
+
+
+def _counted_blocks(sorted_blocks):
+    """Turn sorted value blocks into (values, counts) blocks with each value in exactly one block"""
+    pending_value, pending_count = _EMPTY, _EMPTY
+    for block in sorted_blocks:
+        values, counts = np.unique(block, return_counts=True)
+        if pending_value.size and pending_value[0] == values[0]:
+            counts[0] += pending_count[0]
+        elif pending_value.size:
+            yield pending_value, pending_count
+        # The last value may continue in the next block
+        yield values[:-1], counts[:-1]
+        pending_value, pending_count = values[-1:], counts[-1:]
+    if pending_value.size:
+        yield pending_value, pending_count
+
+
+def _merge_join_sum(counted_a, counted_b):
+    """Similarity score of two streams of sorted (values, counts) blocks"""
+    total = 0
+    counted_a, counted_b = iter(counted_a), iter(counted_b)
+    values_a = counts_a = values_b = counts_b = _EMPTY
+    while True:
+        while values_a.size == 0:
+            values_a, counts_a = next(counted_a, (None, None))
+            if values_a is None:
+                return total
+        while values_b.size == 0:
+            values_b, counts_b = next(counted_b, (None, None))
+            if values_b is None:
+                return total
+        bound = min(values_a[-1], values_b[-1])
+        cut_a = np.searchsorted(values_a, bound, side="right")
+        cut_b = np.searchsorted(values_b, bound, side="right")
+        total += _weighted_common_sum(values_a[:cut_a], counts_a[:cut_a], values_b[:cut_b], counts_b[:cut_b])
+        values_a, counts_a = values_a[cut_a:], counts_a[cut_a:]
+        values_b, counts_b = values_b[cut_b:], counts_b[cut_b:]
+
+
+def solve_streaming(source, chunk_size=DEFAULT_CHUNK_SIZE, run_size=DEFAULT_RUN_SIZE,
+                    block_size=DEFAULT_BLOCK_SIZE, max_histogram_entries=DEFAULT_MAX_HISTOGRAM_ENTRIES,
+                    spill_dir=None, part1=True, part2=True, fan_in=DEFAULT_FAN_IN):
+    """Return (part 1, part 2) for an input read once from `source`.
+
+    `source` is a path, a binary file object, an mmap or a bytes-like buffer.
+    A part that is not requested is returned as None.
+    """
+    with tempfile.TemporaryDirectory(prefix="day1-", dir=spill_dir) as tmp_dir:
+        left_runs = _RunWriter(tmp_dir, "left", run_size)
+        right_runs = _RunWriter(tmp_dir, "right", run_size)
+        left_histogram, right_histogram = Histogram(), Histogram()
+        use_histograms = part2
+        need_runs = part1
+
+        for left, right in iter_pair_chunks(source, chunk_size):
+            if use_histograms:
+                left_histogram.add(left)
+                right_histogram.add(right)
+                if max(len(left_histogram), len(right_histogram)) > max_histogram_entries:
+                    # Too many distinct values: part 2 will merge-join the sorted runs instead
+                    use_histograms = False
+                    if not need_runs:
+                        # The histograms already hold every value read so far
+                        _spill_histogram(left_histogram, left_runs)
+                        _spill_histogram(right_histogram, right_runs)
+                        need_runs = True
+                        left_histogram, right_histogram = Histogram(), Histogram()
+                        continue
+                    left_histogram, right_histogram = Histogram(), Histogram()
+            if need_runs:
+                left_runs.add(left)
+                right_runs.add(right)
+        left_runs.flush()
+        right_runs.flush()
+        left_runs.reduce(fan_in, block_size)
+        right_runs.reduce(fan_in, block_size)
+
+        distance = None
+        if part1:
+            distance = 0
+            for sorted_a, sorted_b in _aligned_blocks(merge_sorted_runs(left_runs.paths, block_size),
+                                                      merge_sorted_runs(right_runs.paths, block_size)):
+                distance += distance_sum_of_sorted_arrays(sorted_a, sorted_b)
+
+        similarity = None
+        if part2 and use_histograms:
+            similarity = _weighted_common_sum(left_histogram.values, left_histogram.counts,
+                                              right_histogram.values, right_histogram.counts)
+        elif part2:
+            similarity = _merge_join_sum(_counted_blocks(merge_sorted_runs(left_runs.paths, block_size)),
+                                         _counted_blocks(merge_sorted_runs(right_runs.paths, block_size)))
+    return distance, similarity
+
+
+def distance_sum_streaming(source, **kwargs):
+    """Streaming version of distanceSumOfSortedElements"""
+    return solve_streaming(source, part2=False, **kwargs)[0]
+
+
+def similarity_score_streaming(source, **kwargs):
+    """Streaming version of similarity_score"""
+    return solve_streaming(source, part1=False, **kwargs)[1]
+
+
+def main(path):
+    from utils.common_logger import setup_logger, get_logger
+
+    setup_logger()
+    logger = get_logger()
+    distance, similarity = solve_streaming(path)
+    logger.success(f"Part 1: {distance}")
+    logger.success(f"Part 2: {similarity}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m day1.streaming <input file>")
+        sys.exit(1)
+    main(sys.argv[1])
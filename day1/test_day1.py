@@ -1,6 +1,14 @@
+import numpy as np
 import pytest
 
-from day1.day1 import distanceSumOfSortedElements, similarity_score
+from day1.day1 import (
+    distanceSumOfSortedElements, similarity_score, distance_sum_vectorized, similarity_score_vectorized,
+    sorted_distance, similarity, parse_location_matrix, VECTORIZE_THRESHOLD,
+)
+from day1 import streaming
+from day1.streaming import (
+    DEFAULT_CHUNK_SIZE, solve_streaming, distance_sum_streaming, similarity_score_streaming
+)
 
 class TestDay1Algorithm:
     """Test cases for the Day 1 sorted distance algorithm"""
@@ -139,5 +147,135 @@ class TestSimilarityIndex:
         
         assert result == expected, f"Expected {expected}, got {result}"
 
+class TestVectorizedEngine:
+    """Test cases for the NumPy engine used on large inputs"""
+
+    def test_matches_reference_on_random_inputs(self):
+        """Both parts agree with the pure Python functions"""
+        rng = np.random.default_rng(2024)
+        for _ in range(100):
+            a = rng.integers(-20, 20, rng.integers(0, 40))
+            b = rng.integers(-20, 20, rng.integers(0, 40))
+
+            assert distance_sum_vectorized(a, b) == distanceSumOfSortedElements(a.tolist(), b.tolist())
+            assert similarity_score_vectorized(a, b) == similarity_score(a.tolist(), b.tolist())
+
+    def test_specific_example(self):
+        """Test with the example from the problem"""
+        a = [3, 4, 2, 1, 3, 3]
+        b = [4, 3, 5, 3, 9, 3]
+
+        assert distance_sum_vectorized(a, b) == 11
+        assert similarity_score_vectorized(a, b) == 31
+
+    def test_int64_overflow_is_exact(self):
+        """Sums that do not fit in int64 are still exact"""
+        a = np.array([2**62, 2**62, -2**62])
+        b = -a
+
+        assert distance_sum_vectorized(a, b) == distanceSumOfSortedElements(a.tolist(), b.tolist())
+        assert similarity_score_vectorized(a, a) == similarity_score(a.tolist(), a.tolist())
+
+    def test_dispatch_above_threshold(self):
+        """Large inputs go through the NumPy engine and give the same answer"""
+        rng = np.random.default_rng(1)
+        a = rng.integers(10000, 99999, VECTORIZE_THRESHOLD)
+        b = rng.integers(10000, 99999, VECTORIZE_THRESHOLD)
+
+        assert sorted_distance(a, b) == distanceSumOfSortedElements(a.tolist(), b.tolist())
+        assert similarity(a, b) == similarity_score(a.tolist(), b.tolist())
+
+    def test_parse_location_matrix(self):
+        """Bulk parsing, with a fallback for malformed lines"""
+        assert parse_location_matrix("3   4\n4   3\n").tolist() == [[3, 4], [4, 3]]
+        assert parse_location_matrix("3   4\n\nfoo\n1 2 3\n2   5\n").tolist() == [[3, 4], [2, 5]]
+        assert parse_location_matrix("") is None
+
+    def test_parse_location_matrix_ragged_lines(self):
+        """Numbers are never paired across lines when the counts happen to add up"""
+        assert parse_location_matrix("1\n2 3 4\n") is None
+        assert parse_location_matrix("1\n2 3 4\n5 6\n").tolist() == [[5, 6]]
+        assert parse_location_matrix(b"5 5\n1\n2 3 4\n").tolist() == [[5, 5]]
+
+class TestStreamingSolver:
+    """Test cases for the constant-memory streaming solver"""
+
+    @staticmethod
+    def _as_input(a, b):
+        return "".join(f"{x}   {y}\n" for x, y in zip(a, b)).encode()
+
+    def test_specific_example(self):
+        """Test with the example from the problem"""
+        data = self._as_input([3, 4, 2, 1, 3, 3], [4, 3, 5, 3, 9, 3])
+
+        assert solve_streaming(data) == (11, 31)
+
+    def test_small_chunks_and_runs(self):
+        """Many chunks, spill runs and merge blocks give the reference answers"""
+        rng = np.random.default_rng(5)
+        a = rng.integers(0, 100, 500)
+        b = rng.integers(0, 100, 500)
+        data = self._as_input(a, b)
+
+        result = solve_streaming(data, chunk_size=37, run_size=50, block_size=7)
+
+        assert result == (distanceSumOfSortedElements(a.tolist(), b.tolist()), similarity_score(a.tolist(), b.tolist()))
+
+    def test_histogram_limit_falls_back_to_merge_join(self):
+        """Part 2 is still exact when the histogram would grow past its limit"""
+        rng = np.random.default_rng(6)
+        a = rng.integers(0, 1000, 400)
+        b = rng.integers(0, 1000, 400)
+        data = self._as_input(a, b)
+
+        result = similarity_score_streaming(data, chunk_size=64, run_size=30, block_size=5, max_histogram_entries=20)
+
+        assert result == similarity_score(a.tolist(), b.tolist())
+
+    def test_multi_pass_merge(self, monkeypatch):
+        """Many runs are merged a few at a time, over several passes"""
+        merged = []
+        merge_sorted_runs = streaming.merge_sorted_runs
+
+        def counting_merge(paths, *args):
+            merged.append(len(paths))
+            return merge_sorted_runs(paths, *args)
+
+        monkeypatch.setattr(streaming, "merge_sorted_runs", counting_merge)
+        rng = np.random.default_rng(7)
+        a = rng.integers(0, 1000, 3000)
+        b = rng.integers(0, 1000, 3000)
+
+        result = solve_streaming(self._as_input(a, b), chunk_size=256, run_size=4, block_size=8,
+                                 max_histogram_entries=20, fan_in=3)
+
+        assert result == (distanceSumOfSortedElements(a.tolist(), b.tolist()), similarity_score(a.tolist(), b.tolist()))
+        assert max(merged) == 3
+        # Beyond the final merges (2 columns, 2 parts), intermediate runs were merged
+        assert len(merged) > 4
+
+    def test_reads_from_file(self, tmp_path):
+        """Input can be a path on disk"""
+        path = tmp_path / "input.txt"
+        path.write_bytes(self._as_input([1, 2], [3, 4]))
+
+        assert distance_sum_streaming(path) == 4
+
+    def test_empty_input(self):
+        """Empty input gives zero for both parts"""
+        assert solve_streaming(b"") == (0, 0)
+
+    def test_malformed_line(self):
+        """A line without two numbers is rejected"""
+        with pytest.raises(ValueError):
+            solve_streaming(b"1 2\n3\n")
+
+    def test_misaligned_lines(self):
+        """Numbers are never paired across lines, even when a chunk holds an even count"""
+        for data in (b"1\n2 3 4\n", b"5 5\n1\n2 3 4\n"):
+            for chunk_size in (4, DEFAULT_CHUNK_SIZE):
+                with pytest.raises(ValueError):
+                    solve_streaming(data, chunk_size=chunk_size)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 2 batched evaluation with NumPy
+
+All reports are packed into one flat `levels` array plus an `offsets` array
+(CSR layout): report r is `levels[offsets[r]:offsets[r+1]]`. Every check is
+done on the whole batch at once, and per-report results are obtained with
+segmented sums (differences of a cumulative sum taken at the offsets).
+"""
+
+import itertools
+from collections import namedtuple
+
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+# Reports in CSR layout; still unpacks as (levels, offsets)
+PackedReports = namedtuple("PackedReports", ["levels", "offsets"])
+
+
+def pack_reports(reports):
+    """Pack a list of reports into (levels, offsets) arrays"""
+    lengths = np.fromiter((len(report) for report in reports), dtype=np.int64, count=len(reports))
+    offsets = np.zeros(len(reports) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    levels = np.fromiter(itertools.chain.from_iterable(reports), dtype=np.int64, count=int(offsets[-1]))
+    return PackedReports(levels, offsets)
+
+
+def _segment_sums(values, offsets):
+    """Sum of values[offsets[r]:offsets[r+1]] for every segment r (empty segments give 0)"""
+    totals = np.zeros(values.size + 1, dtype=np.int64)
+    np.cumsum(values, out=totals[1:])
+    return totals[offsets[1:]] - totals[offsets[:-1]]
+
+
+def _inner_diffs(levels, offsets):
+    """Differences between adjacent levels of the same report, and their own offsets"""
+    diffs = np.diff(levels)
+    inner = np.ones(diffs.size, dtype=bool)
+    # A diff that ends on the first level of a report crosses a report boundary
+    starts = offsets[1:-1]
+    inner[starts[(starts > 0) & (starts < levels.size)] - 1] = False
+    diff_counts = np.maximum(np.diff(offsets) - 1, 0)
+    diff_offsets = np.zeros(offsets.size, dtype=np.int64)
+    np.cumsum(diff_counts, out=diff_offsets[1:])
+    return diffs[inner], diff_offsets
+
+
+def _valid_steps(diffs, direction):
+    steps = diffs * direction
+    return (steps >= 1) & (steps <= 3)
+
+
+def safe_flags(levels, offsets):
+    """Per-report flags: strictly increasing or decreasing by steps of 1 to 3"""
+    diffs, diff_offsets = _inner_diffs(levels, offsets)
+    flags = np.zeros(offsets.size - 1, dtype=bool)
+    for direction in (1, -1):
+        bad_counts = _segment_sums(~_valid_steps(diffs, direction), diff_offsets)
+        flags |= bad_counts == 0
+    return flags
+
+
+def safe_flags_with_dampener(levels, offsets):
+    """Per-report flags: safe after removing at most one level.
+
+    Removing level k of a report keeps it safe in a direction if the steps
+    before level k-1, the steps after level k+1 and the step between the two
+    neighbours of k are all valid. This is evaluated for every level of every
+    report at once.
+    """
+    diffs, diff_offsets = _inner_diffs(levels, offsets)
+    lengths = np.diff(offsets)
+    report_of_level = np.repeat(np.arange(lengths.size), lengths)
+    position = np.arange(levels.size) - offsets[report_of_level]
+    length = lengths[report_of_level]
+    diff_base = diff_offsets[report_of_level]
+
+    # Step between the two neighbours of each level (only meaningful for interior levels)
+    bridge = np.zeros(levels.size, dtype=np.int64)
+    bridge[1:-1] = levels[2:] - levels[:-2]
+    interior = (position > 0) & (position < length - 1)
+
+    prefix_end = diff_base + np.maximum(position - 1, 0)
+    suffix_start = diff_base + np.minimum(position + 1, np.maximum(length - 1, 0))
+    suffix_end = diff_base + np.maximum(length - 1, 0)
+
+    removable = np.zeros(levels.size, dtype=bool)
+    for direction in (1, -1):
+        bad = np.zeros(diffs.size + 1, dtype=np.int64)
+        np.cumsum(~_valid_steps(diffs, direction), out=bad[1:])
+        prefix_ok = bad[prefix_end] == bad[diff_base]
+        suffix_ok = bad[suffix_end] == bad[suffix_start]
+        joins = ~interior | _valid_steps(bridge, direction)
+        removable |= prefix_ok & suffix_ok & joins
+
+    # Removing any level of a report that is already safe leaves it safe
+    flags = _segment_sums(removable, offsets) > 0
+    return flags | (lengths < 2)
+
+
+def count_safe_reports_batched(levels, offsets):
+    """Batched count_safe_reports over packed reports"""
+    return int(safe_flags(levels, offsets).sum())
+
+
+def count_safe_reports_with_dampener_batched(levels, offsets):
+    """Batched count_safe_reports_with_dampener over packed reports"""
+    return int(safe_flags_with_dampener(levels, offsets).sum())
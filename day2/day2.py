@@ -3,45 +3,44 @@
 Advent of Code 2024 - Day 2 Solution
 """
 
-import requests
-import os
 
+from day2.batched import PackedReports, count_safe_reports_batched, count_safe_reports_with_dampener_batched
+from utils.aoc_input import get_input_bytes
+from utils.parsing import parse_int_rows
+from utils.registry import register
 from utils.common_logger import setup_logger, get_logger
 
-# Setup logger
-setup_logger()
+# The logger is configured by the entry point (setup_logger), not at import
 logger = get_logger()
 
 def get_advent_of_code_data():
     """Fetch data from Advent of Code 2024 Day 2"""
-    url = "https://adventofcode.com/2024/day/2/input"
-    # Get session from environment variable
-    my_session = os.getenv('ADVENT_OF_CODE_SESSION')
-    if not my_session:
-        logger.error("ADVENT_OF_CODE_SESSION environment variable not set. Please create or modify the .env as explained in the README.md. Skipping solution execution for now.")
+    raw = get_input_bytes(2)
+    if raw is None:
         return None
-    cookies = {'session': my_session}
-    
-    logger.debug("Fetching data from Advent of Code...")
-    response = requests.get(url, cookies=cookies)
-    
-    if response.status_code == 200:
-        logger.debug("Data fetched successfully!")
-        # Parse the data - each line contains numbers separated by whitespace
-        lines = response.text.strip().split('\n')
-        
-        # Filter valid lines and convert to integers
-        reports = []
-        for line in lines:
-            if line.strip():  # Skip empty lines
-                report = [int(x) for x in line.strip().split()]
-                reports.append(report)
-        
-        logger.debug(f"Retrieved {len(reports)} reports")
-        return reports
-    else:
-        logger.error(f"Error fetching data: {response.status_code}")
+    return parse_input(raw)
+
+
+def parse_input_packed(raw):
+    """Parse the raw input into packed (levels, offsets) arrays for the batched engine, or None"""
+    # Each line is a report of whitespace separated levels, blank lines are skipped
+    reports = parse_int_rows(raw)
+    if reports is None:
+        logger.warning("No valid data found")
+        return None
+
+    logger.debug(f"Retrieved {reports[1].size - 1} reports")
+    return PackedReports(*reports)
+
+
+def parse_input(raw):
+    """Parse the raw input into a list of reports (lists of levels), or None"""
+    reports = parse_input_packed(raw)
+    if reports is None:
         return None
+    levels, offsets = reports
+    levels, offsets = levels.tolist(), offsets.tolist()
+    return [levels[start:end] for start, end in zip(offsets, offsets[1:])]
 
 def is_report_safe(report):
     """Check if a report is safe according to the rules:
@@ -88,7 +87,45 @@ def is_report_safe_with_dampener(report):
     
     return False
 
+def _is_valid_step(a, b, direction):
+    """Adjacent levels move in `direction` (+1 or -1) by at least 1 and at most 3"""
+    return 1 <= (b - a) * direction <= 3
+
+def _is_safe_dropping_at_most_one(report, direction):
+    n = len(report)
+    # prefix_ok[i]: levels 0..i are a valid chain, suffix_ok[i]: levels i..n-1 are
+    prefix_ok = [True] * n
+    for i in range(1, n):
+        prefix_ok[i] = prefix_ok[i-1] and _is_valid_step(report[i-1], report[i], direction)
+    if prefix_ok[n-1]:
+        return True
+    suffix_ok = [True] * n
+    for i in range(n - 2, -1, -1):
+        suffix_ok[i] = suffix_ok[i+1] and _is_valid_step(report[i], report[i+1], direction)
+
+    # Dropping level k leaves a valid chain iff both sides are valid and its neighbours join up
+    for k in range(n):
+        left_ok = k == 0 or prefix_ok[k-1]
+        right_ok = k == n - 1 or suffix_ok[k+1]
+        joins = k == 0 or k == n - 1 or _is_valid_step(report[k-1], report[k+1], direction)
+        if left_ok and right_ok and joins:
+            return True
+    return False
+
+def is_report_safe_with_dampener_linear(report):
+    """Same result as is_report_safe_with_dampener in O(n) time and without copying the report:
+    - For each direction, precompute which prefixes and suffixes are valid chains
+    - Removing level k works if the prefix before it, the suffix after it and the
+      step between its two neighbours are all valid
+    """
+    if len(report) < 2:
+        return True
+    return _is_safe_dropping_at_most_one(report, 1) or _is_safe_dropping_at_most_one(report, -1)
+
 def count_safe_reports(reports):
+    # Packed reports (parse_input_packed) are counted by the batched engine
+    if isinstance(reports, PackedReports):
+        return count_safe_reports_batched(*reports)
     # A report is safe if:
     # 1. All levels are either increasing or decreasing
     # 2. Any two adjacent levels differ by at least 1 and at most 3
@@ -99,12 +136,27 @@ def count_safe_reports(reports):
     return safe_count
 
 def count_safe_reports_with_dampener(reports):
+    if isinstance(reports, PackedReports):
+        return count_safe_reports_with_dampener_batched(*reports)
     safe_count = 0
     for report in reports:
-        if is_report_safe_with_dampener(report):
+        if is_report_safe_with_dampener_linear(report):
             safe_count += 1
     return safe_count
 
+@register(2)
+class Day2Solver:
+    """The counting functions, on packed reports so that they use the batched engine"""
+
+    def parse(self, raw):
+        return parse_input_packed(raw)
+
+    def part1(self, reports):
+        return count_safe_reports(reports)
+
+    def part2(self, reports):
+        return count_safe_reports_with_dampener(reports)
+
 def main():
     # Get data from Advent of Code
     reports = get_advent_of_code_data()
@@ -121,4 +173,5 @@ def main():
     logger.success(f"Part 2: {safe_count_by_one_report}")
 
 if __name__ == "__main__":
+    setup_logger()
     main()
@@ -3,9 +3,16 @@
 Advent of Code 2024 - Day 2 Tests
 """
 
+import random
+
 import pytest
 
 from day2.day2 import count_safe_reports, is_report_safe, is_report_safe_with_dampener, count_safe_reports_with_dampener
+from day2.day2 import is_report_safe_with_dampener_linear, parse_input, parse_input_packed
+from day2.batched import (
+    pack_reports, safe_flags, safe_flags_with_dampener,
+    count_safe_reports_batched, count_safe_reports_with_dampener_batched,
+)
 
 class TestDay2Solution:
     """Test cases for Day 2 solution"""
@@ -119,5 +126,127 @@ class TestDay2Solution:
         
         print("✓ Problem Dampener edge cases test passed")
 
+class TestLinearDampener:
+    """Property tests: the O(n) dampener agrees with the reference implementation"""
+
+    @staticmethod
+    def _random_report(rng, max_len, max_level):
+        start = rng.randint(0, max_level)
+        report = [start]
+        for _ in range(rng.randint(0, max_len - 1)):
+            # Mostly small steps so that safe and almost-safe reports are common
+            report.append(report[-1] + rng.choice([-4, -3, -2, -1, 0, 1, 2, 3, 4, rng.randint(-9, 9)]))
+        return report
+
+    def test_agrees_on_random_reports(self):
+        """Random reports of up to 10 levels"""
+        rng = random.Random(2024)
+        for _ in range(20000):
+            report = self._random_report(rng, 10, 20)
+            expected = is_report_safe_with_dampener(report)
+            assert is_report_safe_with_dampener_linear(report) == expected, f"Report {report}: expected {expected}"
+
+    def test_agrees_on_almost_monotonic_reports(self):
+        """Strictly monotonic reports with one level replaced"""
+        rng = random.Random(7)
+        for _ in range(5000):
+            length = rng.randint(2, 12)
+            step = rng.choice([1, -1])
+            report = [step * rng.randint(1, 3) * i for i in range(length)]
+            report[rng.randrange(length)] = rng.randint(-40, 40)
+            assert is_report_safe_with_dampener_linear(report) == is_report_safe_with_dampener(report), report
+
+    def test_sample_reports(self):
+        """Reports from the problem description"""
+        assert is_report_safe_with_dampener_linear([7, 6, 4, 2, 1])
+        assert not is_report_safe_with_dampener_linear([1, 2, 7, 8, 9])
+        assert not is_report_safe_with_dampener_linear([9, 7, 6, 2, 1])
+        assert is_report_safe_with_dampener_linear([1, 3, 2, 4, 5])
+        assert is_report_safe_with_dampener_linear([8, 6, 4, 4, 1])
+        assert is_report_safe_with_dampener_linear([1, 3, 6, 7, 9])
+
+    def test_short_reports(self):
+        """Empty, single and two-level reports are safe"""
+        assert is_report_safe_with_dampener_linear([])
+        assert is_report_safe_with_dampener_linear([1])
+        assert is_report_safe_with_dampener_linear([1, 9])
+
+    def test_long_report(self):
+        """A 20000-level report with one bad level in the middle"""
+        report = list(range(20000))
+        report[10000] = -1
+
+        assert is_report_safe_with_dampener_linear(report)
+        report[12000] = -1
+        assert not is_report_safe_with_dampener_linear(report)
+
+class TestBatchedReports:
+    """Test cases for the CSR-packed NumPy engine"""
+
+    sample_data = [
+        [7, 6, 4, 2, 1],
+        [1, 2, 7, 8, 9],
+        [9, 7, 6, 2, 1],
+        [1, 3, 2, 4, 5],
+        [8, 6, 4, 4, 1],
+        [1, 3, 6, 7, 9]
+    ]
+
+    def test_pack_reports(self):
+        """Reports are packed into flat levels and offsets"""
+        levels, offsets = pack_reports([[1, 2], [], [3, 4, 5]])
+
+        assert levels.tolist() == [1, 2, 3, 4, 5]
+        assert offsets.tolist() == [0, 2, 2, 5]
+
+    def test_sample_counts(self):
+        """Both parts on the problem sample"""
+        levels, offsets = pack_reports(self.sample_data)
+
+        assert safe_flags(levels, offsets).tolist() == [True, False, False, False, False, True]
+        assert count_safe_reports_batched(levels, offsets) == 2
+        assert count_safe_reports_with_dampener_batched(levels, offsets) == 4
+
+    def test_agrees_with_reference(self):
+        """Random batches, including empty and single-level reports"""
+        rng = random.Random(11)
+        for _ in range(300):
+            reports = [[rng.randint(0, 10) for _ in range(rng.randint(0, 8))] for _ in range(rng.randint(0, 30))]
+            levels, offsets = pack_reports(reports)
+
+            assert safe_flags(levels, offsets).tolist() == [is_report_safe(r) for r in reports]
+            assert safe_flags_with_dampener(levels, offsets).tolist() == [is_report_safe_with_dampener(r) for r in reports]
+
+    def test_empty_batch(self):
+        """No reports, no safe reports"""
+        levels, offsets = pack_reports([])
+
+        assert count_safe_reports_batched(levels, offsets) == 0
+        assert count_safe_reports_with_dampener_batched(levels, offsets) == 0
+
+class TestParseInput:
+    """The parsed input feeds the public functions directly"""
+
+    raw = b"7 6 4 2 1\n1 2 7 8 9\n9 7 6 2 1\n1 3 2 4 5\n8 6 4 4 1\n1 3 6 7 9\n"
+
+    def test_parse_input_into_counts(self):
+        reports = parse_input(self.raw)
+
+        assert reports[0] == [7, 6, 4, 2, 1] and len(reports) == 6
+        assert count_safe_reports(reports) == 2
+        assert count_safe_reports_with_dampener(reports) == 4
+
+    def test_packed_input_into_counts(self):
+        """Packed reports go through the batched engine, with the same answers"""
+        reports = parse_input_packed(self.raw)
+        levels, offsets = reports
+
+        assert count_safe_reports_batched(levels, offsets) == count_safe_reports(reports) == 2
+        assert count_safe_reports_with_dampener_batched(levels, offsets) == count_safe_reports_with_dampener(reports) == 4
+
+    def test_no_valid_data(self):
+        assert parse_input(b"") == []
+        assert parse_input(b"1 2\nfoo\n") is None
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
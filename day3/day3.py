@@ -3,38 +3,38 @@
 Advent of Code 2024 - Day 3 Solution
 """
 
-import requests
-import os
 
+from day3.scanners import find_mul_instructions_regex, find_mul_instructions_dfa, scan_instructions
+from utils.aoc_input import get_input_bytes
+from utils.parsing import parse_blob
+from utils.registry import register
 from utils.common_logger import setup_logger, get_logger
 
-# Setup logger
-setup_logger()
+# The logger is configured by the entry point (setup_logger), not at import
 logger = get_logger()
 
 def get_advent_of_code_data():
     """Fetch data from Advent of Code 2024 Day 3"""
-    url = "https://adventofcode.com/2024/day/3/input"
-    # Get session from environment variable
-    my_session = os.getenv('ADVENT_OF_CODE_SESSION')
-    if not my_session:
-        logger.error("ADVENT_OF_CODE_SESSION environment variable not set. Please create or modify the .env as explained in the README.md. Skipping solution execution for now.")
-        return None
-    cookies = {'session': my_session}
-    
-    logger.debug("Fetching data from Advent of Code...")
-    response = requests.get(url, cookies=cookies)
-    
-    if response.status_code == 200:
-        logger.debug("Data fetched successfully!")
-        # Parse the data - corrupted memory as a single string
-        corrupted_memory = response.text.strip()
-        
-        logger.debug(f"Retrieved corrupted memory of length {len(corrupted_memory)}")
-        return corrupted_memory
-    else:
-        logger.error(f"Error fetching data: {response.status_code}")
+    raw = get_input_bytes(3)
+    if raw is None:
         return None
+    return parse_input(raw)
+
+
+def parse_input(raw):
+    """The corrupted memory of the raw input, as a string"""
+    corrupted_memory = (raw if isinstance(raw, str) else bytes(raw).decode()).strip()
+
+    logger.debug(f"Retrieved corrupted memory of length {len(corrupted_memory)}")
+    return corrupted_memory
+
+
+def parse_input_buffer(raw):
+    """The corrupted memory as one bytes-like view of the input, without copying it (for the scanners)"""
+    corrupted_memory = parse_blob(raw)
+
+    logger.debug(f"Retrieved corrupted memory of length {len(corrupted_memory)}")
+    return corrupted_memory
 
 
 def read_string(corrupted_memory, string_to_read, current_index):
@@ -49,11 +49,8 @@ def read_string(corrupted_memory, string_to_read, current_index):
 # returns (number or None, the next index to start searching for next pattern)
 def read_number(corrupted_memory, current_index):
     i = current_index
-    # Find the start of the number (skip non-digit characters)
-    while i < len(corrupted_memory) and not corrupted_memory[i].isdigit():
-        i += 1
-    
-    if i >= len(corrupted_memory):
+    # The number must start right here: "mul( 2,4)" is not an instruction
+    if i >= len(corrupted_memory) or not corrupted_memory[i].isdigit():
         return (None, i)
     
     # Read up to 3 digits
@@ -70,12 +67,18 @@ def read_number(corrupted_memory, current_index):
         if 0 <= number <= 999:  # Numbers must be 0-3 digits
             return (number, i + len(number_str))
     
-    return (None, i + 4)
+    return (None, i)
 
 
 # Note: we could a regex here be it is a bit cheated :D lets try it mannually.
 #     pattern = r'mul\((\d{1,3}),(\d{1,3})\)'
-def find_valid_mul_instructions(corrupted_memory):
+# The manual scanner stays the reference, the faster ones live in day3/scanners.py
+SCANNER_BACKENDS = {
+    "regex": find_mul_instructions_regex,
+    "dfa": find_mul_instructions_dfa,
+}
+
+def find_valid_mul_instructions(corrupted_memory, backend="reference"):
     """Find all valid mul instructions in the corrupted memory.
     
     Valid mul instructions must:
@@ -83,20 +86,31 @@ def find_valid_mul_instructions(corrupted_memory):
     - Have two numbers separated by comma
     - End with ')'
     - Numbers must be 1-3 digits
+
+    backend is "reference" (this manual scanner), "regex" or "dfa".
     """
+    if backend != "reference":
+        if backend not in SCANNER_BACKENDS:
+            raise ValueError(f"Unknown scanner backend: {backend}")
+        return SCANNER_BACKENDS[backend](corrupted_memory)
+    if not isinstance(corrupted_memory, str):
+        # bytes, or the view of parse_input_buffer: the manual scanner compares str slices
+        corrupted_memory = bytes(corrupted_memory).decode("latin-1")
     valid_instructions = []
     i = 0
     while i < len(corrupted_memory):
         found, i = read_string(corrupted_memory, "mul(", i)
         if found:
+            # On a mismatch, scanning resumes at the mismatching character: it may start a new "mul("
             first_number_result, i = read_number(corrupted_memory, i)
             if first_number_result is not None:
-                found_comma, i = read_string(corrupted_memory, ",", i)
+                found_comma, next_i = read_string(corrupted_memory, ",", i)
                 if found_comma:
-                    second_number_result, i = read_number(corrupted_memory, i)
+                    second_number_result, i = read_number(corrupted_memory, next_i)
                     if second_number_result is not None:
-                        found_parenthesis, i = read_string(corrupted_memory, ")", i)
+                        found_parenthesis, next_i = read_string(corrupted_memory, ")", i)
                         if found_parenthesis:
+                            i = next_i
                             valid_instructions.append((first_number_result, second_number_result))
     return valid_instructions
 
@@ -107,7 +121,7 @@ def calculate_multiplication_sum(instructions):
 
 
 # Returns the string curated from what is in between a "don't()" and a "do()" keywords
-# We are in a "do()" state at the beginning.
+# We are in a "do()" state at the beginning. Each removed part leaves a space behind.
 # Add to the current character to the result string while we are in a do state
 def extract_do_instructions(corrupted_memory):
     result = ""
@@ -119,6 +133,8 @@ def extract_do_instructions(corrupted_memory):
             found, new_i = read_string(corrupted_memory, "don't()", i)
             if found:
                 do_state = False
+                # Keep the text on both sides of the disabled part apart: "mul(1,2don't()do())" holds no mul
+                result += " "
                 i = new_i
             else:
                 # Add current character to result (before read_string advanced)
@@ -136,6 +152,25 @@ def extract_do_instructions(corrupted_memory):
     return result
 
 
+@register(3)
+class Day3Solver:
+    """Part 1 sums every mul, part 2 only those enabled by do()/don't().
+
+    The memory is scanned once, in parse: scan_instructions tracks the
+    do()/don't() state while it reads, so that one pass gives both totals,
+    and the parts only pick theirs.
+    """
+
+    def parse(self, raw):
+        return scan_instructions(parse_input_buffer(raw))
+
+    def part1(self, totals):
+        return totals[0]
+
+    def part2(self, totals):
+        return totals[1]
+
+
 def main():
     
     # Get data from Advent of Code
@@ -147,16 +182,11 @@ def main():
     
     logger.debug(f"Loaded corrupted memory of length {len(corrupted_memory)}")
     
-    # Part 1: Calculate the sum of all valid mul instructions
-    valid_instructions = find_valid_mul_instructions(corrupted_memory)
-    total_sum = calculate_multiplication_sum(valid_instructions)
+    # Part 1 and part 2 in a single pass: the do() and don't() state is tracked while scanning
+    total_sum, total_sum_part2 = scan_instructions(corrupted_memory)
     logger.success(f"Part 1: {total_sum}")
-    
-    # Part 2: Calculate the sum considering do() and dont() state
-    
-    do_instructions = extract_do_instructions(corrupted_memory)
-    total_sum_part2 = calculate_multiplication_sum(find_valid_mul_instructions(do_instructions))
     logger.success(f"Part 2: {total_sum_part2}")
 
 if __name__ == "__main__":
+    setup_logger()
     main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 3 chunked parallel scan of huge corrupted memory files
+
+The file is memory-mapped and cut into chunks. Each chunk is scanned together
+with the first bytes of the next one (the overlap), so an instruction that
+crosses a boundary is still seen, and it is counted only by the chunk it
+starts in. The do()/don't() state at the start of a chunk is not known in
+advance, so each chunk returns its enabled sum for both possible states and
+the results are merged in order.
+"""
+
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from day3.scanners import INSTRUCTION_PATTERN
+
+_INSTRUCTION_REGEX = re.compile(INSTRUCTION_PATTERN.encode())
+
+# Longest instruction is mul(999,999): a chunk reads that many bytes minus one past its end
+MAX_TOKEN_LENGTH = len("mul(999,999)")
+OVERLAP = MAX_TOKEN_LENGTH - 1
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+
+
+def scan_chunk(data, start, end):
+    """Scan the instructions starting in data[start:end].
+
+    Returns (total, enabled total if the chunk starts enabled, enabled total if
+    it starts disabled, state after the chunk or None if it has no do()/don't()).
+    """
+    window = data[start:min(end + OVERLAP, len(data))]
+    limit = end - start
+    total = if_enabled = if_disabled = 0
+    # Enabled state for each of the two possible starting states
+    state_from_enabled, state_from_disabled = True, False
+    last_state = None
+    for match in _INSTRUCTION_REGEX.finditer(window):
+        if match.start() >= limit:
+            break
+        a, b, do, dont = match.groups()
+        if do or dont:
+            last_state = bool(do)
+            state_from_enabled = state_from_disabled = last_state
+            continue
+        product = int(a) * int(b)
+        total += product
+        if state_from_enabled:
+            if_enabled += product
+        if state_from_disabled:
+            if_disabled += product
+    return total, if_enabled, if_disabled, last_state
+
+
+def merge_chunk_results(results):
+    """Combine chunk results, in file order, into (part 1, part 2)"""
+    total = enabled_total = 0
+    enabled = True
+    for chunk_total, if_enabled, if_disabled, last_state in results:
+        total += chunk_total
+        enabled_total += if_enabled if enabled else if_disabled
+        if last_state is not None:
+            enabled = last_state
+    return total, enabled_total
+
+
+def chunk_bounds(size, chunk_size=DEFAULT_CHUNK_SIZE):
+    """(start, end) of each chunk of a buffer of `size` bytes"""
+    chunk_size = max(1, chunk_size)
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+
+def scan_buffer_chunked(data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Serial chunked scan of an in-memory bytes-like buffer, returns (part 1, part 2)"""
+    return merge_chunk_results(scan_chunk(data, start, end) for start, end in chunk_bounds(len(data), chunk_size))
+
+
+def _scan_file_chunk(task):
+    path, start, end = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return scan_chunk(data, start, end)
+
+
+def scan_file_parallel(path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Scan a corrupted memory file in a process pool, returns (part 1, part 2).
+
+    Each worker memory-maps the file itself, so only offsets and partial sums
+    cross process boundaries.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0, 0
+    tasks = [(os.fspath(path), start, end) for start, end in chunk_bounds(size, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        return merge_chunk_results(map(_scan_file_chunk, tasks))
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return merge_chunk_results(executor.map(_scan_file_chunk, tasks))
+
+
+def main(path, workers=None):
+    from utils.common_logger import setup_logger, get_logger
+
+    setup_logger()
+    logger = get_logger()
+    total_sum, total_sum_part2 = scan_file_parallel(path, workers)
+    logger.success(f"Part 1: {total_sum}")
+    logger.success(f"Part 2: {total_sum_part2}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m day3.parallel <input file> [workers]")
+        sys.exit(1)
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else None)
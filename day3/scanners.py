@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 3 scanner backends
+
+Alternatives to the hand-rolled reference scanner in day3.py:
+- "regex": precompiled `re` pattern
+- "dfa": hand-built automaton over bytes, which never creates substrings
+
+Both follow the puzzle grammar exactly: mul(X,Y) with X and Y of 1 to 3 digits.
+
+`scan_instructions` also tracks do()/don't() while scanning, so both parts
+are answered in one pass without building a filtered copy of the memory.
+"""
+
+import re
+
+MUL_PATTERN = r"mul\((\d{1,3}),(\d{1,3})\)"
+_MUL_REGEX = re.compile(MUL_PATTERN)
+_MUL_REGEX_BYTES = re.compile(MUL_PATTERN.encode())
+
+
+def find_mul_instructions_regex(corrupted_memory):
+    """Find all mul(X,Y) instructions in a str or bytes-like buffer with a compiled regex"""
+    if isinstance(corrupted_memory, str):
+        regex = _MUL_REGEX
+    else:
+        regex = _MUL_REGEX_BYTES
+    return [(int(a), int(b)) for a, b in regex.findall(corrupted_memory)]
+
+
+INSTRUCTION_PATTERN = MUL_PATTERN + r"|(do\(\))|(don't\(\))"
+_INSTRUCTION_REGEX = re.compile(INSTRUCTION_PATTERN)
+_INSTRUCTION_REGEX_BYTES = re.compile(INSTRUCTION_PATTERN.encode())
+
+
+def iter_instructions(corrupted_memory):
+    """Yield ("mul", a, b), ("do",) and ("don't",) in the order they appear"""
+    if isinstance(corrupted_memory, str):
+        regex = _INSTRUCTION_REGEX
+    else:
+        regex = _INSTRUCTION_REGEX_BYTES
+    for a, b, do, dont in regex.findall(corrupted_memory):
+        if do:
+            yield ("do",)
+        elif dont:
+            yield ("don't",)
+        else:
+            yield ("mul", int(a), int(b))
+
+
+def find_valid_mul_instructions_with_state(corrupted_memory):
+    """Find the mul instructions enabled by the last do()/don't() before them (enabled at start)"""
+    enabled = True
+    instructions = []
+    for instruction in iter_instructions(corrupted_memory):
+        if instruction[0] == "mul":
+            if enabled:
+                instructions.append(instruction[1:])
+        else:
+            enabled = instruction[0] == "do"
+    return instructions
+
+
+def scan_instructions(corrupted_memory):
+    """One pass over the memory, returns (sum of all products, sum of enabled products)"""
+    enabled = True
+    total = enabled_total = 0
+    for instruction in iter_instructions(corrupted_memory):
+        if instruction[0] == "mul":
+            product = instruction[1] * instruction[2]
+            total += product
+            if enabled:
+                enabled_total += product
+        else:
+            enabled = instruction[0] == "do"
+    return total, enabled_total
+
+
+# DFA states, named after what has been read so far
+_START, _M, _MU, _MUL, _OPEN, _FIRST, _COMMA, _SECOND = range(8)
+_DIGIT_0, _DIGIT_9 = ord("0"), ord("9")
+_CHAR_M, _CHAR_U, _CHAR_L = ord("m"), ord("u"), ord("l")
+_OPEN_PAREN, _CLOSE_PAREN, _CHAR_COMMA = ord("("), ord(")"), ord(",")
+
+
+def find_mul_instructions_dfa(corrupted_memory):
+    """Find all mul(X,Y) instructions with a deterministic automaton over bytes.
+
+    Accepts bytes, bytearray, mmap or memoryview (a str is encoded first).
+    The numbers are accumulated digit by digit, so no substring is ever created.
+    """
+    data = corrupted_memory.encode() if isinstance(corrupted_memory, str) else corrupted_memory
+    if isinstance(data, memoryview):
+        data = data.cast("B")
+    # bytes, bytearray and mmap can jump straight to the next 'm'
+    find = getattr(data, "find", None)
+
+    instructions = []
+    state = _START
+    first = second = digits = 0
+    i, n = 0, len(data)
+    while i < n:
+        if state == _START and find is not None:
+            i = find(b"m", i)
+            if i < 0:
+                break
+        byte = data[i]
+        i += 1
+        if byte == _CHAR_M:
+            # "mul(" cannot overlap itself: an 'm' always starts a new candidate
+            state = _M
+        elif state == _M:
+            state = _MU if byte == _CHAR_U else _START
+        elif state == _MU:
+            state = _MUL if byte == _CHAR_L else _START
+        elif state == _MUL:
+            state = _OPEN if byte == _OPEN_PAREN else _START
+            first = second = digits = 0
+        elif state in (_OPEN, _FIRST):
+            if _DIGIT_0 <= byte <= _DIGIT_9 and digits < 3:
+                first = first * 10 + byte - _DIGIT_0
+                digits += 1
+                state = _FIRST
+            elif byte == _CHAR_COMMA and state == _FIRST:
+                digits = 0
+                state = _COMMA
+            else:
+                state = _START
+        elif state in (_COMMA, _SECOND):
+            if _DIGIT_0 <= byte <= _DIGIT_9 and digits < 3:
+                second = second * 10 + byte - _DIGIT_0
+                digits += 1
+                state = _SECOND
+            elif byte == _CLOSE_PAREN and state == _SECOND:
+                instructions.append((first, second))
+                state = _START
+            else:
+                state = _START
+        else:
+            state = _START
+    return instructions
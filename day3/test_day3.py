@@ -6,6 +6,10 @@ Advent of Code 2024 - Day 3 Tests
 import pytest
 
 from day3.day3 import find_valid_mul_instructions, calculate_multiplication_sum, extract_do_instructions
+from day3.day3 import parse_input, parse_input_buffer, read_number
+from day3.scanners import find_mul_instructions_dfa, find_mul_instructions_regex
+from day3.scanners import scan_instructions, find_valid_mul_instructions_with_state
+from day3.parallel import scan_buffer_chunked, scan_file_parallel
 
 class TestDay3Solution:
     """Test cases for Day 3 solution"""
@@ -92,6 +96,32 @@ class TestDay3Solution:
             print(f"    ✓ Passed")
         
         print("✓ Edge cases test passed")
+
+    def test_read_number(self):
+        """A number starts exactly at the index: leading characters are not skipped"""
+        assert read_number("12,", 0) == (12, 2)
+        assert read_number("9999", 0) == (999, 3)
+        assert read_number(" 2,", 0) == (None, 0)
+        assert read_number("x1", 0) == (None, 0)
+        assert read_number("mul(", 4) == (None, 4)
+
+    def test_grammar_regressions(self):
+        """Cases where the reference used to disagree with the puzzle grammar and the fast backends"""
+        test_cases = [
+            # (memory, expected_valid_instructions, description)
+            ("mul(3, 4)", [], "Space before the second number"),
+            ("mul( 2,4)", [], "Space before the first number"),
+            ("mul(x1,2)mul(3,4)", [(3,4)], "Non-digit before the first number"),
+            ("mul(3mul(2,4)", [(2,4)], "A mismatch can start the next instruction"),
+            ("mul(3,mul(2,4)", [(2,4)], "Mismatch after the comma"),
+            ("mul(3,4mul(2,4)", [(2,4)], "Mismatch instead of the closing parenthesis"),
+            ("mul(mul(5,6)", [(5,6)], "Mismatch right after mul("),
+        ]
+
+        for memory, expected, description in test_cases:
+            result = find_valid_mul_instructions(memory)
+            assert result == expected, f"{description}: Expected {expected}, got {result}"
+            assert find_valid_mul_instructions(memory, backend="regex") == expected, description
     
     def test_calculation_edge_cases(self):
         """Test calculation with edge cases"""
@@ -143,6 +173,15 @@ class TestDay3Solution:
         print(f"  Found {len(do_instructions)} do instructions: {do_instructions}")
         print("  Note: This extracts do() substrings for processing")
     
+    def test_extract_do_instructions_keeps_parts_apart(self):
+        """Text around a disabled part is not joined into a new mul instruction"""
+        for memory in ["mul(1,2don't()do())", "mul(1don't()xdo(),2)", "mudon't()do()l(3,4)"]:
+            remaining = extract_do_instructions(memory)
+            assert find_valid_mul_instructions(remaining) == [], remaining
+            assert scan_instructions(memory)[1] == 0
+
+        assert extract_do_instructions("mul(1,2)don't()mul(3,4)do()mul(5,6)") == "mul(1,2) mul(5,6)"
+    
     def test_compute_sum_of_do_instructions(self):
         """Test compute_sum_of_do_instructions function with sample data"""
         # Sample corrupted memory from Part 2
@@ -203,23 +242,154 @@ class TestDay3Solution:
         test_cases = [
             # (memory, expected_enabled_instructions, description)
             ("mul(1,2)", [(1,2)], "Single mul instruction (enabled by default)"),
-            ("dont()mul(1,2)", [], "mul disabled by dont()"),
+            ("don't()mul(1,2)", [], "mul disabled by don't()"),
             ("do()mul(1,2)", [(1,2)], "mul enabled by do()"),
-            ("dont()do()mul(1,2)", [(1,2)], "mul re-enabled by do() after dont()"),
-            ("do()dont()mul(1,2)", [], "mul disabled by dont() after do()"),
-            ("mul(1,2)dont()mul(3,4)", [(1,2)], "First mul enabled, second disabled"),
+            ("don't()do()mul(1,2)", [(1,2)], "mul re-enabled by do() after don't()"),
+            ("do()don't()mul(1,2)", [], "mul disabled by don't() after do()"),
+            ("mul(1,2)don't()mul(3,4)", [(1,2)], "First mul enabled, second disabled"),
             ("mul(1,2)do()mul(3,4)", [(1,2), (3,4)], "Both mul enabled"),
+            ("don't()mul(1,2)undo()mul(3,4)", [(3,4)], "undo() contains do()"),
+            ("dont()mul(1,2)", [(1,2)], "dont() without the apostrophe is not an instruction"),
         ]
         
         for memory, expected, description in test_cases:
             print(f"  Testing: {description}")
             print(f"    Memory: '{memory}'")
             print(f"    Expected enabled: {expected}")
-            # TODO: Uncomment when function is implemented
-            # result = find_valid_mul_instructions_with_state(memory)
-            # assert result == expected, f"{description}: Expected {expected}, got {result}"
+            result = find_valid_mul_instructions_with_state(memory)
+            assert result == expected, f"{description}: Expected {expected}, got {result}"
         
-        print("✓ Part 2 state management test prepared")
+        print("✓ Part 2 state management test passed")
+
+class TestParseInput:
+    """The parsed input feeds the public functions directly"""
+
+    raw = b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))\n"
+
+    def test_parse_input_into_reference_functions(self):
+        memory = parse_input(self.raw)
+
+        assert isinstance(memory, str)
+        assert calculate_multiplication_sum(find_valid_mul_instructions(memory)) == 161
+        assert calculate_multiplication_sum(find_valid_mul_instructions(extract_do_instructions(memory))) == 48
+
+    def test_buffer_input(self):
+        """The zero-copy view goes to the scanners, and the reference scanner accepts it too"""
+        memory = parse_input_buffer(self.raw)
+
+        assert scan_instructions(memory) == (161, 48)
+        assert find_valid_mul_instructions(memory) == [(2, 4), (5, 5), (11, 8), (8, 5)]
+
+class TestFusedScanner:
+    """Test cases for the single-pass part 1 + part 2 scanner"""
+
+    def test_part2_sample(self):
+        """Both parts from one scan of the Part 2 sample"""
+        sample_memory = "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+
+        assert scan_instructions(sample_memory) == (161, 48)
+        assert find_valid_mul_instructions_with_state(sample_memory) == [(2, 4), (8, 5)]
+
+    def test_matches_extract_then_rescan(self):
+        """Same part 2 result as extract_do_instructions followed by a rescan"""
+        memories = [
+            "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))",
+            "don't()don't()mul(1,2)do()do()mul(3,4)",
+            "mul(1,2)don't()mul(3,4)do()mul(5,6)don't()",
+        ]
+        for memory in memories:
+            expected = calculate_multiplication_sum(find_valid_mul_instructions(extract_do_instructions(memory)))
+            assert scan_instructions(memory)[1] == expected, memory
+
+    def test_bytes_input(self):
+        assert scan_instructions(b"mul(2,3)don't()mul(4,5)") == (26, 6)
+
+class TestChunkedScanner:
+    """The chunked and parallel scans match the serial scan exactly"""
+
+    memory = (b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+              b"mul(999,999)don't()do()don't()mul(12,3)do()mul(1,1)")
+
+    def test_every_chunk_size(self):
+        """Instructions and do()/don't() cut at every possible boundary"""
+        expected = scan_instructions(self.memory)
+        for chunk_size in range(1, len(self.memory) + 2):
+            result = scan_buffer_chunked(self.memory, chunk_size)
+            assert result == expected, f"chunk size {chunk_size}: Expected {expected}, got {result}"
+
+    def test_file_in_process_pool(self, tmp_path):
+        """Memory-mapped file scanned by two worker processes"""
+        path = tmp_path / "memory.txt"
+        path.write_bytes(self.memory * 50)
+
+        assert scan_file_parallel(path, workers=2, chunk_size=97) == scan_instructions(self.memory * 50)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+
+        assert scan_file_parallel(path) == (0, 0)
+
+class TestScannerBackends:
+    """The regex and DFA backends agree with the reference scanner"""
+
+    corpus = [
+        "xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))",
+        "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))",
+        "mul(1,2)",
+        "mul(123,456)",
+        "mul(1,2)mul(3,4)",
+        "mul(1,2)invalidmul(3,4)",
+        "mul[1,2]",
+        "mul(1,2]",
+        "mul(1,2,3)",
+        "mul(1)",
+        "mul(,2)",
+        "mul(1,)",
+        "mul(1234,2)",
+        "mul(1,2345)",
+        "",
+        "nomulhere",
+        "mul(0,5)",
+        "mul(10,10)",
+        "mul(100,100)",
+        "mul(3, 4)",
+        "mul( 2,4)",
+        "mul(x1,2)mul(3,4)",
+        "mul(mul(5,6)",
+        "mul(3mul(2,4)",
+        "mul(3,mul(2,4)",
+        "mul(3,4mul(2,4)",
+    ]
+
+    @pytest.mark.parametrize("backend", ["regex", "dfa"])
+    def test_backends_agree_on_corpus(self, backend):
+        """Every backend gives the reference result on the test corpus"""
+        for memory in self.corpus:
+            expected = find_valid_mul_instructions(memory)
+            result = find_valid_mul_instructions(memory, backend=backend)
+            assert result == expected, f"{backend} on '{memory}': Expected {expected}, got {result}"
+
+    def test_dfa_accepts_bytes_buffers(self):
+        """The DFA works on bytes, bytearray and memoryview without decoding"""
+        memory = b"xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))"
+        expected = [(2, 4), (5, 5), (11, 8), (8, 5)]
+
+        assert find_mul_instructions_dfa(memory) == expected
+        assert find_mul_instructions_dfa(bytearray(memory)) == expected
+        assert find_mul_instructions_dfa(memoryview(memory)) == expected
+        assert find_mul_instructions_regex(memory) == expected
+
+    def test_candidate_restarts_on_m(self):
+        """A failed candidate does not hide a valid instruction that starts inside it"""
+        memory = "mul(1,mul(2,3)mumul(4,5)mul(6,7mul(8,9)"
+
+        assert find_mul_instructions_dfa(memory) == [(2, 3), (4, 5), (8, 9)]
+        assert find_mul_instructions_regex(memory) == [(2, 3), (4, 5), (8, 9)]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            find_valid_mul_instructions("mul(1,2)", backend="nope")
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the Day 4 tests
+"""
+
+import pytest
+
+
+@pytest.fixture
+def sample_grid():
+    """Word search from the problem description: 18 XMAS and 9 X-MAS"""
+    return [
+        "MMMSXXMASM",
+        "MSAMXMSMSA",
+        "AMXSXMAAMM",
+        "MSAMASMSMX",
+        "XMASAMXAMM",
+        "XXAMMXXAMA",
+        "SMSMSASXSS",
+        "SAXAMASAAA",
+        "MAMMMXMMMM",
+        "MXMXAXMASX"
+    ]
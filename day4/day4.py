@@ -3,66 +3,76 @@
 Advent of Code 2024 - Day 4 Solution
 """
 
-import requests
-import os
-import numpy as np
 
+from utils.aoc_input import get_input_bytes
+from utils.lazy import lazy_import
+from utils.grid import Grid
+from utils.parsing import parse_grid
+from utils.registry import register
 from utils.common_logger import setup_logger, get_logger
 
-# Setup logger
-setup_logger()
+# The logger is configured by the entry point (setup_logger), not at import
 logger = get_logger()
 
+# NumPy is only imported by the vectorized paths
+np = lazy_import("numpy")
+
 def get_advent_of_code_data():
     """Fetch data from Advent of Code 2024 Day 4"""
-    url = "https://adventofcode.com/2024/day/4/input"
-    # Get session from environment variable
-    my_session = os.getenv('ADVENT_OF_CODE_SESSION')
-    if not my_session:
-        logger.error("ADVENT_OF_CODE_SESSION environment variable not set. Please create or modify the .env as explained in the README.md. Skipping solution execution for now.")
+    raw = get_input_bytes(4)
+    if raw is None:
         return None
-    cookies = {'session': my_session}
-    
-    logger.debug("Fetching data from Advent of Code...")
-    response = requests.get(url, cookies=cookies)
-    
-    if response.status_code == 200:
-        logger.debug("Data fetched successfully!")
-        # Parse the data - each line is a row of the word search grid
-        lines = response.text.strip().split('\n')
-        
-        # Filter valid lines (non-empty)
-        grid = [line.strip() for line in lines if line.strip()]
-        
-        if not grid:
-            logger.warning("No valid data found")
-            return None
-        
-        logger.debug(f"Retrieved word search grid of size {len(grid)}x{len(grid[0]) if grid else 0}")
+    return parse_input(raw)
+
+
+def parse_input(raw):
+    """Parse the raw input into a Grid, or a list of rows if they differ in length"""
+    # Rectangular grids are kept as one buffer, without a string per row
+    try:
+        grid = parse_grid(raw)
+    except ValueError:
+        grid = None
+    if grid is not None and len(grid):
+        logger.debug(f"Retrieved word search grid of size {grid.height}x{grid.width}")
         return grid
-    else:
-        logger.error(f"Error fetching data: {response.status_code}")
+
+    # Parse the data - each line is a row of the word search grid
+    lines = raw.decode().strip().split('\n')
+
+    # Filter valid lines (non-empty)
+    grid = [line.strip() for line in lines if line.strip()]
+
+    if not grid:
+        logger.warning("No valid data found")
         return None
+
+    logger.debug(f"Retrieved word search grid of size {len(grid)}x{len(grid[0]) if grid else 0}")
+    return grid
     
 
+# Define the 8 directions: (row_delta, col_delta)
+DIRECTIONS = [
+    (-1, -1), (-1, 0), (-1, 1),  # Up-left, Up, Up-right
+    (0, -1),           (0, 1),   # Left, Right
+    (1, -1),  (1, 0),  (1, 1)    # Down-left, Down, Down-right
+]
+
 def find_xmas_occurrences(grid):
     """Find all XMAS occurrences in the grid"""
     # Handle empty grid
     if not grid or not grid[0]:
         return []
     
-    # Convert grid to numpy array - ensure all rows have same length
-    max_len = max(len(row) for row in grid)
-    padded_grid = [row.ljust(max_len) for row in grid]
-    grid_array = np.array([list(row) for row in padded_grid])
+    if isinstance(grid, Grid):
+        grid_array = grid.as_unicode_array()
+    else:
+        # Convert grid to numpy array - ensure all rows have same length
+        max_len = max(len(row) for row in grid)
+        padded_grid = [row.ljust(max_len) for row in grid]
+        grid_array = np.array([list(row) for row in padded_grid])
     rows, cols = grid_array.shape
     
-    # Define the 8 directions: (row_delta, col_delta)
-    directions = [
-        (-1, -1), (-1, 0), (-1, 1),  # Up-left, Up, Up-right
-        (0, -1),           (0, 1),   # Left, Right
-        (1, -1),  (1, 0),  (1, 1)    # Down-left, Down, Down-right
-    ]
+    directions = DIRECTIONS
     
     # Target word
     target = "XMAS"
@@ -93,8 +103,86 @@ def find_xmas_occurrences(grid):
 
 def count_xmas_in_grid(grid):
     """Count total number of XMAS occurrences in the grid"""
-    occurrences = find_xmas_occurrences(grid)
-    return len(occurrences)
+    return count_xmas_vectorized(grid)
+
+def grid_to_byte_array(grid):
+    """Convert the grid to a (rows, cols) uint8 array, rows padded with spaces like above"""
+    if isinstance(grid, Grid):
+        return grid.as_array()
+    max_len = max(len(row) for row in grid)
+    data = "".join(row.ljust(max_len) for row in grid).encode("latin-1", errors="replace")
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(grid), max_len)
+
+def word_match_masks(grid_array, target):
+    """Yield (direction index, row offset, col offset, mask of matching start cells) per direction.
+
+    For a direction (dr, dc), letter i of a match starting at (r, c) is at
+    (r + i*dr, c + i*dc): comparing one shifted slice per letter and AND-ing
+    them gives every start cell at once. Every mask is a view of one buffer
+    reused by the next direction: use it before asking for the next one.
+    """
+    rows, cols = grid_array.shape
+    word = target.encode("latin-1")
+    span = len(word) - 1
+    # One boolean plane per distinct letter, shared by every direction
+    planes = {letter: grid_array == letter for letter in set(word)}
+    buffer = np.empty(rows * cols, dtype=bool) if len(word) > 1 else None
+    for d, (dr, dc) in enumerate(DIRECTIONS):
+        # Start cells from which the whole word stays inside the grid
+        r0, r1 = max(0, -span * dr), min(rows, rows - span * dr)
+        c0, c1 = max(0, -span * dc), min(cols, cols - span * dc)
+        if r0 >= r1 or c0 >= c1:
+            continue
+        mask = planes[word[0]][r0:r1, c0:c1]
+        if len(word) > 1:
+            mask = np.logical_and(mask, planes[word[1]][r0 + dr:r1 + dr, c0 + dc:c1 + dc],
+                                  out=buffer[:(r1 - r0) * (c1 - c0)].reshape(r1 - r0, c1 - c0))
+        for i in range(2, len(word)):
+            np.logical_and(mask, planes[word[i]][r0 + i*dr:r1 + i*dr, c0 + i*dc:c1 + i*dc], out=mask)
+        yield d, r0, c0, mask
+
+def find_xmas_occurrences_arrays(grid, target="XMAS"):
+    """Occurrences as (rows, cols, directions) int64 arrays, directions indexing DIRECTIONS.
+
+    Sorted like find_xmas_occurrences: by row, then column, then direction.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if grid is None or len(grid) == 0 or len(grid[0]) == 0:
+        return empty, empty, empty
+    grid_array = grid if isinstance(grid, np.ndarray) else grid_to_byte_array(grid)
+    cols = grid_array.shape[1]
+
+    # One int64 key per match, (cell * 8 + direction): a single sort gives the reference order
+    keys = [empty]
+    for d, r0, c0, mask in word_match_masks(grid_array, target):
+        match_rows, match_cols = np.divmod(np.flatnonzero(mask), mask.shape[1])
+        # In place: ((row + r0) * cols + col + c0) * 8 + d
+        match_rows += r0
+        match_rows *= cols
+        match_rows += match_cols
+        match_rows *= len(DIRECTIONS)
+        match_rows += c0 * len(DIRECTIONS) + d
+        keys.append(match_rows)
+    cells, directions = np.divmod(np.sort(np.concatenate(keys)), len(DIRECTIONS))
+    rows, cols = np.divmod(cells, cols)
+    return rows, cols, directions
+
+def find_xmas_occurrences_vectorized(grid, target="XMAS"):
+    """Same output as find_xmas_occurrences, computed with shifted-slice comparisons on a uint8 grid.
+
+    Building one tuple per occurrence dominates on large grids (seconds for
+    10k x 10k): use find_xmas_occurrences_arrays or count_xmas_vectorized there.
+    """
+    rows, cols, directions = find_xmas_occurrences_arrays(grid, target)
+    return [(row, col, *DIRECTIONS[d], target)
+            for row, col, d in zip(rows.tolist(), cols.tolist(), directions.tolist())]
+
+def count_xmas_vectorized(grid, target="XMAS"):
+    """Count the occurrences without building them"""
+    if grid is None or len(grid) == 0 or len(grid[0]) == 0:
+        return 0
+    grid_array = grid if isinstance(grid, np.ndarray) else grid_to_byte_array(grid)
+    return sum(int(np.count_nonzero(mask)) for _, _, _, mask in word_match_masks(grid_array, target))
 
 def find_x_mas_patterns(grid):
     """Find all X-MAS patterns in the grid using convolution"""
@@ -102,10 +190,13 @@ def find_x_mas_patterns(grid):
     if not grid or not grid[0]:
         return []
     
-    # Convert grid to numpy array - ensure all rows have same length
-    max_len = max(len(row) for row in grid)
-    padded_grid = [row.ljust(max_len) for row in grid]
-    grid_array = np.array([list(row) for row in padded_grid])
+    if isinstance(grid, Grid):
+        grid_array = grid.as_unicode_array()
+    else:
+        # Convert grid to numpy array - ensure all rows have same length
+        max_len = max(len(row) for row in grid)
+        padded_grid = [row.ljust(max_len) for row in grid]
+        grid_array = np.array([list(row) for row in padded_grid])
     rows, cols = grid_array.shape
     
     # Define all possible X-MAS convolution kernels
@@ -162,8 +253,22 @@ def find_x_mas_patterns(grid):
 
 def count_x_mas_in_grid(grid):
     """Count total number of X-MAS patterns in the grid"""
-    occurrences = find_x_mas_patterns(grid)
-    return len(occurrences)
+    # Imported here because day4.patterns builds on this module
+    from day4.patterns import count_patterns_bitplane
+    return count_patterns_bitplane(grid)
+
+@register(4)
+class Day4Solver:
+    """Both parts search the same grid"""
+
+    def parse(self, raw):
+        return parse_input(raw)
+
+    def part1(self, grid):
+        return count_xmas_in_grid(grid)
+
+    def part2(self, grid):
+        return count_x_mas_in_grid(grid)
 
 def main():
     
@@ -178,5 +283,5 @@ def main():
     logger.success(f"Part 2: {count_x_mas_in_grid(grid)}")
 
 if __name__ == "__main__":
+    setup_logger()
     main()
-    
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 4 incremental counts for grids edited a few cells at a time
+
+The grid is scanned once, and every match is kept in an index: XMAS matches
+by (start row, start col, direction) and X-MAS matches by kernel top-left
+corner. Changing a cell can only create or break matches whose window covers
+it, so an update drops those windows from the index and checks them again:
+len(word) windows per direction for XMAS, and one per kernel placement
+(3x3 = 9 for X-MAS). The cost of an update does not depend on the grid size.
+"""
+
+import numpy as np
+
+from day4.day4 import DIRECTIONS, word_match_masks, grid_to_byte_array
+from day4.patterns import WILDCARD, X_MAS_KERNELS, kernel_match_masks
+
+
+class IncrementalWordSearch:
+    """XMAS and X-MAS counts of a grid, kept up to date under single-cell updates"""
+
+    def __init__(self, grid, target="XMAS", kernels=X_MAS_KERNELS):
+        if isinstance(grid, np.ndarray):
+            grid_array = grid
+        elif grid is not None and len(grid) and len(grid[0]):
+            grid_array = grid_to_byte_array(grid)
+        else:
+            grid_array = np.zeros((0, 0), dtype=np.uint8)
+        self.rows, self.cols = grid_array.shape
+        # Flat mutable copy: single cells are read far faster from a bytearray than from NumPy
+        self.cells = bytearray(grid_array.tobytes())
+        self.target = target.encode("latin-1")
+        self.kernels = [[row.encode("latin-1") for row in kernel] for kernel in kernels]
+        self.kernel_height = len(kernels[0]) if kernels else 0
+        self.kernel_width = len(kernels[0][0]) if kernels else 0
+
+        self.words = set()
+        for d, r0, c0, mask in word_match_masks(grid_array, target):
+            match_rows, match_cols = np.nonzero(mask)
+            self.words.update(zip((match_rows + r0).tolist(), (match_cols + c0).tolist(), [d] * match_rows.size))
+
+        self.patterns = set()
+        if kernels and self.rows >= self.kernel_height and self.cols >= self.kernel_width:
+            match_rows, match_cols = np.nonzero(np.logical_or.reduce(kernel_match_masks(grid_array, kernels)))
+            self.patterns.update(zip(match_rows.tolist(), match_cols.tolist()))
+
+    @property
+    def xmas_count(self):
+        return len(self.words)
+
+    @property
+    def x_mas_count(self):
+        return len(self.patterns)
+
+    def __getitem__(self, cell):
+        row, col = cell
+        return chr(self.cells[row * self.cols + col])
+
+    def _word_at(self, row, col, d):
+        dr, dc = DIRECTIONS[d]
+        span = len(self.target) - 1
+        end_row, end_col = row + span * dr, col + span * dc
+        if not (0 <= row < self.rows and 0 <= col < self.cols
+                and 0 <= end_row < self.rows and 0 <= end_col < self.cols):
+            return False
+        cells, step = self.cells, dr * self.cols + dc
+        position = row * self.cols + col
+        for letter in self.target:
+            if cells[position] != letter:
+                return False
+            position += step
+        return True
+
+    def _pattern_at(self, row, col):
+        if not (0 <= row <= self.rows - self.kernel_height and 0 <= col <= self.cols - self.kernel_width):
+            return False
+        cells, cols = self.cells, self.cols
+        for kernel in self.kernels:
+            for i, kernel_row in enumerate(kernel):
+                base = (row + i) * cols + col
+                if any(ch != ord(WILDCARD) and cells[base + j] != ch for j, ch in enumerate(kernel_row)):
+                    break
+            else:
+                return True
+        return False
+
+    def update(self, row, col, char):
+        """Set the cell at (row, col) to char and update the counts"""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError(f"Cell ({row}, {col}) is outside the {self.rows}x{self.cols} grid")
+        if len(char) != 1:
+            raise ValueError("A cell holds exactly one character")
+        value = char.encode("latin-1", errors="replace")[0]
+        position = row * self.cols + col
+        if self.cells[position] == value:
+            return
+        self.cells[position] = value
+
+        # Windows covering the cell: letter i of a word starting i steps back along the direction
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            for i in range(len(self.target)):
+                start = (row - i * dr, col - i * dc, d)
+                if self._word_at(*start):
+                    self.words.add(start)
+                else:
+                    self.words.discard(start)
+
+        for i in range(self.kernel_height):
+            for j in range(self.kernel_width):
+                corner = (row - i, col - j)
+                if self._pattern_at(*corner):
+                    self.patterns.add(corner)
+                else:
+                    self.patterns.discard(corner)
+
+    def xmas_occurrences(self):
+        """Current matches, same tuples and order as find_xmas_occurrences"""
+        word = self.target.decode("latin-1")
+        return [(row, col, *DIRECTIONS[d], word) for row, col, d in sorted(self.words)]
+
+    def x_mas_centers(self):
+        """Current (row, col) centres of the X-MAS patterns, by row then column"""
+        return [(row + self.kernel_height // 2, col + self.kernel_width // 2) for row, col in sorted(self.patterns)]
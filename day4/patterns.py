@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 4 kernel pattern matching on bitplanes
+
+Each letter used by the kernels is a bitplane: one bit that is set in the
+cells holding that letter. The bits of every cell a kernel can look at are
+packed into one integer per grid position (its window signature), built with
+a few shifted-slice ORs over the whole grid. A kernel then matches wherever
+`signature & kernel mask == kernel code`, one comparison for the whole grid.
+Kernels are lists of equal-length strings where '.' matches any character.
+"""
+
+import numpy as np
+
+from day4.day4 import grid_to_byte_array
+
+WILDCARD = "."
+
+# Same kernels, in the same order, as find_x_mas_patterns
+X_MAS_KERNELS = [
+    ["M.M",
+     ".A.",
+     "S.S"],
+    ["S.S",
+     ".A.",
+     "M.M"],
+    ["M.S",
+     ".A.",
+     "M.S"],
+    ["S.M",
+     ".A.",
+     "S.M"],
+]
+
+
+def _kernel_shape(kernels):
+    shapes = {(len(kernel), len(kernel[0]) if kernel else 0) for kernel in kernels}
+    if len(shapes) != 1 or 0 in next(iter(shapes)):
+        raise ValueError("Kernels must be non-empty and all of the same size")
+    height, width = shapes.pop()
+    if any(len(row) != width for kernel in kernels for row in kernel):
+        raise ValueError("Kernel rows must all have the same length")
+    return height, width
+
+
+def encode_bitplanes(grid_array, letters):
+    """Encode a uint8 grid with one bit per letter: returns (bits array, {letter: bit})"""
+    letters = sorted(set(letters))
+    dtype = np.min_scalar_type(1 << max(len(letters) - 1, 0))
+    lookup = np.zeros(256, dtype=dtype)
+    letter_bits = {}
+    for i, letter in enumerate(letters):
+        letter_bits[letter] = 1 << i
+        lookup[ord(letter)] = 1 << i
+    return lookup[grid_array], letter_bits
+
+
+def kernel_match_masks(grid_array, kernels):
+    """Boolean mask per kernel of the top-left corners where it matches"""
+    height, width = _kernel_shape(kernels)
+    rows, cols = grid_array.shape
+    out_rows, out_cols = rows - height + 1, cols - width + 1
+    if out_rows <= 0 or out_cols <= 0:
+        return [np.zeros((0, 0), dtype=bool) for _ in kernels]
+
+    letters = {ch for kernel in kernels for row in kernel for ch in row if ch != WILDCARD}
+    bits, letter_bits = encode_bitplanes(grid_array, letters)
+    # Window cells that at least one kernel looks at, each gets len(letters) bits of the signature
+    cells = sorted({(i, j) for kernel in kernels for i, row in enumerate(kernel)
+                    for j, ch in enumerate(row) if ch != WILDCARD})
+    plane_count = len(letter_bits)
+    if len(cells) * plane_count > 64:
+        return [_kernel_match_mask_slow(bits, kernel, letter_bits, out_rows, out_cols) for kernel in kernels]
+
+    dtype = np.min_scalar_type((1 << (len(cells) * plane_count)) - 1)
+    signature = np.zeros((out_rows, out_cols), dtype=dtype)
+    shifted = np.empty_like(signature)
+    for k, (i, j) in enumerate(cells):
+        np.left_shift(bits[i:i + out_rows, j:j + out_cols], dtype.type(k * plane_count), out=shifted, dtype=dtype)
+        np.bitwise_or(signature, shifted, out=signature)
+
+    cell_slot = {cell: k for k, cell in enumerate(cells)}
+    cell_mask = (1 << plane_count) - 1
+    masks = []
+    for kernel in kernels:
+        mask_bits = code = 0
+        for i, row in enumerate(kernel):
+            for j, ch in enumerate(row):
+                if ch != WILDCARD:
+                    shift = cell_slot[(i, j)] * plane_count
+                    mask_bits |= cell_mask << shift
+                    code |= letter_bits[ch] << shift
+        if mask_bits == (1 << (len(cells) * plane_count)) - 1:
+            masks.append(signature == dtype.type(code))
+        else:
+            masks.append((signature & dtype.type(mask_bits)) == dtype.type(code))
+    return masks
+
+
+def _kernel_match_mask_slow(bits, kernel, letter_bits, out_rows, out_cols):
+    # Too many cells and letters for a 64-bit signature: one AND per kernel cell
+    mask = np.ones((out_rows, out_cols), dtype=bool)
+    for i, row in enumerate(kernel):
+        for j, ch in enumerate(row):
+            if ch != WILDCARD:
+                np.logical_and(mask, bits[i:i + out_rows, j:j + out_cols] == letter_bits[ch], out=mask)
+    return mask
+
+
+def _as_grid_array(grid):
+    if isinstance(grid, np.ndarray):
+        return grid
+    if not grid or not grid[0]:
+        return None
+    return grid_to_byte_array(grid)
+
+
+def find_patterns_bitplane(grid, kernels=X_MAS_KERNELS):
+    """Same output as find_x_mas_patterns for any kernel set: (row, col, kernel) for every
+    position where a kernel matches, with (row, col) the kernel centre and the first
+    matching kernel reported, ordered by row then column.
+    """
+    grid_array = _as_grid_array(grid)
+    if grid_array is None:
+        return []
+    height, width = _kernel_shape(kernels)
+    masks = kernel_match_masks(grid_array, kernels)
+    if not masks or masks[0].size == 0:
+        return []
+
+    first_kernel = np.full(masks[0].shape, -1, dtype=np.int64)
+    for index in range(len(masks) - 1, -1, -1):
+        first_kernel[masks[index]] = index
+    match_rows, match_cols = np.nonzero(first_kernel >= 0)
+    kernel_arrays = [np.array([list(row) for row in kernel]) for kernel in kernels]
+    return [(row + height // 2, col + width // 2, kernel_arrays[index])
+            for row, col, index in zip(match_rows.tolist(), match_cols.tolist(),
+                                       first_kernel[match_rows, match_cols].tolist())]
+
+
+def count_patterns_bitplane(grid, kernels=X_MAS_KERNELS):
+    """Number of positions where at least one kernel matches"""
+    grid_array = _as_grid_array(grid)
+    if grid_array is None:
+        return 0
+    masks = kernel_match_masks(grid_array, kernels)
+    if not masks or masks[0].size == 0:
+        return 0
+    return int(np.count_nonzero(np.logical_or.reduce(masks)))
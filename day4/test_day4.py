@@ -3,9 +3,21 @@
 Advent of Code 2024 - Day 4 Tests
 """
 
+import random
+
+import numpy as np
 import pytest
 
 from day4.day4 import find_xmas_occurrences, count_xmas_in_grid, find_x_mas_patterns, count_x_mas_in_grid
+from day4.day4 import find_xmas_occurrences_vectorized, find_xmas_occurrences_arrays, count_xmas_vectorized
+from day4.day4 import DIRECTIONS, grid_to_byte_array
+from day4 import word_search
+from day4.word_search import WordSearchIndex
+from day4.patterns import X_MAS_KERNELS, find_patterns_bitplane, count_patterns_bitplane
+from day4.tiled import grid_layout, count_band, count_buffer_tiled, count_file_tiled
+from day4.incremental import IncrementalWordSearch
+from utils.grid import Grid
+from utils.registry import get_solver
 
 class TestDay4Solution:
     """Test cases for Day 4 solution"""
@@ -497,5 +509,293 @@ class TestDay4Part2Solution:
         print("✓ Overlapping X-MAS patterns test passed")
         print(f"  Found {len(x_mas_occurrences)} overlapping X-MAS patterns")
 
+class TestVectorizedXmasSearch:
+    """The shifted-slice engine gives exactly the reference output"""
+
+    def test_sample_grid(self, sample_grid):
+        """Same occurrences, in the same order, on the problem sample"""
+        assert find_xmas_occurrences_vectorized(sample_grid) == find_xmas_occurrences(sample_grid)
+        assert count_xmas_vectorized(sample_grid) == 18
+
+    def test_random_grids(self):
+        """Random grids, including ragged rows that the reference pads"""
+        rng = random.Random(4)
+        for _ in range(200):
+            grid = ["".join(rng.choice("XMAS.") for _ in range(rng.randint(0, 9))) for _ in range(rng.randint(0, 9))]
+            expected = find_xmas_occurrences(grid)
+
+            assert find_xmas_occurrences_vectorized(grid) == expected, grid
+            assert count_xmas_vectorized(grid) == len(expected), grid
+
+    def test_edge_cases(self):
+        """Empty grids and grids smaller than the word"""
+        for grid in ([], [""], ["X"], ["XMA"], ["XMAS"], ["X", "M", "A", "S"]):
+            assert find_xmas_occurrences_vectorized(grid) == find_xmas_occurrences(grid), grid
+
+    def test_arrays_match_reference(self, sample_grid):
+        """The array form holds the same occurrences, in the same order"""
+        rows, cols, directions = find_xmas_occurrences_arrays(grid_to_byte_array(sample_grid))
+
+        assert rows.dtype == cols.dtype == directions.dtype == np.int64
+        assert [(r, c, *DIRECTIONS[d], "XMAS") for r, c, d in zip(rows, cols, directions)] == \
+            find_xmas_occurrences(sample_grid)
+        assert all(a.size == 0 for a in find_xmas_occurrences_arrays([]))
+
+    def test_accepts_byte_array(self, sample_grid):
+        """A uint8 array can be passed directly, without any conversion"""
+        grid_array = grid_to_byte_array(sample_grid)
+
+        assert grid_array.dtype == np.uint8
+        assert count_xmas_vectorized(grid_array) == 18
+
+class TestWordSearchIndex:
+    """Test cases for the multi-word Aho-Corasick search"""
+
+    def test_xmas_matches_reference(self, sample_grid):
+        """Same XMAS occurrences as find_xmas_occurrences"""
+        index = WordSearchIndex(sample_grid)
+
+        assert index.find(["XMAS"])["XMAS"] == find_xmas_occurrences(sample_grid)
+        assert index.count(["XMAS"]) == {"XMAS": 18}
+
+    def test_many_words_in_one_query(self, sample_grid):
+        """Each word is counted in all 8 directions, like the vectorized search"""
+        index = WordSearchIndex(sample_grid)
+        words = ["XMAS", "MAS", "SAM", "AX", "MM"]
+
+        counts = index.count(words)
+
+        for word in words:
+            assert counts[word] == count_xmas_vectorized(sample_grid, word), word
+
+    def test_random_grids(self):
+        """Random grids agree with the reference search"""
+        rng = random.Random(12)
+        for _ in range(100):
+            grid = ["".join(rng.choice("XMAS") for _ in range(rng.randint(1, 8))) for _ in range(rng.randint(1, 8))]
+            index = WordSearchIndex(grid)
+
+            assert index.find(["XMAS", "SAM"])["XMAS"] == find_xmas_occurrences(grid), grid
+
+    def test_automaton_matches_per_word_counts(self, monkeypatch):
+        """The automaton pass counts like the per-word kernel: palindromes, single letters, overlaps"""
+        monkeypatch.setattr(word_search, "VECTORIZED_MAX_WORDS", 0)
+        rng = random.Random(13)
+        words = ["XMAS", "SAM", "MAS", "AMA", "X", "SS", "XMASAMX"]
+        for _ in range(50):
+            grid = ["".join(rng.choice("XMAS") for _ in range(cols)) for cols in [rng.randint(1, 9)] * rng.randint(1, 9)]
+
+            assert WordSearchIndex(grid).count(words) == {word: count_xmas_vectorized(grid, word) for word in words}
+
+    def test_many_words_use_the_automaton(self, sample_grid):
+        words = [a + b + c for a in "XMAS" for b in "XMAS" for c in "XMAS"]
+
+        counts = WordSearchIndex(sample_grid).count(words)
+
+        assert len(words) > word_search.VECTORIZED_MAX_WORDS
+        assert counts == {word: count_xmas_vectorized(sample_grid, word) for word in words}
+
+    def test_repeated_queries(self):
+        """The grid is indexed once and reused by later queries"""
+        index = WordSearchIndex(["XMAS", "SAMX"])
+
+        assert index.count(["XMAS", "AM"]) == {"XMAS": 2, "AM": 4}
+        assert index.count(["XMAS", "AM"]) == {"XMAS": 2, "AM": 4}
+        assert index.find(["SAMX"])["SAMX"] == [(0, 3, 0, -1, "SAMX"), (1, 0, 0, 1, "SAMX")]
+
+    def test_empty_grid_and_words(self):
+        assert WordSearchIndex([]).count(["XMAS"]) == {"XMAS": 0}
+        with pytest.raises(ValueError):
+            WordSearchIndex(["XMAS"]).count([""])
+
+class TestBitplanePatterns:
+    """Test cases for the bitplane kernel matcher"""
+
+    x_mas_grid = [
+        ".M.S......",
+        "..A..MSMS.",
+        ".M.S.MAA..",
+        "..A.ASMSM.",
+        ".M.S.M....",
+        "..........",
+        "S.S.S.S.S.",
+        ".A.A.A.A..",
+        "M.M.M.M.M.",
+        ".........."
+    ]
+
+    @staticmethod
+    def _comparable(occurrences):
+        return [(row, col, kernel.tolist()) for row, col, kernel in occurrences]
+
+    def test_sample_grid(self):
+        """Same patterns and kernels as find_x_mas_patterns on the problem sample"""
+        expected = self._comparable(find_x_mas_patterns(self.x_mas_grid))
+
+        assert self._comparable(find_patterns_bitplane(self.x_mas_grid)) == expected
+        assert count_patterns_bitplane(self.x_mas_grid) == 9
+
+    def test_random_grids(self):
+        """Random grids agree with the reference"""
+        rng = random.Random(13)
+        for _ in range(200):
+            grid = ["".join(rng.choice("MAS.") for _ in range(rng.randint(0, 8))) for _ in range(rng.randint(0, 8))]
+            expected = find_x_mas_patterns(grid)
+
+            assert self._comparable(find_patterns_bitplane(grid)) == self._comparable(expected), grid
+            assert count_patterns_bitplane(grid) == len(expected), grid
+
+    def test_custom_kernels(self):
+        """User-supplied kernels of another size, with wildcards"""
+        grid = [
+            "XMAS",
+            "MXAS",
+            "XMAS",
+        ]
+        plus = [".M.", "MXA", ".M."]
+        row_of_xmas = ["XMAS"]
+
+        assert count_patterns_bitplane(grid, [plus]) == 1
+        assert [(r, c) for r, c, _ in find_patterns_bitplane(grid, [row_of_xmas])] == [(0, 2), (2, 2)]
+
+    def test_many_letters_and_cells(self):
+        """Kernels too large for a 64-bit signature still match"""
+        kernel = ["ABCDEFGHIJ" * 2] * 4
+        grid = ["ABCDEFGHIJ" * 3] * 5
+
+        assert count_patterns_bitplane(grid, [kernel]) == 4
+
+    def test_invalid_kernels(self):
+        with pytest.raises(ValueError):
+            count_patterns_bitplane(["MAS"], [["M.S"], ["M.", ".A"]])
+
+    def test_default_kernels(self):
+        assert len(X_MAS_KERNELS) == 4
+
+class TestTiledGrid:
+    """Test cases for the banded out-of-core grid counts"""
+
+    @staticmethod
+    def _random_grid(rng, rows, cols):
+        return ["".join(rng.choice("XMAS") for _ in range(cols)) for _ in range(rows)]
+
+    def test_every_band_size(self):
+        """Matches crossing band boundaries are counted exactly once"""
+        rng = random.Random(14)
+        for _ in range(50):
+            grid = self._random_grid(rng, rng.randint(1, 10), rng.randint(1, 8))
+            expected = (count_xmas_in_grid(grid), count_x_mas_in_grid(grid))
+            data = ("\n".join(grid) + "\n").encode()
+            for band_rows in range(1, len(grid) + 2):
+                assert count_buffer_tiled(data, band_rows) == expected, (grid, band_rows)
+
+    def test_line_endings(self):
+        grid = ["MMMSXXMASM", "MSAMXMSMSA", "AMXSXMAAMM", "MSAMASMSMX", "XMASAMXAMM"]
+        expected = count_buffer_tiled("\n".join(grid).encode(), 2)
+
+        assert count_buffer_tiled("\r\n".join(grid).encode(), 2) == expected
+        assert count_buffer_tiled(("\n".join(grid) + "\n\n").encode(), 2) == expected
+
+    def test_file_in_process_pool(self, tmp_path):
+        rng = random.Random(41)
+        grid = self._random_grid(rng, 40, 30)
+        path = tmp_path / "grid.txt"
+        path.write_text("\n".join(grid) + "\n")
+
+        expected = (count_xmas_in_grid(grid), count_x_mas_in_grid(grid))
+        assert count_file_tiled(path, workers=2, band_rows=7) == expected
+        assert count_file_tiled(path, workers=1) == expected
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert count_file_tiled(path) == (0, 0)
+        assert grid_layout(b"\n") == (0, 0, 0)
+
+    def test_ragged_rows(self):
+        with pytest.raises(ValueError):
+            grid_layout(b"XMAS\nXM\nXMAS\n")
+        with pytest.raises(ValueError):
+            count_buffer_tiled(b"XMASX\nXM\nXMAS\nXMAS", 1)
+
+    def test_ragged_rows_on_the_stride(self):
+        """Rows of different widths whose line breaks still fall on the stride are rejected, not miscounted"""
+        data = b"XAAA\nMA\nA\nSAAA\n"
+        with pytest.raises(ValueError):
+            count_band(data, (3, 4, 5), 0, 3)
+        with pytest.raises(ValueError):
+            count_buffer_tiled(data)
+        # The solver falls back to the row list
+        solver = get_solver(4)
+        assert solver.part1(solver.parse(data)) == count_xmas_in_grid(["XAAA", "MA", "A", "SAAA"]) == 1
+
+class TestGridInput:
+    """Test cases for searching a bytes-backed Grid"""
+
+    def test_reference_functions_accept_grid(self, sample_grid):
+        grid = Grid.from_text("\n".join(sample_grid))
+
+        assert find_xmas_occurrences(grid) == find_xmas_occurrences(sample_grid)
+        assert [(r, c, k.tolist()) for r, c, k in find_x_mas_patterns(grid)] == \
+            [(r, c, k.tolist()) for r, c, k in find_x_mas_patterns(sample_grid)]
+
+    def test_fast_paths_accept_grid(self, sample_grid):
+        grid = Grid.from_bytes(("\n".join(sample_grid) + "\n").encode())
+
+        assert count_xmas_in_grid(grid) == 18
+        assert count_x_mas_in_grid(grid) == 9
+        assert find_xmas_occurrences_vectorized(grid) == find_xmas_occurrences(sample_grid)
+        assert WordSearchIndex(grid).count(["XMAS"]) == {"XMAS": 18}
+
+    def test_empty_grid(self):
+        grid = Grid.from_text("")
+
+        assert find_xmas_occurrences(grid) == []
+        assert find_x_mas_patterns(grid) == []
+        assert count_xmas_in_grid(grid) == 0
+        assert count_x_mas_in_grid(grid) == 0
+
+class TestIncrementalWordSearch:
+    """Test cases for counts kept up to date under cell edits"""
+
+    def test_random_edits_match_full_recount(self):
+        rng = random.Random(16)
+        for _ in range(20):
+            rows, cols = rng.randint(1, 8), rng.randint(1, 8)
+            grid = [[rng.choice("XMAS") for _ in range(cols)] for _ in range(rows)]
+            search = IncrementalWordSearch(["".join(row) for row in grid])
+            for _ in range(30):
+                row, col, char = rng.randrange(rows), rng.randrange(cols), rng.choice("XMAS.")
+                grid[row][col] = char
+                search.update(row, col, char)
+
+                rows_text = ["".join(r) for r in grid]
+                assert search.xmas_count == count_xmas_in_grid(rows_text)
+                assert search.x_mas_count == count_x_mas_in_grid(rows_text)
+            assert search.xmas_occurrences() == find_xmas_occurrences(rows_text)
+            assert search.x_mas_centers() == [(r, c) for r, c, _ in find_x_mas_patterns(rows_text)]
+
+    def test_create_and_break_a_match(self):
+        search = IncrementalWordSearch(["XMAX", "....", "...."])
+        assert search.xmas_count == 0
+
+        search.update(0, 3, "S")
+        assert search.xmas_occurrences() == [(0, 0, 0, 1, "XMAS")]
+        assert search[0, 3] == "S"
+
+        search.update(0, 1, "A")
+        assert search.xmas_count == 0
+
+    def test_invalid_updates(self):
+        search = IncrementalWordSearch(["XMAS"])
+        with pytest.raises(IndexError):
+            search.update(1, 0, "X")
+        with pytest.raises(ValueError):
+            search.update(0, 0, "XM")
+
+    def test_empty_grid(self):
+        search = IncrementalWordSearch([])
+        assert (search.xmas_count, search.x_mas_count) == (0, 0)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
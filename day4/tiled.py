@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 4 tiled processing of grids larger than memory
+
+The input file is memory-mapped as bytes and every row is read straight from
+it: with fixed-width rows, row r starts at byte r * stride. The grid is cut
+into horizontal bands, and each band is read together with the halo rows
+below it (len(word) - 1 rows for XMAS, kernel height - 1 for X-MAS), so a
+match that crosses into the next band is still seen. A match is counted only
+by the band that owns its top row, and the band counts are added up. Bands
+are spread over a process pool; memory use is O(band size).
+"""
+
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from day4.day4 import word_match_masks, DIRECTIONS
+from day4.patterns import X_MAS_KERNELS, kernel_match_masks
+from utils.grid import grid_layout
+
+DEFAULT_BAND_BYTES = 16 * 1024 * 1024
+
+
+def band_bounds(rows, band_rows):
+    """(first row, end row) of each band of a grid of `rows` rows"""
+    band_rows = max(1, band_rows)
+    return [(start, min(start + band_rows, rows)) for start in range(0, rows, band_rows)]
+
+
+def _halo(target, kernels):
+    return max(len(target) - 1, len(kernels[0]) - 1 if kernels else 0)
+
+
+def count_band(data, layout, start, end, target="XMAS", kernels=X_MAS_KERNELS):
+    """(XMAS count, X-MAS count) of the matches whose top row is in rows [start, end)"""
+    rows, width, stride = layout
+    stop = min(end + _halo(target, kernels), rows)
+    # The last row may not be followed by a line break
+    raw = data[start * stride:stop * stride]
+    raw = raw.ljust((stop - start) * stride)
+    full = np.frombuffer(raw, dtype=np.uint8).reshape(stop - start, stride)
+    if np.any(full[:rows - 1 - start, stride - 1] != ord("\n")):
+        raise ValueError("Grid rows must all have the same width")
+    band = full[:, :width]
+    # Line breaks on the stride can still come from ragged rows: then rows hold breaks too
+    if np.any(band == ord("\n")) or (stride == width + 2 and np.any(full[:rows - 1 - start, width] != ord("\r"))):
+        raise ValueError("Grid rows must all have the same width")
+    owned = end - start
+
+    span = len(target) - 1
+    xmas = 0
+    for d, r0, _, mask in word_match_masks(band, target):
+        # Top row of a match going up is its last letter
+        top = r0 + min(0, span * DIRECTIONS[d][0])
+        xmas += int(np.count_nonzero(mask[:max(0, owned - top)]))
+
+    x_mas = 0
+    if kernels:
+        masks = kernel_match_masks(band, kernels)
+        if masks[0].size:
+            x_mas = int(np.count_nonzero(np.logical_or.reduce(masks)[:owned]))
+    return xmas, x_mas
+
+
+def default_band_rows(stride):
+    """Rows per band so that a band holds about DEFAULT_BAND_BYTES"""
+    return max(1, DEFAULT_BAND_BYTES // max(1, stride))
+
+
+def count_buffer_tiled(data, band_rows=None, target="XMAS", kernels=X_MAS_KERNELS):
+    """Serial tiled count over an in-memory bytes-like buffer, returns (part 1, part 2)"""
+    layout = grid_layout(data)
+    if band_rows is None:
+        band_rows = default_band_rows(layout[2])
+    counts = [count_band(data, layout, start, end, target, kernels)
+              for start, end in band_bounds(layout[0], band_rows)]
+    return sum(c[0] for c in counts), sum(c[1] for c in counts)
+
+
+def _count_file_band(task):
+    path, layout, start, end, target, kernels = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return count_band(data, layout, start, end, target, kernels)
+
+
+def count_file_tiled(path, workers=None, band_rows=None, target="XMAS", kernels=X_MAS_KERNELS):
+    """Count XMAS and X-MAS in a grid file band by band in a process pool, returns (part 1, part 2).
+
+    Each worker memory-maps the file itself, so only row ranges and counts
+    cross process boundaries.
+    """
+    if os.path.getsize(path) == 0:
+        return 0, 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        layout = grid_layout(data)
+    rows, _, stride = layout
+    if band_rows is None:
+        band_rows = default_band_rows(stride)
+    tasks = [(os.fspath(path), layout, start, end, target, kernels) for start, end in band_bounds(rows, band_rows)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        counts = list(map(_count_file_band, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            counts = list(executor.map(_count_file_band, tasks))
+    return sum(c[0] for c in counts), sum(c[1] for c in counts)
+
+
+def main(path, workers=None):
+    from utils.common_logger import setup_logger, get_logger
+
+    setup_logger()
+    logger = get_logger()
+    xmas_count, x_mas_count = count_file_tiled(path, workers)
+    logger.success(f"Part 1: {xmas_count}")
+    logger.success(f"Part 2: {x_mas_count}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m day4.tiled <input file> [workers]")
+        sys.exit(1)
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else None)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Advent of Code 2024 - Day 4 multi-word search index
+
+A query for several words builds one Aho-Corasick automaton over the words
+and their reversals, and runs it forwards over the lines of the grid: rows,
+columns, diagonals and anti-diagonals. A reversed word found forwards is the
+word read backwards, so these 4 line directions cover the 8 directions of
+find_xmas_occurrences.
+
+Every line is stepped at the same time: the automaton state of each line is
+one entry of a NumPy vector, advanced one cell per step by a gather in the
+transition table. A count costs about max(rows, cols) steps of vector
+operations over all lines, however many words it asks for, which beats the
+per-word shifted-slice kernel of day4.py from about VECTORIZED_MAX_WORDS
+words; smaller queries and `find`, whose cost is building the tuples, use
+that kernel. The index only keeps the grid and where each line starts, not
+the lines themselves.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from day4.day4 import count_xmas_vectorized, find_xmas_occurrences_vectorized, grid_to_byte_array
+
+# Directions the lines are read in; the 4 opposite ones come from the reversed words
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+# Up to this many words, one shifted-slice count per word beats a pass of the automaton
+VECTORIZED_MAX_WORDS = 8
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over bytes with a dense transition table"""
+
+    def __init__(self, words):
+        self.words = list(words)
+        children = [{}]
+        outputs = [[]]
+        for index, word in enumerate(self.words):
+            state = 0
+            for byte in word:
+                if byte not in children[state]:
+                    children.append({})
+                    outputs.append([])
+                    children[state][byte] = len(children) - 1
+                state = children[state][byte]
+            outputs[state].append(index)
+
+        # Breadth-first construction of the failure links, folded into a full transition table
+        delta = np.zeros((len(children), 256), dtype=np.int64)
+        fail = [0] * len(children)
+        queue = deque()
+        for byte, child in children[0].items():
+            delta[0, byte] = child
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = delta[fail[state]]
+            for byte, child in children[state].items():
+                fail[child] = delta[fail[state], byte]
+                delta[state, byte] = child
+                queue.append(child)
+        self.delta = delta
+        # Row-major flat table: the next state of (state, byte) is at state * 256 + byte
+        self.delta_flat = delta.ravel()
+        self.outputs = [tuple(out) for out in outputs]
+        self.accepting = np.array([bool(out) for out in self.outputs])
+
+
+def _line_starts(rows, cols):
+    """(start cell, step, length) arrays of every line, longest lines first.
+
+    Cells are flat indices into the row-major grid; a line of a direction
+    starts at each cell whose previous cell in that direction is outside the grid.
+    """
+    # Every line starts on the first row, the first column or the last column
+    border = np.unique(np.concatenate((np.arange(cols), np.arange(rows) * cols, np.arange(rows) * cols + cols - 1)))
+    r, c = np.divmod(border, max(1, cols))
+    starts, steps, lengths = [], [], []
+    for dr, dc in LINE_DIRECTIONS:
+        first = ~((0 <= r - dr) & (r - dr < rows) & (0 <= c - dc) & (c - dc < cols))
+        line_r, line_c = r[first], c[first]
+        length = np.full(line_r.size, max(rows, cols))
+        if dr:
+            length = np.minimum(length, rows - line_r)
+        if dc > 0:
+            length = np.minimum(length, cols - line_c)
+        elif dc < 0:
+            length = np.minimum(length, line_c + 1)
+        starts.append(line_r * cols + line_c)
+        steps.append(np.full(line_r.size, dr * cols + dc))
+        lengths.append(length)
+    lengths = np.concatenate(lengths)
+    order = np.argsort(-lengths, kind="stable")
+    return np.concatenate(starts)[order], np.concatenate(steps)[order], lengths[order]
+
+
+class WordSearchIndex:
+    """A word search grid that answers queries for many words at once"""
+
+    def __init__(self, grid):
+        if isinstance(grid, np.ndarray):
+            grid_array = grid
+        elif grid and grid[0]:
+            grid_array = grid_to_byte_array(grid)
+        else:
+            grid_array = np.zeros((0, 0), dtype=np.uint8)
+        self.grid_array = np.ascontiguousarray(grid_array, dtype=np.uint8)
+        self.rows, self.cols = grid_array.shape
+        self.cells = self.grid_array.ravel()
+        self.starts, self.steps, self.lengths = _line_starts(self.rows, self.cols)
+        self._automata = {}
+
+    def _automaton(self, words):
+        key = tuple(words)
+        if key not in self._automata:
+            # Pattern 2i is word i, pattern 2i + 1 the same word reversed
+            patterns = [pattern for word in words for pattern in (word, word[::-1])]
+            self._automata[key] = AhoCorasick(pattern.encode("latin-1") for pattern in patterns)
+        return self._automata[key]
+
+    @staticmethod
+    def _unique_words(words):
+        words = list(dict.fromkeys(words))
+        if any(not word for word in words):
+            raise ValueError("Words must not be empty")
+        return words
+
+    def _walk(self, automaton):
+        """Step every line through the automaton, yield the states of the running lines after each cell"""
+        if self.starts.size == 0:
+            return
+        delta = automaton.delta_flat
+        # Lines are sorted by decreasing length: the lines still running at step t are a prefix
+        active_counts = np.searchsorted(-self.lengths, -np.arange(1, int(self.lengths[0]) + 1), side="right")
+        cells = self.starts.copy()
+        states = np.zeros(self.starts.size, dtype=np.int64)
+        for t, active in enumerate(active_counts.tolist()):
+            if t:
+                cells[:active] += self.steps[:active]
+            states[:active] = delta[(states[:active] << 8) | self.cells[cells[:active]]]
+            yield states[:active]
+
+    def count(self, words):
+        """Number of occurrences of each word, in any of the 8 directions"""
+        words = self._unique_words(words)
+        if len(words) <= VECTORIZED_MAX_WORDS:
+            return {word: count_xmas_vectorized(self.grid_array, word) for word in words}
+        automaton = self._automaton(words)
+        hits = np.zeros(len(automaton.outputs), dtype=np.int64)
+        for states in self._walk(automaton):
+            hits += np.bincount(states, minlength=hits.size)
+        counts = dict.fromkeys(words, 0)
+        for state in np.flatnonzero(automaton.accepting).tolist():
+            for index in automaton.outputs[state]:
+                counts[words[index // 2]] += int(hits[state])
+        return counts
+
+    def find(self, words):
+        """Occurrences of each word as (row, col, dr, dc, word) tuples, ordered like find_xmas_occurrences"""
+        # Building the tuples dominates: the per-word kernel is as fast as any shared pass
+        return {word: find_xmas_occurrences_vectorized(self.grid_array, word) for word in self._unique_words(words)}
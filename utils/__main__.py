@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Command line entry point: python -m utils <command>
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from utils.common_logger import setup_logger, get_logger
+from utils.registry import discover_days, parse_days
+
+
+def _days_argument(value):
+    return parse_days(value)
+
+
+def prefetch_command(args):
+    from utils.prefetch import prefetch_inputs
+
+    logger = get_logger()
+    results = prefetch_inputs(args.days, max_workers=args.jobs)
+    failed = [day for day, ok in results.items() if not ok]
+    logger.info(f"Prefetched {len(results) - len(failed)}/{len(results)} inputs")
+    return 1 if failed else 0
+
+
+def run_command(args):
+    from utils.common_logger import instrumentation_enabled, log_phase_summary
+    from utils.runner import run_days, log_summary
+
+    jobs = args.jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = run_days(args.days, jobs=jobs, use_cache=not args.no_cache, refresh=args.refresh)
+    log_summary(results, time.perf_counter() - start)
+    if instrumentation_enabled():
+        # Phases of every day, including those measured in worker processes
+        log_phase_summary()
+    return 1 if any(result.error for result in results) else 0
+
+
+def batch_command(args):
+    from utils.batch import load_tasks, run_batch, write_results
+
+    logger = get_logger()
+    tasks = load_tasks(args.source, args.days)
+    if not tasks:
+        logger.error(f"No inputs found in {args.source}")
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    records = run_batch(tasks, jobs=jobs, use_cache=not args.no_cache, refresh=args.refresh)
+    elapsed = time.perf_counter() - start
+    write_results(records, args.output, args.format)
+
+    failed = [record for record in records if record["error"]]
+    for record in failed:
+        logger.error(f"{record['name']} (day {record['day']}): {record['error']}")
+    logger.info(f"Solved {len(records) - len(failed)}/{len(records)} inputs in {elapsed * 1000:.1f} ms "
+                f"({elapsed / len(records) * 1e6:.0f} us per input), results in {args.output}")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m utils", description="Advent of Code 2024 tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prefetch = subparsers.add_parser("prefetch", help="Download every day's input into the local cache")
+    prefetch.add_argument("--days", type=_days_argument, default=None,
+                          help="Days to fetch, e.g. 1-4 or 1,3 (default: all days found)")
+    prefetch.add_argument("--jobs", type=int, default=4, help="Maximum concurrent requests")
+    prefetch.set_defaults(func=prefetch_command)
+
+    run = subparsers.add_parser("run", help="Solve several days in a single process")
+    run.add_argument("--days", type=_days_argument, default=None,
+                     help="Days to run, e.g. 1-4 or 1,3 (default: all days found)")
+    run.add_argument("--jobs", type=int, default=1,
+                     help="Worker processes, 0 for one per CPU (default: 1, run in this process)")
+    run.add_argument("--no-cache", action="store_true", help="Neither read nor store answers in the result cache")
+    run.add_argument("--refresh", action="store_true", help="Recompute the answers and overwrite the cached ones")
+    run.set_defaults(func=run_command)
+
+    batch = subparsers.add_parser("batch", help="Solve every input of a directory or manifest")
+    batch.add_argument("source", help="Directory of dayN input files, or a .jsonl / .csv manifest")
+    batch.add_argument("--days", type=_days_argument, default=None,
+                       help="Only solve these days, e.g. 1-4 or 1,3 (default: all days found)")
+    batch.add_argument("--jobs", type=int, default=0, help="Worker processes, 0 for one per CPU (default)")
+    batch.add_argument("--output", default="results.jsonl", help="Results file (default: results.jsonl)")
+    batch.add_argument("--format", choices=["jsonl", "csv"], help="Default: from the output file extension")
+    batch.add_argument("--no-cache", action="store_true", help="Neither read nor store answers in the result cache")
+    batch.add_argument("--refresh", action="store_true", help="Recompute the answers and overwrite the cached ones")
+    batch.set_defaults(func=batch_command)
+    return parser
+
+
+def main(argv=None):
+    setup_logger()
+    args = build_parser().parse_args(argv)
+    if getattr(args, "days", None) is None:
+        args.days = discover_days()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
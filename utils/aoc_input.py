@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Shared input fetching for Advent of Code 2024, backed by an on-disk cache
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils.common_logger import get_logger
+from utils.lazy import lazy_import
+from utils.locking import file_lock
+
+logger = get_logger()
+
+# Only imported once a request fails
+requests = lazy_import("requests")
+
+YEAR = 2024
+BASE_URL = "https://adventofcode.com"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "advent-of-code-2024"
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _env_flag(name):
+    """Read a true/false environment variable the same way as DISABLE_LOGS"""
+    return os.getenv(name, "false").lower() == "true"
+
+
+def session_digest(session):
+    """Hash of the session token, so the token itself never lands on disk"""
+    return hashlib.sha256(session.encode()).hexdigest()
+
+
+def input_url(day, year=YEAR, base_url=None):
+    """URL of the puzzle input for a given day"""
+    base_url = base_url or os.getenv("AOC_BASE_URL", BASE_URL)
+    return f"{base_url.rstrip('/')}/{year}/day/{day}/input"
+
+
+class InputCache:
+    """Content-addressed store of puzzle inputs with LRU eviction.
+
+    Blobs live in `objects/<sha256>` and an `index.json` maps each
+    (year, day, session hash) key to its blob, the validators returned by the
+    server (ETag / Last-Modified) and the last access time used for eviction.
+    Index updates hold `index.lock`, so that worker processes sharing the
+    directory never overwrite each other's entries.
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = Path(root or os.getenv("AOC_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("AOC_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self.lock_path = self.root / "index.lock"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(year, day, session):
+        return f"{year}/{day}/{session_digest(session)[:16]}"
+
+    @contextmanager
+    def _updating(self):
+        """Serialize an index read-modify-write across threads and processes"""
+        with self._lock, file_lock(self.lock_path):
+            yield
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self, index):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def lookup(self, year, day, session):
+        """Return the index entry for this input, or None if it is not cached"""
+        with self._lock:
+            entry = self._load_index().get(self.key(year, day, session))
+        if entry and not (self.objects_dir / entry["digest"]).exists():
+            return None
+        return entry
+
+    def read(self, year, day, session):
+        """Return the cached bytes and refresh the entry's LRU position"""
+        key = self.key(year, day, session)
+        with self._updating():
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            try:
+                content = (self.objects_dir / entry["digest"]).read_bytes()
+            except FileNotFoundError:
+                return None
+            entry["accessed"] = time.time()
+            self._save_index(index)
+        return content
+
+    def store(self, year, day, session, content, etag=None, last_modified=None):
+        """Write an input blob and its validators, then evict down to max_bytes"""
+        digest = hashlib.sha256(content).hexdigest()
+        with self._updating():
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            blob_path = self.objects_dir / digest
+            if not blob_path.exists():
+                tmp_path = blob_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, blob_path)
+            index = self._load_index()
+            index[self.key(year, day, session)] = {
+                "digest": digest,
+                "size": len(content),
+                "etag": etag,
+                "last_modified": last_modified,
+                "accessed": time.time(),
+            }
+            self._evict(index)
+            self._save_index(index)
+        return digest
+
+    def _evict(self, index):
+        # Blobs are shared between keys with identical content, so size is per digest
+        sizes = {entry["digest"]: entry["size"] for entry in index.values()}
+        total = sum(sizes.values())
+        for key in sorted(index, key=lambda k: index[k]["accessed"]):
+            if total <= self.max_bytes or len(index) <= 1:
+                break
+            digest = index.pop(key)["digest"]
+            if all(entry["digest"] != digest for entry in index.values()):
+                total -= sizes[digest]
+                (self.objects_dir / digest).unlink(missing_ok=True)
+                logger.debug(f"Evicted cached input {key} ({sizes[digest]} bytes)")
+
+    def total_bytes(self):
+        with self._lock:
+            index = self._load_index()
+        return sum({entry["digest"]: entry["size"] for entry in index.values()}.values())
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Process-wide cache configured from AOC_CACHE_DIR / AOC_CACHE_MAX_BYTES"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = InputCache()
+    return _default_cache
+
+
+def get_input(day, year=YEAR, session=None, cache=None, offline=None, revalidate=None, http=None, base_url=None):
+    """Return the puzzle input for a day as text, or None on failure (see get_input_bytes)"""
+    content = get_input_bytes(day, year, session, cache, offline, revalidate, http, base_url)
+    return None if content is None else content.decode()
+
+
+def get_input_bytes(day, year=YEAR, session=None, cache=None, offline=None, revalidate=None, http=None, base_url=None):
+    """Return the raw puzzle input for a day as bytes, or None on failure.
+
+    A cached input is returned without any network I/O. Set AOC_REVALIDATE=true
+    to send a conditional request (If-None-Match / If-Modified-Since) instead,
+    and AOC_OFFLINE=true to never touch the network.
+    """
+    session = session or os.getenv('ADVENT_OF_CODE_SESSION')
+    if not session:
+        logger.error("ADVENT_OF_CODE_SESSION environment variable not set. Please create or modify the .env as explained in the README.md. Skipping solution execution for now.")
+        return None
+    cache = cache or default_cache()
+    offline = _env_flag("AOC_OFFLINE") if offline is None else offline
+    revalidate = _env_flag("AOC_REVALIDATE") if revalidate is None else revalidate
+
+    entry = cache.lookup(year, day, session)
+    if entry is not None and (offline or not revalidate):
+        content = cache.read(year, day, session)
+        if content is not None:
+            logger.debug(f"Using cached input for day {day}")
+            return content
+    if offline:
+        logger.error(f"Offline mode: no cached input for day {day}")
+        return None
+
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    if http is None:
+        # Rate limited, with timeouts and retries (utils/async_fetch.py)
+        from utils.async_fetch import default_fetcher
+        http = default_fetcher()
+
+    logger.debug("Fetching data from Advent of Code...")
+    try:
+        response = http.get(input_url(day, year, base_url), cookies={'session': session}, headers=headers)
+    except (requests.RequestException, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching data: {e}")
+        return None
+
+    return cache_response(cache, year, day, session, response, entry)
+
+
+def cache_response(cache, year, day, session, response, entry=None):
+    """Store a 200 answer for an input in the cache, returns the input bytes or None.
+
+    A 304 answers a conditional request for the cached `entry`, which is read back.
+    """
+    if response.status_code == 304 and entry is not None:
+        logger.debug("Cached input still valid")
+        content = cache.read(year, day, session)
+        if content is not None:
+            return content
+        return None
+    if response.status_code == 200:
+        logger.debug("Data fetched successfully!")
+        cache.store(year, day, session, response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"))
+        return response.content
+
+    logger.error(f"Error fetching data: {response.status_code}")
+    return None
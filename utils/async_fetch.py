@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Asyncio fetch layer for adventofcode.com: rate limited, with timeouts and retries
+
+Every request goes through a token bucket (AOC_RATE_LIMIT requests per
+second, bursts of AOC_RATE_BURST), so parallel fetches never overrun the
+upstream limit. The default fetcher keeps the bucket in a file of the input
+cache directory (`rate_limit.json`), so the limit holds across every worker
+process sharing that directory, not per process. A 429 pauses the bucket for
+its Retry-After, for every request at once. Timeouts, connection errors, 429 and 5xx are retried
+with jittered exponential backoff (full jitter), AOC_RETRIES times.
+
+The HTTP work runs on one pooled keep-alive requests.Session, in a dedicated
+pool of max_connections threads: the event loop never blocks, and there are
+never more connections than threads. `fetch` is the async API; `get` is a
+blocking wrapper with the `requests.get` signature, used by get_input_bytes.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from functools import partial
+from pathlib import Path
+
+from utils.common_logger import get_logger
+from utils.lazy import lazy_import
+from utils.locking import file_lock
+
+logger = get_logger()
+
+# Only imported once a request is sent or fails
+requests = lazy_import("requests")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_RATE = 5.0
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 4
+
+
+class TokenBucket:
+    """Token bucket shared by threads and event loops.
+
+    `reserve` books a token and returns how long to wait before using it, so
+    waiting is up to the caller (asyncio.sleep or time.sleep). A rate of 0 or
+    None means no limit.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate or 1.0)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.paused_until = self.updated
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the bucket state for a read-modify-write"""
+        with self._lock:
+            yield
+
+    def reserve(self):
+        """Take a token, returns the seconds to wait until it is available"""
+        if not self.rate:
+            return 0.0
+        with self._locked():
+            now = self.clock()
+            # Nothing refills while paused
+            start = max(now, self.paused_until)
+            self.tokens = min(self.capacity, self.tokens + max(0.0, start - self.updated) * self.rate)
+            self.updated = start
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return start - now + wait
+
+    def pause(self, seconds):
+        """Hold every request for `seconds`, then restart without a burst"""
+        with self._locked():
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = self.paused_until
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket whose state lives in a JSON file, shared by every process using that file.
+
+    Each reserve or pause reads the state, updates it and writes it back
+    while holding a lock file next to it. The clock is the wall clock, the
+    only one the processes have in common.
+    """
+
+    def __init__(self, path, rate, capacity=None, clock=time.time):
+        super().__init__(rate, capacity, clock)
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".lock")
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, file_lock(self.lock_path):
+            self._load()
+            yield
+            self._save()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.tokens, self.updated, self.paused_until = state["tokens"], state["updated"], state["paused_until"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            # First use, or a state file left half written: start from this process's state
+            pass
+
+    def _save(self):
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tokens": self.tokens, "updated": self.updated, "paused_until": self.paused_until}, f)
+        os.replace(tmp_path, self.path)
+
+
+def rate_limit_path(cache_dir=None):
+    """State file of the rate limit shared by the processes using an input cache directory"""
+    from utils.aoc_input import DEFAULT_CACHE_DIR
+
+    return Path(cache_dir or os.getenv("AOC_CACHE_DIR") or DEFAULT_CACHE_DIR) / "rate_limit.json"
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def retry_after(response):
+    """Seconds asked for by a Retry-After header (delay or HTTP date), or None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncFetcher:
+    """Rate-limited HTTP GETs with retries over one pooled session.
+
+    With a `state_path`, the rate limit is a SharedTokenBucket kept in that
+    file; otherwise it only covers this fetcher.
+    """
+
+    def __init__(self, max_connections=DEFAULT_MAX_CONNECTIONS, rate=None, burst=None, timeout=None,
+                 retries=None, backoff_base=0.5, backoff_max=30.0, seed=None, state_path=None):
+        rate = _env_float("AOC_RATE_LIMIT", DEFAULT_RATE) if rate is None else rate
+        burst = _env_float("AOC_RATE_BURST", rate or 1.0) if burst is None else burst
+        self.bucket = TokenBucket(rate, burst) if state_path is None else SharedTokenBucket(state_path, rate, burst)
+        self.timeout = _env_float("AOC_TIMEOUT", DEFAULT_TIMEOUT) if timeout is None else timeout
+        self.retries = int(_env_float("AOC_RETRIES", DEFAULT_RETRIES)) if retries is None else retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self._random = random.Random(seed)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="aoc-fetch")
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                from requests.adapters import HTTPAdapter
+
+                # Retries are scheduled here, not by urllib3, so that they go through the bucket
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections, max_retries=0)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def backoff(self, attempt):
+        """Full jitter: uniform between 0 and base * 2^attempt, capped at backoff_max"""
+        return self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def fetch(self, url, cookies=None, headers=None):
+        """GET `url`, returns the response (the last one if it still fails after the retries).
+
+        Raises the last requests exception if every attempt timed out or could not connect.
+        """
+        loop = asyncio.get_running_loop()
+        get = partial(self.session.get, url, cookies=cookies, headers=headers, timeout=self.timeout)
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            try:
+                response = await loop.run_in_executor(self._executor, get)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff(attempt)
+                logger.debug(f"{type(e).__name__} on {url}, retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                asked = retry_after(response)
+                delay = min(self.backoff_max, asked) if asked is not None else self.backoff(attempt)
+                if response.status_code == 429:
+                    # Rate limited: every request waits, not only this one
+                    self.bucket.pause(delay)
+                logger.debug(f"HTTP {response.status_code} on {url}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def fetch_all(self, urls, cookies=None, headers=None):
+        """Fetch several URLs concurrently, returns the responses (or exceptions) in order"""
+        return await asyncio.gather(*(self.fetch(url, cookies, headers) for url in urls), return_exceptions=True)
+
+    def get(self, url, cookies=None, headers=None):
+        """Blocking fetch, for callers outside an event loop (drop-in for requests.get)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch(url, cookies, headers))
+        raise RuntimeError("AsyncFetcher.get would block the running event loop: await AsyncFetcher.fetch instead")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def default_fetcher():
+    """Process-wide fetcher configured from AOC_RATE_LIMIT / AOC_RATE_BURST / AOC_TIMEOUT / AOC_RETRIES.
+
+    Its rate limit is shared with the other processes through rate_limit_path().
+    """
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = AsyncFetcher(state_path=rate_limit_path())
+        return _default_fetcher
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Solve many puzzle inputs (one per user and day) in a single invocation
+
+The inputs come from a directory or from a manifest:
+- a directory is searched recursively for files whose name contains `dayN`
+  (`alice/day1.txt`, `inputs/day04-bob.txt`, ...), named by their relative path
+- a manifest (.jsonl or .csv) lists `name`, `day` and either a `path` (relative
+  to the manifest) or a `session`, whose input is fetched through the input
+  cache. Session tokens never appear in the results.
+
+Every input is solved by its day's registered Solver in a pool of worker
+processes. Each worker imports the solvers of every requested day once, in its
+initializer, so an input costs its parse and parts and nothing else. Answers
+go through the result cache like in the runner, and the records are written
+to one JSONL or CSV file in the order of the inputs.
+"""
+
+import csv
+import json
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.aoc_input import get_input_bytes, session_digest
+from utils.common_logger import get_logger, setup_logger
+from utils.registry import get_solver
+from utils.result_cache import ResultCache, plain_answer, solver_version
+from utils.runner import solve_input
+
+logger = get_logger()
+
+# One input to solve: read from `path`, or fetched with `session` when path is None
+Task = namedtuple("Task", ["name", "day", "path", "session"])
+
+FIELDS = ("name", "day", "part1", "part2", "parse_ms", "part1_ms", "part2_ms", "cached", "error")
+
+_DAY_IN_NAME = re.compile(r"day0*(\d+)", re.IGNORECASE)
+
+
+def tasks_from_directory(root, days=None):
+    """Tasks for every file under `root` whose name contains dayN, sorted by name"""
+    root = Path(root)
+    tasks = []
+    for path in sorted(root.rglob("*")):
+        match = _DAY_IN_NAME.search(path.name)
+        if not path.is_file() or match is None:
+            continue
+        day = int(match.group(1))
+        if days is None or day in days:
+            tasks.append(Task(path.relative_to(root).as_posix(), day, str(path), None))
+    return tasks
+
+
+def _manifest_rows(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix == ".csv":
+            return list(csv.DictReader(f))
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def tasks_from_manifest(manifest, days=None):
+    """Tasks listed in a .jsonl or .csv manifest, in manifest order"""
+    manifest = Path(manifest)
+    tasks = []
+    for row in _manifest_rows(manifest):
+        day = int(row["day"])
+        if days is not None and day not in days:
+            continue
+        path = row.get("path") or None
+        session = row.get("session") or None
+        if path is None and session is None:
+            raise ValueError(f"Manifest entry for day {day} has neither a path nor a session")
+        if path is not None:
+            path = str(manifest.parent / path)
+        name = row.get("name") or (Path(path).name if path else session_digest(session)[:8])
+        tasks.append(Task(name, day, path, session))
+    return tasks
+
+
+def load_tasks(source, days=None):
+    """Tasks of a directory or of a manifest file"""
+    source = Path(source)
+    if source.is_dir():
+        return tasks_from_directory(source, days)
+    return tasks_from_manifest(source, days)
+
+
+# Per-process state, set up once by init_worker
+_result_cache = None
+_refresh = False
+
+
+def init_worker(days, use_cache=True, refresh=False):
+    """Import every requested solver and open the result cache"""
+    global _result_cache, _refresh
+    for day in days:
+        try:
+            get_solver(day)
+        except ImportError as e:
+            # Reported by solve_task for each input of that day
+            logger.debug(f"No solver for day {day}: {e}")
+        solver_version(day)
+    _result_cache = ResultCache() if use_cache else None
+    _refresh = refresh
+
+
+def _init_pool_worker(days, use_cache, refresh):
+    # Workers configure their own logger, as a day's entry point would
+    setup_logger()
+    init_worker(days, use_cache, refresh)
+
+
+def close_worker():
+    global _result_cache
+    if _result_cache is not None:
+        _result_cache.close()
+        _result_cache = None
+
+
+def solve_task(task):
+    """Solve one input, returns its record (a dict with FIELDS); errors are recorded, not raised"""
+    record = dict.fromkeys(FIELDS)
+    record.update(name=task.name, day=task.day, cached=False)
+    try:
+        if task.path is not None:
+            raw = Path(task.path).read_bytes()
+        else:
+            raw = get_input_bytes(task.day, session=task.session)
+            if raw is None:
+                raise RuntimeError("Failed to fetch data from Advent of Code")
+        solver = get_solver(task.day)
+        if solver is None:
+            raise RuntimeError(f"No solver registered for day {task.day}")
+        phases = {}
+        answers, cached = solve_input(task.day, solver, raw, _result_cache, _refresh, phases, log_answers=False)
+        record.update(part1=plain_answer(answers[0]), part2=plain_answer(answers[1]), cached=cached)
+        record.update({f"{name}_ms": seconds * 1000 for name, seconds in phases.items()})
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def run_batch(tasks, jobs=1, use_cache=True, refresh=False):
+    """Solve every task, in this process when jobs == 1, otherwise in a process pool.
+
+    Returns the records in task order.
+    """
+    days = sorted({task.day for task in tasks})
+    if jobs > 1 and len(tasks) > 1:
+        jobs = min(jobs, len(tasks))
+        # Several tasks per round trip to a worker, while keeping the workers busy until the end
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_pool_worker,
+                                 initargs=(days, use_cache, refresh)) as executor:
+            return list(executor.map(solve_task, tasks, chunksize=chunksize))
+    init_worker(days, use_cache, refresh)
+    try:
+        return [solve_task(task) for task in tasks]
+    finally:
+        close_worker()
+
+
+def write_results(records, output, format=None):
+    """Write the records to `output` as JSONL, or CSV when format is "csv" or the file ends in .csv"""
+    output = Path(output)
+    format = format or ("csv" if output.suffix == ".csv" else "jsonl")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        if format == "csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        else:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
@@ -1,32 +1,153 @@
 #!/usr/bin/env python3
 """
 Common logger configuration for Advent of Code 2024
+
+Also records per-phase measurements: `phase` times a block or a function
+(wall time, CPU time and tracemalloc peak) and logs the result as a DEBUG
+record whose `extra` holds the numbers, so a JSON sink (LOG_JSON=<file>)
+receives them as structured fields. Measurements beyond the wall time are
+only taken when the log level is DEBUG or TRACE.
 """
 
 import os
-from loguru import logger
+import time
+import tracemalloc
+from contextlib import ContextDecorator
+
+_DETAILED_LEVELS = ("TRACE", "DEBUG")
+_instrumentation_enabled = False
+_tracemalloc_started = False
+# Measured phases of this process, in completion order
+PHASE_RECORDS = []
+
+
+def _loguru():
+    # loguru takes longer to import than the interpreter to start: only pay for it when logging
+    from loguru import logger
+    return logger
+
+class _DeferredLogger:
+    """Forwards everything to loguru's logger, imported on first use"""
+
+    def __getattr__(self, name):
+        return getattr(_loguru(), name)
+
+_logger = _DeferredLogger()
 
 def setup_logger():
     """Setup loguru logger with common configuration"""
+    logger = _loguru()
     # Remove default logger
     logger.remove()
-    
+    _set_instrumentation(False)
+
     # Configure based on environment variables
     if os.getenv("DISABLE_LOGS", "false").lower() == "true":
         # Disable all logs
         logger.add(lambda msg: None)
+        return
     elif os.getenv("LOG_LEVEL"):
         # Set specific log level
         log_level = os.getenv("LOG_LEVEL").upper()
-        logger.add(lambda msg: print(msg, end=""), 
+        logger.add(lambda msg: print(msg, end=""),
                    format="{message}",
                    level=log_level)
     else:
         # Default configuration - simple format without timestamp and level
-        logger.add(lambda msg: print(msg, end=""), 
+        log_level = "INFO"
+        logger.add(lambda msg: print(msg, end=""),
                    format="{message}",
                    level="INFO")
 
+    # Structured copy of every record, one JSON object per line
+    if os.getenv("LOG_JSON"):
+        logger.add(os.getenv("LOG_JSON"), serialize=True, level=log_level)
+    _set_instrumentation(log_level in _DETAILED_LEVELS)
+
+def _set_instrumentation(enabled):
+    global _instrumentation_enabled, _tracemalloc_started
+    _instrumentation_enabled = enabled
+    # tracemalloc slows every allocation down: only keep it while phases need it
+    if not enabled and _tracemalloc_started:
+        tracemalloc.stop()
+        _tracemalloc_started = False
+
 def get_logger():
     """Get the configured logger instance"""
-    return logger
+    return _logger
+
+def instrumentation_enabled():
+    """True when phases record CPU time and memory peaks (log level DEBUG or TRACE)"""
+    return _instrumentation_enabled
+
+
+class phase(ContextDecorator):
+    """Measure a block or a function: `with phase("parse"):` or `@phase("part1")`.
+
+    `wall` is always set on exit. With instrumentation enabled, `cpu` and
+    `peak_bytes` (tracemalloc peak above the memory in use at entry) are set
+    too, the phase is appended to PHASE_RECORDS and logged.
+    """
+
+    # Enclosing measured phases, to keep their memory peaks across nested resets
+    _stack = []
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+        self.wall = self.cpu = self.peak_bytes = None
+        self._detailed = False
+
+    def __enter__(self):
+        global _tracemalloc_started
+        self._detailed = _instrumentation_enabled
+        if self._detailed:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracemalloc_started = True
+            current, peak = tracemalloc.get_traced_memory()
+            if phase._stack:
+                # reset_peak below would lose the peak reached so far by the enclosing phase
+                outer = phase._stack[-1]
+                outer._peak_seen = max(outer._peak_seen, peak)
+            tracemalloc.reset_peak()
+            self._memory_start = self._peak_seen = current
+            phase._stack.append(self)
+            self._cpu_start = time.process_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall = time.perf_counter() - self._start
+        if self._detailed:
+            self.cpu = time.process_time() - self._cpu_start
+            peak = max(tracemalloc.get_traced_memory()[1], self._peak_seen)
+            self.peak_bytes = peak - self._memory_start
+            phase._stack.pop()
+            if phase._stack:
+                outer = phase._stack[-1]
+                outer._peak_seen = max(outer._peak_seen, peak)
+            record = {"phase": self.name, "wall": self.wall, "cpu": self.cpu,
+                      "peak_bytes": self.peak_bytes, **self.fields}
+            PHASE_RECORDS.append(record)
+            _logger.bind(**record).debug(
+                f"{self.name}: {self.wall * 1000:.3f} ms wall, {self.cpu * 1000:.3f} ms CPU, "
+                f"peak {self.peak_bytes / 1024:.1f} KiB")
+        return False
+
+    # ContextDecorator reuses one instance for every call: measure each call with a fresh copy
+    def _recreate_cm(self):
+        return phase(self.name, **self.fields)
+
+
+def log_phase_summary(records=None):
+    """Log a table of the measured phases (PHASE_RECORDS by default)"""
+    records = PHASE_RECORDS if records is None else records
+    if not records:
+        return
+    logger = _loguru()
+    logger.info("")
+    logger.info(f"{'Phase':<24} {'Wall (ms)':>10} {'CPU (ms)':>10} {'Peak (KiB)':>11}")
+    for record in records:
+        logger.info(f"{record['phase']:<24} {record['wall'] * 1000:>10.3f} {record['cpu'] * 1000:>10.3f} "
+                    f"{record['peak_bytes'] / 1024:>11.1f}")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the utils tests
+"""
+
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# One request seen by a StandInServer
+Request = namedtuple("Request", "path port time cookie")
+
+
+class StandInServer:
+    """Local stand-in for adventofcode.com: answers GET <path> with "content of <path>".
+
+    Each answer comes after `latency` seconds. `failures` makes requests fail
+    with `status` (and a Retry-After header if `retry_after` is set): an int
+    fails the first requests whatever their path, a dict {path: count} the
+    first requests of each path. Every request is recorded in `requests`,
+    with the client port, so connection reuse can be checked.
+    """
+
+    def __init__(self, latency=0.0, failures=0, status=503, retry_after=None):
+        self.latency = latency
+        self.failures = failures if isinstance(failures, int) else dict(failures)
+        self.status = status
+        self.retry_after = retry_after
+        self.requests = []
+        self.in_flight = self.max_in_flight = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append(Request(self.path, self.client_address[1], time.monotonic(),
+                                                   self.headers.get("Cookie")))
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    failing = server._take_failure(self.path)
+                time.sleep(server.latency)
+                with server.lock:
+                    server.in_flight -= 1
+                body = b"failed" if failing else f"content of {self.path}\n".encode()
+                self.send_response(server.status if failing else 200)
+                if failing and server.retry_after is not None:
+                    self.send_header("Retry-After", server.retry_after)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except OSError:
+                    # The client gave up waiting
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def _take_failure(self, path):
+        if isinstance(self.failures, int):
+            failing = self.failures > 0
+            self.failures -= failing
+        else:
+            failing = self.failures.get(path, 0) > 0
+            if failing:
+                self.failures[path] -= 1
+        return failing
+
+    def paths(self):
+        return [request.path for request in self.requests]
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    """Factory starting StandInServers, all stopped at the end of the test"""
+    servers = []
+
+    def start(**options):
+        server = StandInServer(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
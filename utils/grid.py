@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Compact character grid backed by a single bytes buffer
+
+A Grid keeps the raw input as it is (bytes, bytearray or a memory map) and
+only records its shape: `height` rows of `width` characters, row r starting
+at byte r * stride (stride is width plus the line break). Nothing is copied
+to build it, and `as_array` is a read-only (height, width) uint8 view over
+the same buffer.
+"""
+
+import mmap
+
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+# Bytes scanned at a time when counting line breaks, so a memory-mapped grid is never copied whole
+_COUNT_CHUNK = 16 * 1024 * 1024
+
+
+def _count(data, pattern, size):
+    """Occurrences of a two-byte-or-shorter `pattern` starting in data[:size]"""
+    overlap = len(pattern) - 1
+    return sum(bytes(data[start:min(start + _COUNT_CHUNK + overlap, size)]).count(pattern)
+               for start in range(0, size, _COUNT_CHUNK))
+
+
+def grid_layout(data):
+    """(rows, width, stride) of a grid of fixed-width rows in a bytes-like buffer.
+
+    Rows end with '\\n' or '\\r\\n'; trailing line breaks are ignored. Raises
+    ValueError if the rows are not all the same width.
+    """
+    size = len(data)
+    while size and data[size - 1] in b"\r\n":
+        size -= 1
+    if size == 0:
+        return 0, 0, 0
+    newline = data.find(b"\n", 0, size)
+    if newline < 0:
+        return 1, size, size + 1
+    width = newline - 1 if newline and data[newline - 1] == ord("\r") else newline
+    stride = newline + 1
+    rows, rest = divmod(size + stride - width, stride)
+    if rest or data[stride * (rows - 1) - 1] != ord("\n"):
+        raise ValueError("Grid rows must all have the same width")
+    # Ragged rows whose line breaks still fall on the stride would hide extra breaks inside rows
+    breaks = b"\r\n" if stride == width + 2 else b"\n"
+    if _count(data, b"\n", size) != rows - 1 or (len(breaks) == 2 and _count(data, breaks, size) != rows - 1):
+        raise ValueError("Grid rows must all have the same width")
+    return rows, width, stride
+
+
+class Grid:
+    """Fixed-width character grid over a bytes-like buffer"""
+
+    __slots__ = ("data", "width", "height", "stride")
+
+    def __init__(self, data, width, height, stride=None):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.stride = width + 1 if stride is None else stride
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Wrap a bytes-like buffer of newline-separated rows without copying it"""
+        height, width, stride = grid_layout(data)
+        grid = cls(data, width, height, stride)
+        if height > 1 and np.any(grid._line_ends() != ord("\n")):
+            raise ValueError("Grid rows must all have the same width")
+        return grid
+
+    @classmethod
+    def from_text(cls, text):
+        """Build a grid from text, surrounding whitespace is ignored"""
+        return cls.from_bytes(text.strip().encode("latin-1", errors="replace"))
+
+    @classmethod
+    def from_file(cls, path):
+        """Memory-map a grid file, the rows are read from the page cache on demand"""
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return cls(b"", 0, 0)
+            return cls.from_bytes(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _line_ends(self):
+        return np.ndarray((self.height - 1,), dtype=np.uint8, buffer=self.data,
+                          offset=self.stride - 1, strides=(self.stride,))
+
+    def as_array(self):
+        """Read-only (height, width) uint8 view of the grid, sharing the buffer"""
+        if self.height == 0:
+            return np.zeros((0, 0), dtype=np.uint8)
+        array = np.ndarray((self.height, self.width), dtype=np.uint8, buffer=self.data,
+                           strides=(self.stride, 1))
+        array.flags.writeable = False
+        return array
+
+    def as_unicode_array(self):
+        """(height, width) array of one-character strings, like np.array([list(row) ...])"""
+        return self.as_array().view("S1").astype("U1")
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, row):
+        if not -self.height <= row < self.height:
+            raise IndexError("Grid row out of range")
+        start = (row % self.height) * self.stride
+        return bytes(self.data[start:start + self.width]).decode("latin-1")
+
+    def __iter__(self):
+        return (self[row] for row in range(self.height))
+
+    def __repr__(self):
+        return f"Grid({self.height}x{self.width})"
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Deferred imports of heavy modules
+
+`np = lazy_import("numpy")` at module level costs nothing: numpy is imported
+the first time an attribute of `np` is read, so modules whose fast paths need
+it can still be imported (and their pure-Python functions used) without it.
+"""
+
+import importlib
+
+
+class LazyModule:
+    """Proxy importing a module on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+
+    def __getattr__(self, attribute):
+        value = getattr(importlib.import_module(self._name), attribute)
+        # Later reads of the same attribute are plain instance lookups
+        self.__dict__[attribute] = value
+        return value
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name):
+    """Module proxy for `name`, imported when first used"""
+    return LazyModule(name)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Advisory file locks for state shared by several processes
+
+The input cache index and the fetch rate limit live in the cache directory
+and are read-modified-written by every worker process of the runner, the
+batch mode and the prefetcher. `file_lock` serializes those updates with
+flock(2): the lock belongs to the open file, so it also excludes other
+threads of the same process.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, the updates are only serialized per process
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on `path` (created if missing) for the duration of the block"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the file releases the lock
+        os.close(fd)
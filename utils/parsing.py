@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Bulk parsers for puzzle inputs given as bytes-like buffers
+
+Numbers are converted by NumPy's C parser in one call, and the line
+structure is recovered separately on a uint8 view of the buffer: digit runs
+are found with a comparison and a shift, and the number of runs on each line
+with a binary search among the line break positions. No Python object is
+created per line or per number.
+"""
+
+import warnings
+
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+from utils.grid import Grid
+
+# Longest number that always fits in an int64
+MAX_DIGITS = 18
+
+
+def as_byte_array(data):
+    """uint8 view of a bytes-like buffer (a str is encoded first)"""
+    if isinstance(data, str):
+        data = data.encode("latin-1", errors="replace")
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _strip_bounds(buf):
+    # Positions of the first and one past the last non-whitespace bytes
+    content = np.flatnonzero(buf > ord(" "))
+    if content.size == 0:
+        return 0, 0
+    return int(content[0]), int(content[-1]) + 1
+
+
+def bulk_parse_ints(data):
+    """Parse whitespace separated integers in one C-level pass.
+
+    Returns an int64 array, or None if the text holds something that is not a
+    number. np.fromstring only reads str and bytes, other buffers are copied once.
+    """
+    if not isinstance(data, (str, bytes)):
+        data = bytes(data)
+    with warnings.catch_warnings():
+        # NumPy only warns when it stops on a non-numeric token
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(data, dtype=np.int64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            return None
+
+
+def tokenize_ints(data):
+    """Find the integers of whitespace separated text.
+
+    Returns (values, line offsets) where line i holds
+    values[line_offsets[i]:line_offsets[i+1]], or None if the text holds
+    anything else than integers and whitespace, or a number outside int64.
+    """
+    buf = as_byte_array(data)
+    is_digit = (buf - np.uint8(ord("0"))) < 10
+    starts = np.flatnonzero(is_digit[1:] & ~is_digit[:-1]) + 1
+    if buf.size and is_digit[0]:
+        starts = np.concatenate(([0], starts))
+    ends = np.flatnonzero(is_digit[:-1] & ~is_digit[1:]) + 1
+    if buf.size and is_digit[-1]:
+        ends = np.concatenate((ends, [buf.size]))
+    lengths = ends - starts
+    if starts.size and lengths.max() > MAX_DIGITS + 1:
+        return None
+
+    values = bulk_parse_ints(data) if starts.size else np.zeros(0, dtype=np.int64)
+    # Something that is not a plain number (1.5, 3-4, 1e5...) gives a different count
+    if values is None or values.size != starts.size:
+        return None
+    # NumPy saturates out of range values: the few numbers long enough to overflow are checked exactly
+    for i in np.flatnonzero(lengths > MAX_DIGITS).tolist():
+        start, end = int(starts[i]), int(ends[i])
+        negative = start > 0 and buf[start - 1] == ord("-")
+        exact = int(bytes(buf[start:end]))
+        if (-exact if negative else exact) != int(values[i]):
+            return None
+
+    line_breaks = np.flatnonzero(buf == ord("\n"))
+    line_offsets = np.concatenate(([0], np.searchsorted(starts, line_breaks), [starts.size])) if buf.size else np.zeros(1, dtype=np.int64)
+    return values, line_offsets.astype(np.int64)
+
+
+def parse_int_rows(data):
+    """Parse lines of integers into (values, offsets): row r is values[offsets[r]:offsets[r+1]].
+
+    Blank lines are skipped. Returns None if the text is not only integers.
+    """
+    tokens = tokenize_ints(data)
+    if tokens is None:
+        return None
+    values, line_offsets = tokens
+    counts = np.diff(line_offsets)
+    counts = counts[counts > 0]
+    offsets = np.zeros(counts.size + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return values, offsets
+
+
+def parse_int_columns(data, columns):
+    """Parse lines of exactly `columns` integers into a (lines, columns) int64 array, or None"""
+    rows = parse_int_rows(data)
+    if rows is None:
+        return None
+    values, offsets = rows
+    if offsets.size < 2 or np.any(np.diff(offsets) != columns):
+        return None
+    return values.reshape(-1, columns)
+
+
+def parse_blob(data):
+    """The input without surrounding whitespace, as a memoryview over the same buffer"""
+    if isinstance(data, str):
+        data = data.encode("latin-1", errors="replace")
+    start, end = _strip_bounds(as_byte_array(data))
+    return memoryview(data)[start:end]
+
+
+def parse_grid(data):
+    """Fixed-width grid of the input lines, sharing the buffer when it starts with a row"""
+    if isinstance(data, str):
+        data = data.encode("latin-1", errors="replace")
+    start, _ = _strip_bounds(as_byte_array(data))
+    # Grid needs find(), which memoryview lacks: only leading whitespace costs a copy
+    return Grid.from_bytes(data if start == 0 else bytes(data[start:]))
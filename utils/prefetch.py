@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Concurrent prefetch of every day's input into the local input cache
+
+The missing inputs are requested together on one event loop
+(AsyncFetcher.fetch_all), over one HTTP session whose rate limit is shared
+with the other processes using the cache directory.
+"""
+
+import asyncio
+import os
+
+from utils.aoc_input import YEAR, _env_flag, cache_response, default_cache, input_url
+from utils.async_fetch import AsyncFetcher, rate_limit_path
+from utils.common_logger import get_logger
+from utils.registry import discover_days
+
+logger = get_logger()
+
+DEFAULT_CONCURRENCY = 4
+
+
+def prefetch_inputs(days=None, year=YEAR, session=None, cache=None, max_workers=DEFAULT_CONCURRENCY,
+                    retries=3, backoff_factor=0.5, base_url=None, offline=None):
+    """Download the inputs of several days in parallel over one rate-limited HTTP session.
+
+    Inputs that are already cached are not requested again, and with
+    AOC_OFFLINE=true nothing is requested at all.
+    Returns a dict mapping each day to True if its input is now available.
+    """
+    days = discover_days() if days is None else list(days)
+    session = session or os.getenv('ADVENT_OF_CODE_SESSION')
+    cache = cache or default_cache()
+    offline = _env_flag("AOC_OFFLINE") if offline is None else offline
+    if not days:
+        return {}
+    if not session:
+        logger.error("ADVENT_OF_CODE_SESSION environment variable not set. Please create or modify the .env as explained in the README.md.")
+        return dict.fromkeys(days, False)
+
+    results = {day: cache.read(year, day, session) is not None for day in days}
+    missing = [day for day, ok in results.items() if not ok]
+    if missing and offline:
+        logger.error(f"Offline mode: no cached input for days {', '.join(map(str, missing))}")
+        missing = []
+
+    if missing:
+        urls = [input_url(day, year, base_url) for day in missing]
+        max_connections = max(1, min(max_workers, len(missing)))
+        with AsyncFetcher(max_connections, retries=retries, backoff_base=backoff_factor,
+                          state_path=rate_limit_path(cache.root)) as http:
+            responses = asyncio.run(http.fetch_all(urls, cookies={'session': session}))
+        for day, response in zip(missing, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Error fetching day {day}: {response}")
+            else:
+                results[day] = cache_response(cache, year, day, session, response) is not None
+
+    for day, ok in results.items():
+        logger.debug(f"Day {day}: {'ready' if ok else 'failed'}")
+    return results
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Discovery of the day packages available in this repository, and the registry
+of their solvers
+"""
+
+import importlib
+import re
+from pathlib import Path
+from typing import Protocol
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_DAY_DIR = re.compile(r"^day(\d+)$")
+
+
+def discover_days(root=PROJECT_ROOT):
+    """Return the sorted day numbers that have a `dayN/dayN.py` module"""
+    days = []
+    for path in Path(root).iterdir():
+        match = _DAY_DIR.match(path.name)
+        if match and (path / f"{path.name}.py").is_file():
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def parse_days(spec):
+    """Parse a day selection such as "1-4" or "1,3,4" into a sorted list"""
+    days = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            days.update(range(int(start), int(end) + 1))
+        else:
+            days.add(int(part))
+    return sorted(days)
+
+
+class Solver(Protocol):
+    """What a day registers: the input is parsed once and both parts reuse the result"""
+
+    def parse(self, raw):
+        """Turn the raw input bytes into the day's data, or None if nothing valid was found"""
+
+    def part1(self, parsed):
+        """Answer of part 1"""
+
+    def part2(self, parsed):
+        """Answer of part 2"""
+
+
+_SOLVERS = {}
+
+
+def register(day):
+    """Class decorator registering a Solver for a day"""
+    def decorator(solver_class):
+        _SOLVERS[day] = solver_class
+        return solver_class
+    return decorator
+
+
+def get_solver(day):
+    """Return a Solver instance for a day, importing `dayN.dayN` if needed, or None"""
+    if day not in _SOLVERS:
+        importlib.import_module(f"day{day}.day{day}")
+    solver_class = _SOLVERS.get(day)
+    return solver_class() if solver_class is not None else None
+
+
+def registered_days():
+    """Days whose solver is already registered"""
+    return sorted(_SOLVERS)
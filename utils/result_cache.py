@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of puzzle answers, next to the input cache
+
+Answers are stored in a SQLite database (`results.sqlite3` under
+AOC_CACHE_DIR) keyed by (day, part, SHA-256 of the input bytes, solver
+version). The solver version is a hash of the day package's source and of the
+shared modules it parses with, so editing a solver invalidates its answers
+without any bookkeeping. Least recently used answers are evicted beyond
+AOC_RESULT_CACHE_MAX_ENTRIES, a tenth of the limit at a time.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from utils.common_logger import get_logger
+from utils.registry import PROJECT_ROOT
+
+logger = get_logger()
+
+DEFAULT_MAX_ENTRIES = 4096
+# Modules every solver builds on: a change to one of them can change any answer
+SHARED_SOURCES = ("utils/parsing.py", "utils/grid.py")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    input_digest TEXT NOT NULL,
+    solver_version TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (day, part, input_digest, solver_version)
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def input_digest(raw):
+    """SHA-256 of the raw input bytes"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def solver_version(day, root=PROJECT_ROOT):
+    """Hash of the source of `dayN/` (tests excluded) and of SHARED_SOURCES"""
+    root = Path(root)
+    sources = sorted(path for path in (root / f"day{day}").glob("*.py") if not path.name.startswith("test_"))
+    sources += [root / name for name in SHARED_SOURCES]
+    digest = hashlib.sha256()
+    for path in sources:
+        if path.is_file():
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def plain_answer(value):
+    """The answer as a plain Python value: NumPy scalars from the vectorized paths become int/float"""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _to_json(value):
+    plain = plain_answer(value)
+    if plain is value:
+        raise TypeError(f"Cannot cache an answer of type {type(value).__name__}")
+    return plain
+
+
+class ResultCache:
+    """SQLite store of answers with LRU eviction beyond max_entries"""
+
+    def __init__(self, path=None, max_entries=None):
+        if path is None:
+            from utils.aoc_input import DEFAULT_CACHE_DIR
+            path = Path(os.getenv("AOC_CACHE_DIR") or DEFAULT_CACHE_DIR) / "results.sqlite3"
+        self.path = Path(path)
+        if max_entries is None:
+            max_entries = int(os.getenv("AOC_RESULT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.max_entries = max_entries
+        self._connection = None
+        # Row count as of the last count, plus the answers stored since (replacements included)
+        self._entries = 0
+
+    def _connect(self):
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Worker processes of the runner share the file: wait for their writes instead of failing
+            self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            # Answers can always be recomputed: commit without waiting for each write to reach the disk
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._entries = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return self._connection
+
+    def get(self, day, part, digest, version):
+        """Return the cached answer, or None if there is none for this input and solver version"""
+        connection = self._connect()
+        key = (day, part, digest, version)
+        row = connection.execute(
+            "SELECT answer FROM results WHERE day = ? AND part = ? AND input_digest = ? AND solver_version = ?",
+            key).fetchone()
+        if row is None:
+            return None
+        connection.execute(
+            "UPDATE results SET accessed = ? WHERE day = ? AND part = ? AND input_digest = ? AND solver_version = ?",
+            (time.time(), *key))
+        return json.loads(row[0])
+
+    def put(self, day, part, digest, version, answer):
+        """Store an answer, then evict the least recently used ones beyond max_entries"""
+        connection = self._connect()
+        connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                           (day, part, digest, version, json.dumps(answer, default=_to_json), time.time()))
+        self._entries += 1
+        if self._entries > self.max_entries:
+            self._evict(connection)
+
+    def _evict(self, connection):
+        # Counting is a full scan: only done once the estimate goes over the limit, and
+        # a tenth of the limit is freed at once so that the next puts do not evict again
+        count = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - (self.max_entries - self.max_entries // 10) if count > self.max_entries else 0
+        if excess > 0:
+            connection.execute("DELETE FROM results WHERE rowid IN "
+                               "(SELECT rowid FROM results ORDER BY accessed LIMIT ?)", (excess,))
+            logger.debug(f"Evicted {excess} cached answers")
+        self._entries = count - excess
+
+    def clear(self, day=None):
+        """Remove every answer, or only those of one day"""
+        if day is None:
+            self._connect().execute("DELETE FROM results")
+        else:
+            self._connect().execute("DELETE FROM results WHERE day = ?", (day,))
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
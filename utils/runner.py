@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Run several days in one Python process, or spread them across a process pool
+
+Days with a registered Solver run phase by phase (fetch, parse, part 1,
+part 2) and every phase is timed; other days fall back to their main().
+Their answers are memoized in the result cache: a day whose input and solver
+source did not change is answered without parsing or solving anything.
+"""
+
+import importlib
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from utils.aoc_input import get_input_bytes
+from utils.common_logger import PHASE_RECORDS, get_logger, phase, setup_logger
+from utils.registry import get_solver
+from utils.result_cache import ResultCache, input_digest, solver_version
+
+logger = get_logger()
+
+PHASES = ("fetch", "parse", "part1", "part2")
+
+# phases maps a phase name to its wall time in seconds, answers holds (part 1, part 2),
+# phase_records the detailed measurements of the day (see common_logger.phase)
+DayResult = namedtuple("DayResult", ["day", "elapsed", "error", "phases", "answers", "phase_records"],
+                       defaults=((),))
+
+
+def load_day(day):
+    """Import and return the `dayN.dayN` module"""
+    return importlib.import_module(f"day{day}.day{day}")
+
+
+def _timed(phases, name, day, function, *args):
+    with phase(f"day{day}.{name}", day=day) as measured:
+        result = function(*args)
+    phases[name] = measured.wall
+    return result
+
+
+def solve_input(day, solver, raw, cache=None, refresh=False, phases=None, log_answers=True):
+    """Solve one raw input phase by phase, returns ((part 1, part 2), cached).
+
+    The parse and part times are added to `phases`. With a ResultCache,
+    cached answers are returned without parsing or solving anything, unless
+    `refresh` asks to recompute and overwrite them.
+    """
+    phases = {} if phases is None else phases
+    if cache is not None:
+        key = (input_digest(raw), solver_version(day))
+        if not refresh:
+            answers = tuple(cache.get(day, part, *key) for part in (1, 2))
+            if None not in answers:
+                if log_answers:
+                    logger.success(f"Part 1: {answers[0]} (cached)")
+                    logger.success(f"Part 2: {answers[1]} (cached)")
+                return answers, True
+    parsed = _timed(phases, "parse", day, solver.parse, raw)
+    if parsed is None:
+        raise RuntimeError("No valid data found")
+    part1 = _timed(phases, "part1", day, solver.part1, parsed)
+    if log_answers:
+        logger.success(f"Part 1: {part1}")
+    part2 = _timed(phases, "part2", day, solver.part2, parsed)
+    if log_answers:
+        logger.success(f"Part 2: {part2}")
+    if cache is not None:
+        cache.put(day, 1, *key, part1)
+        cache.put(day, 2, *key, part2)
+    return (part1, part2), False
+
+
+def solve_day(day, solver, cache=None, refresh=False):
+    """Fetch a day's input and solve it, returns ({phase: seconds}, (part 1, part 2)).
+
+    When the answers come from the cache, only the fetch is timed.
+    """
+    phases = {}
+    raw = _timed(phases, "fetch", day, get_input_bytes, day)
+    if raw is None:
+        raise RuntimeError("Failed to fetch data from Advent of Code")
+    answers, _ = solve_input(day, solver, raw, cache, refresh, phases)
+    return phases, answers
+
+
+def run_day(day, use_cache=True, refresh=False):
+    """Run one day and return its DayResult; errors are reported, not raised"""
+    start = time.perf_counter()
+    phases, answers, error = {}, None, None
+    first_record = len(PHASE_RECORDS)
+    cache = ResultCache() if use_cache else None
+    try:
+        solver = get_solver(day)
+        if solver is None:
+            load_day(day).main()
+        else:
+            phases, answers = solve_day(day, solver, cache, refresh)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if cache is not None:
+            cache.close()
+    return DayResult(day, time.perf_counter() - start, error, phases, answers, tuple(PHASE_RECORDS[first_record:]))
+
+
+def run_days(days, jobs=1, use_cache=True, refresh=False):
+    """Run the given days, in this process when jobs == 1, otherwise in a process pool.
+
+    `use_cache=False` neither reads nor stores answers in the result cache,
+    `refresh=True` recomputes them and overwrites the cached ones.
+    Returns a list of DayResult in day order.
+    """
+    run = partial(run_day, use_cache=use_cache, refresh=refresh)
+    if jobs > 1 and len(days) > 1:
+        # Workers configure their own logger, as a day's entry point would
+        with ProcessPoolExecutor(max_workers=min(jobs, len(days)), initializer=setup_logger) as executor:
+            results = list(executor.map(run, days))
+        # The workers' measurements join this process's, for log_phase_summary
+        PHASE_RECORDS.extend(record for result in results for record in result.phase_records)
+        return results
+    results = []
+    for day in days:
+        logger.info(f"=== Day {day} ===")
+        results.append(run(day))
+    return results
+
+
+def log_summary(results, total_time):
+    logger.info("")
+    phase_header = "".join(f"  {name + ' (ms)':>11}" for name in PHASES)
+    logger.info(f"{'Day':>4}  {'Time (ms)':>10}{phase_header}  Status")
+    for result in results:
+        phase_times = "".join(f"  {result.phases[name] * 1000:>11.1f}" if name in result.phases else f"  {'-':>11}"
+                              for name in PHASES)
+        logger.info(f"{result.day:>4}  {result.elapsed * 1000:>10.1f}{phase_times}  {result.error or 'ok'}")
+    logger.info(f"Total {total_time * 1000:>10.1f}")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared input cache
+"""
+
+import multiprocessing
+
+import pytest
+import requests
+
+from utils.aoc_input import InputCache, get_input
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeHttp:
+    """Records requests and replays canned responses"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, cookies=None, headers=None):
+        self.calls.append((url, headers))
+        return self.responses.pop(0)
+
+
+def store_days(root, worker, days):
+    """Store `days` inputs under one session per worker, from a separate process"""
+    cache = InputCache(root)
+    for day in range(1, days + 1):
+        cache.store(2024, day, f"token-{worker}", f"{worker}/{day}".encode())
+
+
+class TestInputCache:
+    """Test cases for the on-disk input cache"""
+
+    def test_first_fetch_then_cache_hit(self, tmp_path):
+        """Second call is served from disk without any request"""
+        cache = InputCache(tmp_path)
+        http = FakeHttp(FakeResponse(200, b"3   4\n4   3\n", {"ETag": '"abc"'}))
+
+        first = get_input(1, session="token", cache=cache, http=http)
+        second = get_input(1, session="token", cache=cache, http=http)
+
+        assert first == second == "3   4\n4   3\n"
+        assert len(http.calls) == 1
+
+    def test_revalidation_uses_validators(self, tmp_path):
+        """A 304 answer keeps the cached content"""
+        cache = InputCache(tmp_path)
+        http = FakeHttp(
+            FakeResponse(200, b"data", {"ETag": '"abc"', "Last-Modified": "Sun, 01 Dec 2024 05:00:00 GMT"}),
+            FakeResponse(304),
+        )
+
+        get_input(2, session="token", cache=cache, http=http)
+        result = get_input(2, session="token", cache=cache, http=http, revalidate=True)
+
+        assert result == "data"
+        _, headers = http.calls[1]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Sun, 01 Dec 2024 05:00:00 GMT"
+
+    def test_offline_mode(self, tmp_path):
+        """Offline mode never calls the network"""
+        cache = InputCache(tmp_path)
+        http = FakeHttp()
+
+        assert get_input(3, session="token", cache=cache, http=http, offline=True) is None
+        cache.store(2024, 3, "token", b"mul(2,4)")
+        assert get_input(3, session="token", cache=cache, http=http, offline=True) == "mul(2,4)"
+        assert http.calls == []
+
+    def test_sessions_are_separate_keys(self, tmp_path):
+        """Different sessions do not share cache entries"""
+        cache = InputCache(tmp_path)
+        cache.store(2024, 1, "alice", b"1 2")
+
+        assert cache.lookup(2024, 1, "alice") is not None
+        assert cache.lookup(2024, 1, "bob") is None
+        assert "alice" not in (tmp_path / "index.json").read_text()
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        """Blobs are content-addressed"""
+        cache = InputCache(tmp_path)
+        cache.store(2024, 1, "alice", b"same")
+        cache.store(2024, 1, "bob", b"same")
+
+        assert len(list((tmp_path / "objects").iterdir())) == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """The least recently used input is evicted when over budget"""
+        cache = InputCache(tmp_path, max_bytes=10)
+        cache.store(2024, 1, "token", b"aaaa")
+        cache.store(2024, 2, "token", b"bbbb")
+        cache.read(2024, 1, "token")  # day 1 is now the most recently used
+        cache.store(2024, 3, "token", b"cccc")
+
+        assert cache.lookup(2024, 1, "token") is not None
+        assert cache.lookup(2024, 2, "token") is None
+        assert cache.lookup(2024, 3, "token") is not None
+        assert cache.total_bytes() <= 10
+
+    def test_concurrent_processes_keep_every_entry(self, tmp_path):
+        """Index updates from several processes are serialized, none is lost"""
+        workers, days = 4, 25
+        processes = [multiprocessing.Process(target=store_days, args=(tmp_path, worker, days))
+                     for worker in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert all(process.exitcode == 0 for process in processes)
+        cache = InputCache(tmp_path)
+        for worker in range(workers):
+            for day in range(1, days + 1):
+                assert cache.read(2024, day, f"token-{worker}") == f"{worker}/{day}".encode()
+
+    def test_http_error(self, tmp_path):
+        """Non-200 answers return None and cache nothing"""
+        cache = InputCache(tmp_path)
+        http = FakeHttp(FakeResponse(500))
+
+        assert get_input(4, session="token", cache=cache, http=http) is None
+        assert cache.lookup(2024, 4, "token") is None
+
+    def test_network_errors_only(self, tmp_path):
+        """Request failures return None; anything else is a bug and is raised"""
+        class FailingHttp:
+            def __init__(self, error):
+                self.error = error
+
+            def get(self, url, cookies=None, headers=None):
+                raise self.error
+
+        cache = InputCache(tmp_path)
+
+        assert get_input(4, session="token", cache=cache, http=FailingHttp(requests.ConnectionError("down"))) is None
+        with pytest.raises(AttributeError):
+            get_input(4, session="token", cache=cache, http=FailingHttp(AttributeError("bug")))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio fetch layer, against a local HTTP server
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+import requests
+
+from utils.aoc_input import InputCache, get_input_bytes
+from utils.async_fetch import AsyncFetcher, SharedTokenBucket, TokenBucket, retry_after
+
+
+def reserve_times(path, count, queue):
+    """Book `count` tokens of a shared bucket from a separate process, reports when each may be used"""
+    bucket = SharedTokenBucket(path, rate=10, capacity=1)
+    times = []
+    for _ in range(count):
+        delay = bucket.reserve()
+        times.append(time.time() + delay)
+    queue.put(times)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Test cases for the rate limiter"""
+
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+        clock.now += 1.0
+        assert bucket.reserve() == 0.5
+
+    def test_pause(self):
+        """A pause holds every request, and restarts without a burst"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock)
+        bucket.pause(3)
+
+        assert bucket.reserve() == pytest.approx(3.1)
+        assert bucket.reserve() == pytest.approx(3.2)
+
+    def test_unlimited(self):
+        bucket = TokenBucket(rate=0)
+
+        assert [bucket.reserve() for _ in range(100)] == [0.0] * 100
+
+    def test_shared_between_buckets(self, tmp_path):
+        """Buckets on the same file draw from the same tokens and see each other's pauses"""
+        clock = FakeClock()
+        first = SharedTokenBucket(tmp_path / "rate_limit.json", rate=2, capacity=2, clock=clock)
+        second = SharedTokenBucket(tmp_path / "rate_limit.json", rate=2, capacity=2, clock=clock)
+
+        assert [first.reserve(), second.reserve(), first.reserve()] == [0.0, 0.0, 0.5]
+        clock.now += 10
+        assert first.reserve() == 0.0
+        second.pause(3)
+        assert first.reserve() == pytest.approx(3.5)
+
+    def test_shared_between_processes(self, tmp_path):
+        """The rate holds across processes: the booked times are spaced by 1 / rate"""
+        queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=reserve_times, args=(tmp_path / "rate_limit.json", 5, queue))
+                     for _ in range(3)]
+        for process in processes:
+            process.start()
+        times = sorted(t for _ in processes for t in queue.get(timeout=30))
+        for process in processes:
+            process.join()
+
+        # One bucket per process would book them over 4 / rate only
+        assert len(times) == 15
+        assert times[-1] - times[0] >= 14 / 10 * 0.9
+        assert min(b - a for a, b in zip(times, times[1:])) >= 1 / 10 / 2
+
+    def test_retry_after(self):
+        class Response:
+            def __init__(self, headers):
+                self.headers = headers
+
+        assert retry_after(Response({"Retry-After": "2"})) == 2.0
+        assert retry_after(Response({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+        assert retry_after(Response({})) is None
+
+
+class TestAsyncFetcher:
+    """Test cases for AsyncFetcher against a stand-in server"""
+
+    def test_sync_get(self, stand_in_server):
+        server = stand_in_server()
+        with AsyncFetcher(rate=0) as fetcher:
+            response = fetcher.get(server.url + "/2024/day/1/input", cookies={"session": "token"})
+
+        assert response.status_code == 200
+        assert response.content == b"content of /2024/day/1/input\n"
+
+    def test_sync_get_inside_event_loop(self):
+        """get cannot block a running loop: it says to await fetch instead"""
+        async def call_get(fetcher):
+            return fetcher.get("http://127.0.0.1:9/unused")
+
+        with AsyncFetcher(rate=0) as fetcher:
+            with pytest.raises(RuntimeError, match="await AsyncFetcher.fetch"):
+                asyncio.run(call_get(fetcher))
+
+    def test_retries_429_with_retry_after(self, stand_in_server):
+        """429s are retried after their Retry-After, and pause the bucket"""
+        server = stand_in_server(failures=2, status=429, retry_after="0.1")
+        with AsyncFetcher(rate=0, seed=1) as fetcher:
+            start = time.monotonic()
+            response = fetcher.get(server.url + "/a")
+            elapsed = time.monotonic() - start
+
+        assert response.status_code == 200
+        assert len(server.requests) == 3
+        assert elapsed >= 0.2
+
+    def test_gives_up_after_retries(self, stand_in_server):
+        server = stand_in_server(failures=5, status=429, retry_after="0")
+        with AsyncFetcher(rate=0, retries=2, backoff_base=0.01) as fetcher:
+            response = fetcher.get(server.url + "/a")
+
+        assert response.status_code == 429
+        assert len(server.requests) == 3
+
+    def test_timeout_is_retried_then_raised(self, stand_in_server):
+        server = stand_in_server(latency=0.5)
+        with AsyncFetcher(rate=0, timeout=0.1, retries=1, backoff_base=0.01) as fetcher:
+            with pytest.raises(requests.Timeout):
+                fetcher.get(server.url + "/slow")
+
+        assert len(server.requests) == 2
+
+    def test_concurrency_and_connection_reuse(self, stand_in_server):
+        """fetch_all overlaps the requests, over at most max_connections kept-alive connections"""
+        urls = [f"/{i}" for i in range(12)]
+        server = stand_in_server(latency=0.1)
+        with AsyncFetcher(max_connections=4, rate=0) as fetcher:
+            start = time.monotonic()
+            responses = asyncio.run(fetcher.fetch_all([server.url + url for url in urls]))
+            elapsed = time.monotonic() - start
+
+        assert [response.content for response in responses] == [f"content of {url}\n".encode() for url in urls]
+        assert elapsed < 12 * 0.1 / 2
+        assert server.max_in_flight <= 4
+        assert len({request.port for request in server.requests}) <= 4
+
+    def test_rate_limit(self, stand_in_server):
+        server = stand_in_server()
+        with AsyncFetcher(rate=20, burst=1) as fetcher:
+            asyncio.run(fetcher.fetch_all([server.url + f"/{i}" for i in range(5)]))
+
+        times = sorted(request.time for request in server.requests)
+        assert times[-1] - times[0] >= 4 / 20 * 0.9
+
+
+class TestGetInputWithFetcher:
+    """get_input_bytes over the fetch layer"""
+
+    def test_rate_limited_fetch_is_cached(self, tmp_path, stand_in_server):
+        cache = InputCache(tmp_path)
+        server = stand_in_server(failures=1, status=429, retry_after="0")
+        with AsyncFetcher(rate=0, backoff_base=0.01) as fetcher:
+            content = get_input_bytes(2, session="token", cache=cache, http=fetcher, base_url=server.url)
+
+        assert content == b"content of /2024/day/2/input\n"
+        assert cache.read(2024, 2, "token") == content
+
+    def test_timeout_is_reported(self, tmp_path, stand_in_server):
+        """A server that never answers in time gives None, not an exception"""
+        server = stand_in_server(latency=0.3)
+        with AsyncFetcher(rate=0, timeout=0.05, retries=0) as fetcher:
+            content = get_input_bytes(2, session="token", cache=InputCache(tmp_path), http=fetcher,
+                                      base_url=server.url)
+
+        assert content is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for batch mode over many inputs
+"""
+
+import csv
+import json
+
+import pytest
+
+import utils.aoc_input
+from utils.__main__ import main
+from utils.aoc_input import InputCache
+from utils.batch import Task, load_tasks, run_batch, write_results
+from utils.result_cache import ResultCache
+from utils.test_runner import SAMPLE_INPUTS
+
+SAMPLE_ANSWERS = {1: (11, 31), 2: (2, 4), 3: (161, 48), 4: (18, 9)}
+
+
+@pytest.fixture
+def inputs(tmp_path, monkeypatch):
+    """Two users' copies of the samples, and a result cache of their own"""
+    root = tmp_path / "inputs"
+    for user in ("alice", "bob"):
+        (root / user).mkdir(parents=True)
+        for day, content in SAMPLE_INPUTS.items():
+            (root / user / f"day{day}.txt").write_bytes(content)
+    (root / "notes.txt").write_text("not an input")
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path / "cache"))
+    return root
+
+
+class TestLoadTasks:
+    """Test cases for the directory and manifest sources"""
+
+    def test_directory(self, inputs):
+        tasks = load_tasks(inputs)
+
+        assert [(task.name, task.day) for task in tasks[:4]] == \
+            [("alice/day1.txt", 1), ("alice/day2.txt", 2), ("alice/day3.txt", 3), ("alice/day4.txt", 4)]
+        assert len(tasks) == 8
+        assert [task.day for task in load_tasks(inputs, days=[2])] == [2, 2]
+
+    def test_jsonl_manifest(self, inputs):
+        manifest = inputs / "manifest.jsonl"
+        manifest.write_text(json.dumps({"name": "carol", "day": 3, "path": "bob/day3.txt"}) + "\n"
+                            + json.dumps({"day": 1, "session": "token"}) + "\n")
+
+        tasks = load_tasks(manifest)
+
+        assert tasks[0] == Task("carol", 3, str(inputs / "bob" / "day3.txt"), None)
+        assert tasks[1].session == "token" and tasks[1].path is None
+        assert "token" not in tasks[1].name
+
+    def test_csv_manifest(self, inputs):
+        manifest = inputs / "manifest.csv"
+        manifest.write_text("name,day,path,session\nalice,4,alice/day4.txt,\n")
+
+        assert load_tasks(manifest) == [Task("alice", 4, str(inputs / "alice" / "day4.txt"), None)]
+
+    def test_manifest_entry_without_input(self, inputs):
+        manifest = inputs / "manifest.jsonl"
+        manifest.write_text(json.dumps({"name": "dave", "day": 1}) + "\n")
+
+        with pytest.raises(ValueError):
+            load_tasks(manifest)
+
+
+class TestRunBatch:
+    """Test cases for solving and writing the batch"""
+
+    def test_in_process(self, inputs):
+        records = run_batch(load_tasks(inputs))
+
+        assert [(r["day"], r["part1"], r["part2"]) for r in records] == \
+            [(day, *SAMPLE_ANSWERS[day]) for _ in range(2) for day in sorted(SAMPLE_ANSWERS)]
+        assert all(r["error"] is None for r in records)
+        # Both users have the same inputs: the second copy is answered from the result cache
+        assert [r["cached"] for r in records] == [False] * 4 + [True] * 4
+
+    def test_process_pool(self, inputs):
+        records = run_batch(load_tasks(inputs), jobs=2, use_cache=False)
+
+        assert [r["name"] for r in records] == [task.name for task in load_tasks(inputs)]
+        assert [(r["part1"], r["part2"]) for r in records[4:]] == [SAMPLE_ANSWERS[day] for day in range(1, 5)]
+        assert not any(r["cached"] for r in records)
+        assert len(ResultCache()) == 0
+
+    def test_errors_are_recorded(self, inputs):
+        (inputs / "alice" / "day4.txt").write_bytes(b"")
+        tasks = load_tasks(inputs, days=[4]) + [Task("missing", 1, str(inputs / "missing" / "day1.txt"), None)]
+
+        records = run_batch(tasks, use_cache=False)
+
+        assert records[0]["error"] == "RuntimeError: No valid data found"
+        assert records[1]["error"] is None
+        assert records[2]["error"].startswith("FileNotFoundError")
+
+    def test_session_inputs(self, inputs, tmp_path, monkeypatch):
+        """Session entries are fetched through the input cache"""
+        cache = InputCache(tmp_path / "cache")
+        cache.store(2024, 3, "token", SAMPLE_INPUTS[3])
+        monkeypatch.setattr(utils.aoc_input, "_default_cache", cache)
+        monkeypatch.setenv("AOC_OFFLINE", "true")
+
+        records = run_batch([Task("team", 3, None, "token")])
+
+        assert (records[0]["part1"], records[0]["part2"]) == SAMPLE_ANSWERS[3]
+
+    def test_write_results(self, inputs, tmp_path):
+        records = run_batch(load_tasks(inputs, days=[1]))
+
+        write_results(records, tmp_path / "results.jsonl")
+        write_results(records, tmp_path / "results.csv")
+
+        lines = (tmp_path / "results.jsonl").read_text().splitlines()
+        assert [json.loads(line)["part2"] for line in lines] == [31, 31]
+        with open(tmp_path / "results.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["name"] for row in rows] == ["alice/day1.txt", "bob/day1.txt"]
+        assert rows[0]["part1"] == "11"
+
+    def test_command(self, inputs, tmp_path):
+        output = tmp_path / "out" / "results.csv"
+
+        assert main(["batch", str(inputs), "--jobs", "1", "--output", str(output)]) == 0
+        assert len(output.read_text().splitlines()) == 9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
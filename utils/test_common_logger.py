@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the logger setup and the phase instrumentation
+"""
+
+import json
+
+import pytest
+
+import utils.common_logger
+from utils.common_logger import setup_logger, get_logger, phase, instrumentation_enabled, log_phase_summary
+
+
+@pytest.fixture
+def log_level(monkeypatch):
+    """Configure the logger from the given environment, and restore the default afterwards"""
+    def configure(level=None, disable=False, json_path=None):
+        monkeypatch.delenv("LOG_LEVEL", raising=False)
+        monkeypatch.delenv("LOG_JSON", raising=False)
+        monkeypatch.setenv("DISABLE_LOGS", "true" if disable else "false")
+        if level:
+            monkeypatch.setenv("LOG_LEVEL", level)
+        if json_path:
+            monkeypatch.setenv("LOG_JSON", str(json_path))
+        setup_logger()
+    monkeypatch.setattr(utils.common_logger, "PHASE_RECORDS", [])
+    yield configure
+    monkeypatch.undo()
+    setup_logger()
+
+
+class TestPhase:
+    """Test cases for phase measurements"""
+
+    def test_disabled_by_default(self, log_level):
+        log_level()
+        assert not instrumentation_enabled()
+
+        with phase("parse") as measured:
+            sum(range(1000))
+
+        assert measured.wall >= 0
+        assert measured.cpu is None and measured.peak_bytes is None
+        assert utils.common_logger.PHASE_RECORDS == []
+
+    def test_disabled_logs(self, log_level):
+        log_level("DEBUG", disable=True)
+        assert not instrumentation_enabled()
+
+    def test_debug_records_cpu_and_memory(self, log_level, capfd):
+        log_level("DEBUG")
+        assert instrumentation_enabled()
+
+        with phase("part1", day=1) as measured:
+            data = bytearray(4 * 1024 * 1024)
+        del data
+
+        assert measured.cpu >= 0
+        assert measured.peak_bytes >= 4 * 1024 * 1024
+        record = utils.common_logger.PHASE_RECORDS[-1]
+        assert record["phase"] == "part1" and record["day"] == 1
+        assert "part1:" in capfd.readouterr().out
+
+    def test_nested_peaks(self, log_level):
+        log_level("DEBUG")
+
+        with phase("outer") as outer:
+            big = bytearray(8 * 1024 * 1024)
+            del big
+            with phase("inner") as inner:
+                small = bytearray(1024 * 1024)
+                del small
+
+        assert 1024 * 1024 <= inner.peak_bytes < 8 * 1024 * 1024
+        assert outer.peak_bytes >= 8 * 1024 * 1024
+        assert [r["phase"] for r in utils.common_logger.PHASE_RECORDS] == ["inner", "outer"]
+
+    def test_decorator(self, log_level):
+        log_level("DEBUG")
+
+        @phase("square")
+        def square(x):
+            return x * x
+
+        assert [square(2), square(3)] == [4, 9]
+        assert [r["phase"] for r in utils.common_logger.PHASE_RECORDS] == ["square", "square"]
+
+    def test_json_sink(self, log_level, tmp_path):
+        path = tmp_path / "log.json"
+        log_level("DEBUG", json_path=path)
+
+        with phase("fetch", day=2):
+            pass
+        get_logger().remove()
+
+        records = [json.loads(line)["record"] for line in path.read_text().splitlines()]
+        extra = records[-1]["extra"]
+        assert extra["phase"] == "fetch" and extra["day"] == 2
+        assert set(extra) >= {"wall", "cpu", "peak_bytes"}
+
+    def test_summary_table(self, log_level, capfd):
+        log_level("DEBUG")
+        with phase("day1.parse"):
+            pass
+        log_phase_summary()
+
+        out = capfd.readouterr().out
+        assert "Peak (KiB)" in out
+        assert "day1.parse" in out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
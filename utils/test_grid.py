@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the bytes-backed Grid
+"""
+
+import numpy as np
+import pytest
+
+from utils.grid import Grid, grid_layout
+
+
+class TestGrid:
+    """Test cases for Grid"""
+
+    def test_from_bytes_shares_buffer(self):
+        data = b"XMAS\nSAMX\nMMAA\n"
+        grid = Grid.from_bytes(data)
+
+        assert (grid.height, grid.width, grid.stride) == (3, 4, 5)
+        array = grid.as_array()
+        assert np.shares_memory(array, np.frombuffer(data, dtype=np.uint8))
+        assert not array.flags.writeable
+        assert array.tobytes() == b"XMASSAMXMMAA"
+
+    def test_rows_like_a_list(self):
+        grid = Grid.from_text("\nXMAS\r\nSAMX\r\nMMAA\r\n\n")
+
+        assert list(grid) == ["XMAS", "SAMX", "MMAA"]
+        assert len(grid) == 3
+        assert grid[-1] == "MMAA"
+        with pytest.raises(IndexError):
+            grid[3]
+
+    def test_unicode_array(self):
+        grid = Grid.from_text("XM\nAS")
+        expected = np.array([list("XM"), list("AS")])
+
+        assert grid.as_unicode_array().dtype == expected.dtype
+        assert (grid.as_unicode_array() == expected).all()
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "grid.txt"
+        path.write_bytes(b"XMAS\nSAMX")
+        grid = Grid.from_file(path)
+        assert list(grid) == ["XMAS", "SAMX"]
+
+        path.write_bytes(b"")
+        assert len(Grid.from_file(path)) == 0
+
+    def test_empty(self):
+        grid = Grid.from_text("")
+        assert not grid
+        assert grid.as_array().shape == (0, 0)
+
+    def test_ragged_rows(self):
+        with pytest.raises(ValueError):
+            Grid.from_bytes(b"XMAS\nXM\nXMAS")
+        with pytest.raises(ValueError):
+            # Same total length as a 4x4 grid, but the rows are not aligned
+            Grid.from_bytes(b"XMASX\nXMA\nXMAS\nXMAS")
+        assert grid_layout(b"XMAS") == (1, 4, 5)
+
+    def test_ragged_rows_on_the_stride(self):
+        """Line breaks that fall on the stride are not enough: rows must not hold extra breaks"""
+        with pytest.raises(ValueError):
+            Grid.from_bytes(b"XAAA\nMA\nA\nSAAA\n")
+        with pytest.raises(ValueError):
+            Grid.from_bytes(b"XAAA\r\nMA\nAA\r\nSAAA\r\n")
+        assert grid_layout(b"XMAS\r\nSAMX\r\n") == (2, 4, 6)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
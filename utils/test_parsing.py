@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk input parsers
+"""
+
+import mmap
+import random
+
+import numpy as np
+import pytest
+
+from utils.parsing import (
+    tokenize_ints, parse_int_rows, parse_int_columns, parse_blob, parse_grid, MAX_DIGITS,
+)
+
+
+class TestIntParsing:
+    """Test cases for the integer parsers"""
+
+    def test_int_columns(self):
+        matrix = parse_int_columns(b"3   4\n4   3\n2   5\n", 2)
+        assert matrix.dtype == np.int64
+        assert matrix.tolist() == [[3, 4], [4, 3], [2, 5]]
+
+    def test_int_columns_rejects_other_shapes(self):
+        assert parse_int_columns(b"3 4\n1 2 3\n", 2) is None
+        assert parse_int_columns(b"3 4\n5\n6 7 8\n", 2) is None
+        assert parse_int_columns(b"", 2) is None
+
+    def test_ragged_rows_match_split(self):
+        """Same rows as splitting lines and calling int() on every token"""
+        rng = random.Random(17)
+        for _ in range(300):
+            rows = [[rng.randint(-10**12, 10**12) for _ in range(rng.randint(0, 6))]
+                    for _ in range(rng.randint(0, 8))]
+            text = "\n".join(" ".join(map(str, row)) for row in rows) + rng.choice(["", "\n", "\r\n"])
+            expected = [[int(x) for x in line.split()] for line in text.strip().split("\n") if line.strip()]
+
+            values, offsets = parse_int_rows(text.encode())
+            assert [values[a:b].tolist() for a, b in zip(offsets[:-1], offsets[1:])] == expected, text
+
+    def test_line_offsets_keep_blank_lines(self):
+        values, line_offsets = tokenize_ints(b"1 2\n\n-3\n")
+        assert values.tolist() == [1, 2, -3]
+        assert line_offsets.tolist() == [0, 2, 2, 3, 3]
+
+    def test_int64_bounds(self):
+        """Every int64 parses, including 19-digit values; anything beyond is rejected"""
+        values, _ = tokenize_ints(b"9223372036854775807 -9223372036854775808 -1529375980128899625")
+        assert values.tolist() == [2**63 - 1, -2**63, -1529375980128899625]
+        assert tokenize_ints(b"9223372036854775808") is None
+        assert tokenize_ints(b"-9223372036854775809") is None
+
+    @pytest.mark.parametrize("text", [b"3-4", b"--3", b"1.5", b"1e5", b"3 x", b"3 -", b"mul(2,4)",
+                                      b"9" * (MAX_DIGITS + 1), b"1" * (MAX_DIGITS + 2)])
+    def test_malformed(self, text):
+        assert tokenize_ints(text) is None
+        assert parse_int_rows(text) is None
+
+    def test_buffers(self, tmp_path):
+        path = tmp_path / "input.txt"
+        path.write_bytes(b"7 6 4\n1 2\n")
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            values, offsets = parse_int_rows(data)
+        assert values.tolist() == [7, 6, 4, 1, 2]
+        assert offsets.tolist() == [0, 3, 5]
+        assert parse_int_rows(memoryview(b"  1 2\n3"))[1].tolist() == [0, 2, 3]
+        assert parse_int_rows("1 2\n3")[0].tolist() == [1, 2, 3]
+
+
+class TestBlobAndGrid:
+    """Test cases for the raw blob and grid parsers"""
+
+    def test_blob_is_a_view(self):
+        data = b"\n mul(2,4)do()\n\n"
+        blob = parse_blob(data)
+        assert isinstance(blob, memoryview)
+        assert blob.obj is data
+        assert bytes(blob) == b"mul(2,4)do()"
+        assert bytes(parse_blob(b" \n")) == b""
+
+    def test_grid(self):
+        data = b"XMAS\nSAMX\n"
+        grid = parse_grid(data)
+        assert grid.data is data
+        assert list(grid) == ["XMAS", "SAMX"]
+        assert list(parse_grid("\n\nXM\nAS")) == ["XM", "AS"]
+        with pytest.raises(ValueError):
+            parse_grid(b"XMAS\nXM\n")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
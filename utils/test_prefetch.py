@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent input prefetch, against a local HTTP server
+"""
+
+import pytest
+
+from utils.aoc_input import InputCache
+from utils.prefetch import prefetch_inputs
+from utils.registry import discover_days, parse_days
+
+
+def input_path(day):
+    return f"/2024/day/{day}/input"
+
+
+class TestPrefetch:
+    """Test cases for prefetch_inputs"""
+
+    def test_fetches_all_days_into_cache(self, tmp_path, stand_in_server):
+        """Every requested day ends up in the cache"""
+        cache = InputCache(tmp_path)
+        server = stand_in_server()
+        results = prefetch_inputs([1, 2, 3, 4], session="token", cache=cache, base_url=server.url)
+
+        assert results == {1: True, 2: True, 3: True, 4: True}
+        assert sorted(server.paths()) == [input_path(day) for day in [1, 2, 3, 4]]
+        assert all(request.cookie == "session=token" for request in server.requests)
+        assert cache.read(2024, 3, "token") == b"content of /2024/day/3/input\n"
+
+    def test_retries_on_server_errors(self, tmp_path, stand_in_server):
+        """A 503 is retried with backoff until it succeeds"""
+        cache = InputCache(tmp_path)
+        server = stand_in_server(failures={input_path(2): 2})
+        results = prefetch_inputs([1, 2], session="token", cache=cache, base_url=server.url, backoff_factor=0.01)
+
+        assert results == {1: True, 2: True}
+        assert server.paths().count(input_path(2)) == 3
+
+    def test_gives_up_after_retries(self, tmp_path, stand_in_server):
+        """A day that keeps failing is reported as failed"""
+        cache = InputCache(tmp_path)
+        server = stand_in_server(failures={input_path(1): 10})
+        results = prefetch_inputs([1], session="token", cache=cache, base_url=server.url,
+                                  retries=1, backoff_factor=0.01)
+
+        assert results == {1: False}
+
+    def test_cached_days_are_not_requested(self, tmp_path, stand_in_server):
+        """Second prefetch makes no requests"""
+        cache = InputCache(tmp_path)
+        server = stand_in_server()
+        prefetch_inputs([1, 2], session="token", cache=cache, base_url=server.url)
+        prefetch_inputs([1, 2], session="token", cache=cache, base_url=server.url)
+
+        assert len(server.requests) == 2
+
+    def test_offline(self, tmp_path, stand_in_server):
+        """Offline, cached days are ready and the others fail without a request"""
+        cache = InputCache(tmp_path)
+        server = stand_in_server()
+        prefetch_inputs([1], session="token", cache=cache, base_url=server.url)
+        results = prefetch_inputs([1, 2], session="token", cache=cache, base_url=server.url, offline=True)
+
+        assert results == {1: True, 2: False}
+        assert len(server.requests) == 1
+
+
+class TestRegistry:
+    """Test cases for day discovery"""
+
+    def test_discover_days(self):
+        assert discover_days()[:4] == [1, 2, 3, 4]
+
+    def test_parse_days(self):
+        assert parse_days("1-4") == [1, 2, 3, 4]
+        assert parse_days("1,3, 4") == [1, 3, 4]
+        assert parse_days("4,1-2") == [1, 2, 4]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
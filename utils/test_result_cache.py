@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent answer cache
+"""
+
+import numpy as np
+import pytest
+
+from utils.result_cache import ResultCache, input_digest, solver_version
+
+
+class TestResultCache:
+    """Test cases for the SQLite answer store"""
+
+    def test_miss_then_hit(self, tmp_path):
+        cache = ResultCache(tmp_path / "results.sqlite3")
+        digest = input_digest(b"3   4\n")
+
+        assert cache.get(1, 1, digest, "v1") is None
+        cache.put(1, 1, digest, "v1", 11)
+        assert cache.get(1, 1, digest, "v1") == 11
+        assert cache.get(1, 2, digest, "v1") is None
+
+    def test_key_includes_input_and_version(self, tmp_path):
+        cache = ResultCache(tmp_path / "results.sqlite3")
+        cache.put(1, 1, input_digest(b"a"), "v1", 1)
+
+        assert cache.get(1, 1, input_digest(b"b"), "v1") is None
+        assert cache.get(1, 1, input_digest(b"a"), "v2") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        ResultCache(tmp_path / "results.sqlite3").put(2, 1, "digest", "v1", "answer")
+
+        assert ResultCache(tmp_path / "results.sqlite3").get(2, 1, "digest", "v1") == "answer"
+
+    def test_numpy_answers(self, tmp_path):
+        """Answers from the vectorized paths are stored as plain numbers"""
+        cache = ResultCache(tmp_path / "results.sqlite3")
+        cache.put(1, 1, "digest", "v1", np.int64(2_000_000_000_000))
+
+        answer = cache.get(1, 1, "digest", "v1")
+        assert answer == 2_000_000_000_000
+        assert type(answer) is int
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ResultCache(tmp_path / "results.sqlite3", max_entries=2)
+        cache.put(1, 1, "a", "v1", 1)
+        cache.put(1, 1, "b", "v1", 2)
+        cache.get(1, 1, "a", "v1")
+        cache.put(1, 1, "c", "v1", 3)
+
+        assert len(cache) == 2
+        assert cache.get(1, 1, "b", "v1") is None
+        assert cache.get(1, 1, "a", "v1") == 1
+
+    def test_clear(self, tmp_path):
+        cache = ResultCache(tmp_path / "results.sqlite3")
+        cache.put(1, 1, "a", "v1", 1)
+        cache.put(2, 1, "a", "v1", 2)
+
+        cache.clear(1)
+        assert len(cache) == 1
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_default_path_follows_input_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path))
+
+        assert ResultCache().path == tmp_path / "results.sqlite3"
+
+
+class TestSolverVersion:
+    """Test cases for the solver source hash"""
+
+    def test_changes_with_source(self, tmp_path):
+        package = tmp_path / "day9"
+        package.mkdir()
+        (package / "day9.py").write_text("ANSWER = 1\n")
+        (package / "test_day9.py").write_text("")
+        first = solver_version(9, tmp_path)
+
+        (package / "test_day9.py").write_text("# tests do not change answers\n")
+        solver_version.cache_clear()
+        assert solver_version(9, tmp_path) == first
+
+        (package / "day9.py").write_text("ANSWER = 2\n")
+        solver_version.cache_clear()
+        assert solver_version(9, tmp_path) != first
+
+    def test_days_differ(self):
+        assert solver_version(1) != solver_version(2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
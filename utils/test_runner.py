@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-process multi-day runner
+"""
+
+import pytest
+
+import utils.aoc_input
+import utils.registry
+from utils.aoc_input import InputCache
+from utils.common_logger import setup_logger
+from utils.registry import discover_days, get_solver, register, registered_days
+from utils.result_cache import ResultCache
+from utils.runner import PHASES, run_days, solve_input
+
+SAMPLE_INPUTS = {
+    1: b"3   4\n4   3\n2   5\n1   3\n3   9\n3   3\n",
+    2: b"7 6 4 2 1\n1 2 7 8 9\n9 7 6 2 1\n1 3 2 4 5\n8 6 4 4 1\n1 3 6 7 9\n",
+    3: b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))\n",
+    4: b"MMMSXXMASM\nMSAMXMSMSA\nAMXSXMAAMM\nMSAMASMSMX\nXMASAMXAMM\n"
+       b"XXAMMXXAMA\nSMSMSASXSS\nSAXAMASAAA\nMAMMMXMMMM\nMXMXAXMASX\n",
+}
+
+
+@pytest.fixture
+def cached_samples(tmp_path, monkeypatch):
+    """Serve the puzzle samples from a cache, without any network access"""
+    cache = InputCache(tmp_path)
+    for day, content in SAMPLE_INPUTS.items():
+        cache.store(2024, day, "token", content)
+    monkeypatch.setenv("ADVENT_OF_CODE_SESSION", "token")
+    monkeypatch.setenv("AOC_OFFLINE", "true")
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(utils.aoc_input, "_default_cache", cache)
+    setup_logger()
+    return cache
+
+
+class TestRunner:
+    """Test cases for run_days"""
+
+    def test_runs_all_days_in_process(self, cached_samples, capfd):
+        """All days run in this process and report a wall time"""
+        results = run_days([1, 2, 3, 4])
+
+        assert [result.day for result in results] == [1, 2, 3, 4]
+        assert all(result.error is None for result in results)
+        assert all(result.elapsed >= 0 for result in results)
+        out = capfd.readouterr().out
+        assert "Part 1: 11" in out
+        assert "Part 2: 31" in out
+        assert "Part 2: 48" in out
+
+    def test_runs_days_in_process_pool(self, cached_samples, capfd):
+        """Days spread over worker processes give the same results"""
+        results = run_days([1, 2, 3, 4], jobs=2)
+
+        assert [result.day for result in results] == [1, 2, 3, 4]
+        assert all(result.error is None for result in results)
+        assert "Part 1: 18" in capfd.readouterr().out
+
+    def test_phase_summary_in_process_pool(self, cached_samples, capfd, monkeypatch):
+        """At DEBUG, the phases measured by the workers reach the summary table of the parent"""
+        from utils.__main__ import main
+
+        monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+        try:
+            assert main(["run", "--days", "1-2", "--jobs", "2", "--no-cache"]) == 0
+            out = capfd.readouterr().out
+        finally:
+            monkeypatch.delenv("LOG_LEVEL")
+            setup_logger()
+
+        summary = out[out.index("Peak (KiB)"):]
+        assert "day1.parse" in summary
+        assert "day2.part2" in summary
+
+    def test_reports_errors(self, cached_samples):
+        """A day that cannot be imported is reported, not raised"""
+        result = run_days([99])[0]
+
+        assert result.day == 99
+        assert result.error.startswith("ModuleNotFoundError")
+
+    def test_phases_are_timed(self, cached_samples):
+        """Registered solvers run phase by phase and return their answers"""
+        results = run_days([1, 2, 3, 4])
+
+        assert [result.answers for result in results] == [(11, 31), (2, 4), (161, 48), (18, 9)]
+        for result in results:
+            assert list(result.phases) == list(PHASES)
+            assert sum(result.phases.values()) <= result.elapsed
+
+    def test_missing_input(self, cached_samples, monkeypatch):
+        monkeypatch.setattr(utils.aoc_input, "_default_cache", InputCache(cached_samples.root / "empty"))
+        result = run_days([2])[0]
+
+        assert result.error == "RuntimeError: Failed to fetch data from Advent of Code"
+        assert list(result.phases) == []
+
+    def test_cached_answers(self, cached_samples, capfd):
+        """A second run answers from the result cache, without parsing"""
+        first = run_days([1, 2, 3, 4])
+        second = run_days([1, 2, 3, 4])
+
+        assert [result.answers for result in second] == [result.answers for result in first]
+        assert all(list(result.phases) == ["fetch"] for result in second)
+        assert "Part 1: 11 (cached)" in capfd.readouterr().out
+
+    def test_refresh_and_no_cache(self, cached_samples):
+        run_days([1])
+
+        assert list(run_days([1], refresh=True)[0].phases) == list(PHASES)
+        assert list(run_days([1], use_cache=False)[0].phases) == list(PHASES)
+        assert list(run_days([1])[0].phases) == ["fetch"]
+
+    def test_no_cache_stores_nothing(self, cached_samples):
+        run_days([2], use_cache=False)
+
+        assert len(ResultCache()) == 0
+
+    def test_solve_input(self, tmp_path, capfd):
+        """The raw-input helper shared with the batch mode times the phases and reports cache hits"""
+        raw = b"3   4\n4   3\n2   5\n1   3\n3   9\n3   3\n"
+        cache = ResultCache(tmp_path / "results.sqlite3")
+        phases = {}
+
+        assert solve_input(1, get_solver(1), raw, cache, phases=phases, log_answers=False) == ((11, 31), False)
+        assert list(phases) == ["parse", "part1", "part2"]
+        assert solve_input(1, get_solver(1), raw, cache, log_answers=False) == ((11, 31), True)
+        assert "Part 1" not in capfd.readouterr().out
+
+
+class TestSolverRegistry:
+    """Test cases for the Solver registry"""
+
+    def test_every_day_registers_a_solver(self):
+        for day in discover_days():
+            solver = get_solver(day)
+            assert solver is not None
+            assert all(callable(getattr(solver, name)) for name in ("parse", "part1", "part2"))
+        assert set(discover_days()) <= set(registered_days())
+
+    def test_parse_once_for_both_parts(self):
+        solver = get_solver(4)
+        grid = solver.parse(SAMPLE_INPUTS[4])
+
+        assert (solver.part1(grid), solver.part2(grid)) == (18, 9)
+
+    def test_solvers_match_module_functions(self):
+        from day1.day1 import similarity_score, distanceSumOfSortedElements
+        from day2.day2 import count_safe_reports, count_safe_reports_with_dampener
+        from day3.day3 import find_valid_mul_instructions, calculate_multiplication_sum, extract_do_instructions
+
+        solver = get_solver(1)
+        matrix = solver.parse(SAMPLE_INPUTS[1])
+        left, right = matrix[:, 0].tolist(), matrix[:, 1].tolist()
+        assert solver.part1(matrix) == distanceSumOfSortedElements(left, right)
+        assert solver.part2(matrix) == similarity_score(left, right)
+
+        solver = get_solver(2)
+        reports = [[int(x) for x in line.split()] for line in SAMPLE_INPUTS[2].decode().splitlines()]
+        packed = solver.parse(SAMPLE_INPUTS[2])
+        assert solver.part1(packed) == count_safe_reports(reports)
+        assert solver.part2(packed) == count_safe_reports_with_dampener(reports)
+
+        solver = get_solver(3)
+        memory = SAMPLE_INPUTS[3].decode().strip()
+        instructions = solver.parse(SAMPLE_INPUTS[3])
+        assert solver.part1(instructions) == calculate_multiplication_sum(find_valid_mul_instructions(memory))
+        assert solver.part2(instructions) == calculate_multiplication_sum(
+            find_valid_mul_instructions(extract_do_instructions(memory)))
+
+    def test_register(self):
+        @register(98)
+        class Day98Solver:
+            def parse(self, raw):
+                return raw.split()
+
+            def part1(self, parsed):
+                return len(parsed)
+
+            def part2(self, parsed):
+                return parsed[-1]
+
+        try:
+            assert isinstance(get_solver(98), Day98Solver)
+        finally:
+            del utils.registry._SOLVERS[98]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])